@@ -0,0 +1,67 @@
+"""
+Registry load and response serialization throughput per JSON backend.
+
+Compares the original path (stdlib `json.load` into untyped dicts, FastMCP's
+default pydantic-core serializer) with each installed backend of
+`vg_ui_lib_mcp.json_backend` (typed, validated decode + fast encode).
+
+Usage:
+    uv run python benchmarks/bench_json.py [--iterations 50]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import pydantic_core
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from vg_ui_lib_mcp import json_backend  # noqa: E402
+
+
+REGISTRY_FILE = Path(__file__).parent.parent / "src" / "vg_ui_lib_mcp" / "data" / "component-registry.json"
+
+
+def timed(func, iterations: int) -> float:
+    """Return the mean wall time of `func()` in milliseconds."""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def main(iterations: int):
+    raw = REGISTRY_FILE.read_bytes()
+    registry = json.loads(raw)
+    tag, component = next(iter(registry['components'].items()))
+    component_response = {key: value for key, value in component.items() if key != 'examples'}
+    example_response = component['examples'][0]
+    size_mb = len(raw) / 1024 / 1024
+
+    print(f"Registry: {len(raw) / 1024:.1f} KB, {iterations} iterations")
+    print(f"{'backend':<22}{'load ms':>10}{'load MB/s':>11}{'component us':>14}{'example us':>12}{'registry ms':>13}")
+
+    def report(name, load, encode):
+        load_ms = timed(load, iterations)
+        component_us = timed(lambda: encode(component_response), iterations * 20) * 1000
+        example_us = timed(lambda: encode(example_response), iterations * 20) * 1000
+        registry_ms = timed(lambda: encode(registry), iterations)
+        print(f"{name:<22}{load_ms:>10.2f}{size_mb / (load_ms / 1000):>11.1f}{component_us:>14.1f}{example_us:>12.1f}{registry_ms:>13.2f}")
+
+    report("baseline (json+pyd)", lambda: json.loads(raw), lambda value: pydantic_core.to_json(value, fallback=str).decode())
+
+    active = json_backend.BACKEND
+    for backend in json_backend.AVAILABLE_BACKENDS:
+        json_backend.BACKEND = backend
+        report(f"{backend} (typed)", lambda: json_backend.decode_registry(raw), json_backend.dumps)
+    json_backend.BACKEND = active
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50, help="Iterations per measurement")
+    main(parser.parse_args().iterations)
@@ -0,0 +1,66 @@
+"""
+Time-to-first-response benchmark for the VG UI Library MCP server.
+
+Spawns the server over stdio several times and measures, from process spawn:
+- `initialize` response
+- `tools/list` response
+- first data-dependent tool call (`list_components`), which waits for the registry
+
+With `--shim` the stdio shim is spawned instead, so every run after the first
+connects to the warm daemon (the first run includes starting it).
+
+Usage:
+    uv run python benchmarks/bench_startup.py [--runs 5] [--shim]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+async def measure_once(shim: bool = False) -> dict:
+    """Spawn one server (or shim) process and time its first responses (in milliseconds)."""
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "vg_ui_lib_mcp.stdio_shim" if shim else "vg_ui_lib_mcp.main"],
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR)},
+    )
+    timings = {}
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                timings["initialize"] = (time.perf_counter() - start) * 1000
+                await session.list_tools()
+                timings["tools/list"] = (time.perf_counter() - start) * 1000
+                await session.call_tool("list_components", {})
+                timings["first data tool"] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+async def main(runs: int, shim: bool):
+    results = [await measure_once(shim) for _ in range(runs)]
+    print(f"Time to first response over {runs} runs (ms since spawn)")
+    print(f"{'phase':<18}{'median':>10}{'min':>10}{'max':>10}")
+    for phase in results[0]:
+        values = [result[phase] for result in results]
+        print(f"{phase:<18}{statistics.median(values):>10.1f}{min(values):>10.1f}{max(values):>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Number of server spawns to measure")
+    parser.add_argument("--shim", action="store_true", help="Spawn the stdio shim that forwards to the local daemon")
+    args = parser.parse_args()
+    asyncio.run(main(args.runs, args.shim))
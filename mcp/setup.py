@@ -1,11 +1,14 @@
 """
 Setup script for vg-ui-lib-mcp-server package.
-This copies component-registry.json before building the package.
+This copies component-registry.json, generates the compact registry, scans
+the component stylesheets and generates the precomputed index artifacts
+before building the package.
 """
 from setuptools import setup
 from setuptools.command.build_py import build_py
 from setuptools.command.sdist import sdist
 from pathlib import Path
+import json
 import shutil
 import sys
 
@@ -61,22 +64,140 @@ def copy_registry_file():
         return False
 
 
+def generate_compact_registry():
+    """Write the compact registry (derivable framework sources dropped) next to the packaged registry."""
+    setup_dir = Path(__file__).parent.absolute()
+    data_dir = setup_dir / "src" / "vg_ui_lib_mcp" / "data"
+    registry_file = data_dir / "component-registry.json"
+    compact_file = data_dir / "component-registry.compact.json"
+    
+    print(f"\n{'='*60}")
+    print("Pre-build: Generating compact component registry")
+    print(f"{'='*60}")
+    
+    if not registry_file.exists():
+        print(f"⚠️  Warning: Registry not found at {registry_file}, skipping compact registry")
+        print(f"{'='*60}\n")
+        return False
+    
+    # Import the package modules straight from the source tree
+    sys.path.insert(0, str(setup_dir / "src"))
+    try:
+        from vg_ui_lib_mcp.framework_transformer import compact_registry
+        compact, report = compact_registry(json.loads(registry_file.read_bytes()))
+        compact_file.write_text(json.dumps(compact, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+        print(f"Derived sources: {report['derived_sources']}, stored sources: {report['stored_sources']}")
+        for component_tag, example_id, framework in report["mismatches"]:
+            print(f"  - stored (not derivable): {component_tag} / {example_id} / {framework}")
+        print(f"✅ Generated component-registry.compact.json ({compact_file.stat().st_size / 1024:.2f} KB)")
+        print(f"{'='*60}\n")
+        return True
+    except Exception as e:
+        print(f"❌ Error generating compact registry: {e}")
+        print(f"{'='*60}\n")
+        raise RuntimeError(f"Compact registry generation failed: {e}") from e
+    finally:
+        sys.path.remove(str(setup_dir / "src"))
+
+
+def generate_component_css_usage():
+    """Scan the component stylesheets for the CSS custom properties each component uses."""
+    setup_dir = Path(__file__).parent.absolute()
+    components_dir = setup_dir.parent / "src" / "components"
+    usage_file = setup_dir / "src" / "vg_ui_lib_mcp" / "data" / "component-css-usage.json"
+    
+    print(f"\n{'='*60}")
+    print("Pre-build: Scanning component stylesheets")
+    print(f"{'='*60}")
+    
+    if not components_dir.is_dir():
+        print(f"⚠️  Warning: Component sources not found at {components_dir}, skipping stylesheet scan")
+        print(f"{'='*60}\n")
+        return False
+    
+    # Import the package modules straight from the source tree
+    sys.path.insert(0, str(setup_dir / "src"))
+    try:
+        from vg_ui_lib_mcp.component_css import scan_component_stylesheets
+        usage = scan_component_stylesheets(components_dir)
+        usage_file.write_text(json.dumps(usage, indent=2), encoding='utf-8')
+        for tag, tag_usage in usage.items():
+            print(f"  - {tag}: {len(tag_usage['consumes'])} consumed, {len(tag_usage['declares'])} declared")
+        print(f"✅ Generated component-css-usage.json ({len(usage)} components)")
+        print(f"{'='*60}\n")
+        return True
+    except Exception as e:
+        print(f"❌ Error scanning component stylesheets: {e}")
+        print(f"{'='*60}\n")
+        return False
+    finally:
+        sys.path.remove(str(setup_dir / "src"))
+
+
+def generate_index_artifacts():
+    """Build the search indexes, lookup maps and CSS token table from the packaged registry."""
+    setup_dir = Path(__file__).parent.absolute()
+    data_dir = setup_dir / "src" / "vg_ui_lib_mcp" / "data"
+    registry_file = data_dir / "component-registry.json"
+    compact_file = data_dir / "component-registry.compact.json"
+    
+    print(f"\n{'='*60}")
+    print("Pre-build: Generating precomputed index artifacts")
+    print(f"{'='*60}")
+    
+    if not registry_file.exists():
+        print(f"⚠️  Warning: Registry not found at {registry_file}, skipping artifact generation")
+        print(f"{'='*60}\n")
+        return False
+    
+    # Import the package modules straight from the source tree
+    sys.path.insert(0, str(setup_dir / "src"))
+    try:
+        from vg_ui_lib_mcp.artifacts import ARTIFACT_BUILDERS, ARTIFACTS_DIR, write_artifacts
+        compact_raw = compact_file.read_bytes() if compact_file.exists() else None
+        manifest = write_artifacts(registry_file.read_bytes(), data_dir / ARTIFACTS_DIR, compact_raw)
+        total_kb = sum(entry["bytes"] for entry in manifest["artifacts"].values()) / 1024
+        print(f"Registry hash: {manifest['registry_hash']}")
+        print(f"Builder hash: {manifest['builder_hash']}")
+        for name, entry in manifest["artifacts"].items():
+            print(f"  - {name}: {entry['bytes'] / 1024:.2f} KB")
+        skipped = [name for name in ARTIFACT_BUILDERS if name not in manifest["artifacts"]]
+        if skipped:
+            raise RuntimeError(f"builders returned nothing for {', '.join(skipped)} (optional dependency missing?)")
+        print(f"✅ Generated {len(manifest['artifacts'])} artifacts ({total_kb:.2f} KB)")
+        print(f"{'='*60}\n")
+        return True
+    except Exception as e:
+        print(f"❌ Error generating artifacts: {e}")
+        print(f"💡 Are the build requirements of pyproject.toml installed?")
+        print(f"{'='*60}\n")
+        raise RuntimeError(f"Index artifact generation failed: {e}") from e
+    finally:
+        sys.path.remove(str(setup_dir / "src"))
+
+
 class BuildPyCommand(build_py):
-    """Custom build command that copies the registry file before building."""
+    """Custom build command that copies the registry file and generates the compact registry and artifacts before building."""
     
     def run(self):
-        """Copy registry file before the standard build."""
+        """Copy registry file and generate artifacts before the standard build."""
         copy_registry_file()
+        generate_compact_registry()
+        generate_component_css_usage()
+        generate_index_artifacts()
         # Run the standard build
         super().run()
 
 
 class SDistCommand(sdist):
-    """Custom sdist command that ensures registry is copied before creating source distribution."""
+    """Custom sdist command that ensures registry is copied and artifacts generated before creating source distribution."""
     
     def run(self):
-        """Copy registry file before creating source distribution."""
+        """Copy registry file and generate artifacts before creating source distribution."""
         copy_registry_file()
+        generate_compact_registry()
+        generate_component_css_usage()
+        generate_index_artifacts()
         # Run the standard sdist
         super().run()
 
@@ -0,0 +1,216 @@
+"""
+Precomputed index artifacts for the VG UI Library component registry.
+
+Everything the server derives from `component-registry.json` (search indexes,
+lookup maps, framework views, the CSS token table, component digests, the
+component CSS variable index, the prefix completion index, the markup
+validator tables) can be built once at packaging time by `setup.py` and
+shipped in `vg_ui_lib_mcp/data/indexes`. At runtime each
+artifact is loaded lazily on first use, and only if the manifest matches
+what the server would build itself:
+
+- the content hash of the registry that was actually loaded (or of its
+  equivalent compact registry),
+- the hash of the source files of the builder modules (this module and every
+  package module it uses, found by following its imports), so any change to
+  a builder invalidates the shipped artifacts without a manual version bump,
+- the hash of every other input of the builders (`ARTIFACT_INPUTS`).
+
+Otherwise the server falls back to building the artifact.
+"""
+
+import hashlib
+import json
+import pickle
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+from vg_ui_lib_mcp.completion import build_completion_index
+from vg_ui_lib_mcp.component_css import build_component_css_index, load_component_css_usage
+from vg_ui_lib_mcp.component_digests import build_component_digests
+from vg_ui_lib_mcp.css_tokens import build_css_token_table
+from vg_ui_lib_mcp.example_search import build_example_indexes
+from vg_ui_lib_mcp.framework_transformer import example_frameworks
+from vg_ui_lib_mcp.markup_validator import build_markup_validators
+from vg_ui_lib_mcp.prop_query import build_prop_event_table
+from vg_ui_lib_mcp.registry_changes import build_entity_hashes
+from vg_ui_lib_mcp.semantic_search import build_semantic_index
+
+
+ARTIFACTS_DIR = "indexes"
+MANIFEST_FILE = "manifest.json"
+
+
+def registry_content_hash(raw: bytes) -> str:
+    """Return the content hash identifying a registry snapshot."""
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _package_modules(root: ModuleType) -> List[ModuleType]:
+    """`root` and every package module reachable through its globals (imported modules, functions, classes)."""
+    package = __name__.split('.')[0] + '.'
+    found = {root.__name__: root}
+    pending = [root]
+    while pending:
+        for value in list(vars(pending.pop()).values()):
+            module = value if isinstance(value, ModuleType) else sys.modules.get(getattr(value, '__module__', None) or '')
+            if module is not None and module.__name__.startswith(package) and module.__name__ not in found:
+                found[module.__name__] = module
+                pending.append(module)
+    return [found[name] for name in sorted(found)]
+
+
+def builder_sources_hash() -> Optional[str]:
+    """Hash of the source files of the artifact builders, or None if a source file cannot be read."""
+    digest = hashlib.sha256()
+    for module in _package_modules(sys.modules[__name__]):
+        try:
+            source = Path(module.__file__).read_bytes()
+        except (OSError, TypeError):
+            return None
+        digest.update(module.__name__.encode('utf-8') + b'\0' + hashlib.sha256(source).digest())
+    return digest.hexdigest()
+
+
+def input_hashes() -> Dict[str, str]:
+    """Hash of every builder input besides the registry, by input name."""
+    return {
+        name: hashlib.sha256(json.dumps(loader(), sort_keys=True, separators=(',', ':')).encode('utf-8')).hexdigest()
+        for name, loader in ARTIFACT_INPUTS.items()
+    }
+
+
+def build_example_map(components: Dict[str, Any]) -> Dict[str, Dict[str, int]]:
+    """Map each component tag to `{example_id: position in its examples list}`."""
+    return {
+        component_tag: {
+            example.get('id', ''): position
+            for position, example in enumerate(component.get('examples') or [])
+            if example.get('id')
+        }
+        for component_tag, component in components.items()
+    }
+
+
+def build_framework_views(components: Dict[str, Any]) -> Dict[str, Dict[str, List[str]]]:
+    """Map each framework to `{component_tag: [example ids that have a source for it]}`."""
+    views: Dict[str, Dict[str, List[str]]] = {}
+    for component_tag, component in components.items():
+        for example in component.get('examples') or []:
+            for framework in example_frameworks(example):
+                views.setdefault(framework, {}).setdefault(component_tag, []).append(example.get('id', ''))
+    return views
+
+
+# Inputs of the builders besides the registry: name -> loader of its JSON-serializable content
+ARTIFACT_INPUTS: Dict[str, Callable[[], Any]] = {
+    "component_css_usage": load_component_css_usage,
+}
+
+# Artifact name -> builder taking the full registry dict
+ARTIFACT_BUILDERS: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "prop_event_table": lambda registry: build_prop_event_table(registry.get('components', {})),
+    "example_indexes": lambda registry: build_example_indexes(registry.get('components', {})),
+    "semantic_index": lambda registry: build_semantic_index(registry.get('components', {})),
+    "example_map": lambda registry: build_example_map(registry.get('components', {})),
+    "framework_views": lambda registry: build_framework_views(registry.get('components', {})),
+    "css_tokens": lambda registry: build_css_token_table(registry.get('predefined_css_definitions', "")),
+    "entity_hashes": build_entity_hashes,
+    "component_digests": lambda registry: build_component_digests(registry.get('components', {})),
+    "component_css": lambda registry: build_component_css_index(registry, load_component_css_usage()),
+    "completion_index": build_completion_index,
+    "markup_validators": build_markup_validators,
+}
+
+
+def write_artifacts(registry_raw: bytes, dest_dir: Path, compact_registry_raw: Optional[bytes] = None) -> Dict[str, Any]:
+    """Build every artifact for a registry and write them with a manifest.
+
+    Args:
+        registry_raw: The raw bytes of `component-registry.json`.
+        dest_dir: Directory to write the artifacts into (created if needed).
+        compact_registry_raw: The raw bytes of the equivalent compact registry, if one is shipped;
+            its content-dependent artifacts are the same as the full registry's.
+
+    Returns:
+        The manifest that was written.
+    """
+    registry = json.loads(registry_raw)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    for stale in dest_dir.glob("*.pkl"):
+        stale.unlink()
+
+    manifest: Dict[str, Any] = {
+        "builder_hash": builder_sources_hash(),
+        "input_hashes": input_hashes(),
+        "registry_hash": registry_content_hash(registry_raw),
+        "registry_version": registry.get('version', ''),
+        "compact_registry_hash": registry_content_hash(compact_registry_raw) if compact_registry_raw else None,
+        "artifacts": {},
+    }
+    for name, builder in ARTIFACT_BUILDERS.items():
+        artifact = builder(registry)
+        if artifact is None:
+            # Optional dependency missing at build time; the server builds it on demand
+            continue
+        payload = pickle.dumps(artifact, protocol=pickle.HIGHEST_PROTOCOL)
+        file_name = f"{name}.pkl"
+        (dest_dir / file_name).write_bytes(payload)
+        manifest["artifacts"][name] = {
+            "file": file_name,
+            "sha256": hashlib.sha256(payload).hexdigest(),
+            "bytes": len(payload),
+        }
+
+    (dest_dir / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding='utf-8')
+    return manifest
+
+
+class ArtifactStore:
+    """Lazy, validated reader for the precomputed artifacts shipped with the package."""
+
+    def __init__(self, base, registry_hash: str):
+        """
+        Args:
+            base: A directory path or `importlib.resources` Traversable holding the artifacts.
+            registry_hash: Content hash of the registry the server actually loaded.
+        """
+        self.base = base
+        self.registry_hash = registry_hash
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._manifest_checked = False
+
+    @property
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        """The manifest if it exists and matches this registry snapshot, else None."""
+        if not self._manifest_checked:
+            self._manifest_checked = True
+            try:
+                manifest = json.loads(self.base.joinpath(MANIFEST_FILE).read_text(encoding='utf-8'))
+            except Exception:
+                manifest = None
+            if manifest and self._builders_match(manifest) and self.registry_hash in (
+                    manifest.get("registry_hash"), manifest.get("compact_registry_hash")):
+                self._manifest = manifest
+        return self._manifest
+
+    @staticmethod
+    def _builders_match(manifest: Dict[str, Any]) -> bool:
+        builder_hash = builder_sources_hash()
+        return (builder_hash is not None and manifest.get("builder_hash") == builder_hash
+                and manifest.get("input_hashes") == input_hashes())
+
+    def load(self, name: str) -> Any:
+        """Load one artifact, or return None if it is absent, stale or corrupt."""
+        entry = (self.manifest or {}).get("artifacts", {}).get(name)
+        if not entry:
+            return None
+        try:
+            payload = self.base.joinpath(entry["file"]).read_bytes()
+            if hashlib.sha256(payload).hexdigest() != entry["sha256"]:
+                return None
+            return pickle.loads(payload)
+        except Exception:
+            return None
@@ -0,0 +1,122 @@
+"""
+Co-access statistics of tool calls, used to prefetch likely follow-up payloads.
+
+Sessions follow predictable patterns, e.g. `get_component_by_tag('vg-dropdown')`
+is usually followed by one of its examples and the schemas its props
+reference. Every call of a prefetchable tool is recorded as an access key
+(tool name plus canonical arguments); each access that follows another one
+within the same session, at most `window` calls later, counts as a co-access.
+
+Counts are persisted as JSON in the local cache directory so usage learned in
+one session benefits the next ones. A tool called with `prefetch=true` then
+attaches the most likely follow-up payloads, observed at least `min_count`
+times and with at least `min_probability`, within a byte budget.
+"""
+
+import json
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+STATS_FILE = "coaccess.json"
+DEFAULT_WINDOW = 3
+# Follow-up keys kept per access key (least frequent are dropped beyond this)
+MAX_FOLLOWUPS_PER_KEY = 16
+# Persist at most this often (seconds), plus once at exit
+SAVE_INTERVAL = 30.0
+# Sessions whose recent-call window is kept (a daemon serves many sessions over time)
+MAX_TRACKED_SESSIONS = 256
+
+
+def access_key(tool: str, arguments: Dict[str, Any]) -> str:
+    """Canonical key of a tool call (argument order independent)."""
+    return json.dumps([tool, arguments], sort_keys=True, separators=(',', ':'))
+
+
+def parse_access_key(key: str) -> Tuple[str, Dict[str, Any]]:
+    """Inverse of access_key: return `(tool, arguments)`."""
+    tool, arguments = json.loads(key)
+    return tool, arguments
+
+
+class CoAccessStats:
+    """Per-key access and co-access counters, persisted to the local cache directory."""
+
+    def __init__(self, directory: Optional[Path], window: int = DEFAULT_WINDOW):
+        self.path = directory / STATS_FILE if directory is not None else None
+        self.window = window
+        self.accesses: Dict[str, int] = {}
+        self.followups: Dict[str, Dict[str, int]] = {}
+        self._recent: "OrderedDict[str, Deque[str]]" = OrderedDict()
+        self._dirty = False
+        self._last_save = 0.0
+        self._load()
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            self.accesses = {key: int(count) for key, count in data.get("accesses", {}).items()}
+            self.followups = {key: {follow: int(count) for follow, count in follows.items()}
+                              for key, follows in data.get("followups", {}).items()}
+        except (OSError, ValueError, AttributeError):
+            pass
+
+    def record(self, session_id: str, tool: str, arguments: Dict[str, Any]):
+        """Record one tool call of a session and count it as a follow-up of the session's recent calls."""
+        key = access_key(tool, arguments)
+        recent = self._recent.get(session_id)
+        if recent is None:
+            recent = self._recent[session_id] = deque(maxlen=self.window)
+            if len(self._recent) > MAX_TRACKED_SESSIONS:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(session_id)
+        for previous in set(recent):
+            if previous == key:
+                continue
+            follows = self.followups.setdefault(previous, {})
+            follows[key] = follows.get(key, 0) + 1
+            if len(follows) > MAX_FOLLOWUPS_PER_KEY:
+                del follows[min(follows, key=follows.get)]
+        self.accesses[key] = self.accesses.get(key, 0) + 1
+        recent.append(key)
+        self._dirty = True
+        if time.monotonic() - self._last_save > SAVE_INTERVAL:
+            self.save()
+
+    def likely_followups(self, tool: str, arguments: Dict[str, Any], limit: int = 5,
+                         min_count: int = 2, min_probability: float = 0.2) -> List[Tuple[str, Dict[str, Any], float]]:
+        """Return the most likely next calls after this one.
+
+        Returns:
+            `(tool, arguments, probability)` tuples, most likely first.
+        """
+        key = access_key(tool, arguments)
+        accesses = self.accesses.get(key, 0)
+        if not accesses:
+            return []
+        candidates = []
+        for follow, count in self.followups.get(key, {}).items():
+            probability = min(count / accesses, 1.0)
+            if count >= min_count and probability >= min_probability:
+                candidates.append((probability, follow))
+        candidates.sort(reverse=True)
+        return [(*parse_access_key(follow), probability) for probability, follow in candidates[:limit]]
+
+    def save(self):
+        """Persist the counters if they changed since the last save (creating the directory on the first save)."""
+        self._last_save = time.monotonic()
+        if self.path is None or not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps({"accesses": self.accesses, "followups": self.followups}), encoding='utf-8')
+            temporary.replace(self.path)
+            self._dirty = False
+        except OSError:
+            pass
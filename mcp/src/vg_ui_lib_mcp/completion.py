@@ -0,0 +1,103 @@
+"""
+Prefix completion over the names of a VG UI Library registry snapshot.
+
+Agents and IDE integrations complete partial names: `vg-dr` to a component
+tag, `hel` to a prop of `vg-input`, `--vg-color-` to CSS custom properties.
+`CompletionIndex` keeps, per kind of name, a sorted array of case-folded
+names and answers a prefix with two binary searches (`bisect`), without
+scanning the registry. Names of component members (props and their
+attribute aliases, events, slots) are also indexed per component, so a
+completion can be scoped to one component.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from vg_ui_lib_mcp.css_tokens import build_css_token_table
+
+
+COMPLETION_KINDS = ("tag", "prop", "event", "slot", "schema", "css_variable")
+# Kinds whose names belong to components (completions list their components, and can be scoped to one)
+COMPONENT_MEMBER_KINDS = {"prop": "props", "event": "events", "slot": "slots"}
+# Sorts after every character, so `prefix + _PREFIX_END` bounds the names starting with `prefix`
+_PREFIX_END = "\U0010ffff"
+
+
+class SortedNames:
+    """Names sorted by case-folded form, each with the components it belongs to."""
+
+    __slots__ = ("keys", "names", "owners")
+
+    def __init__(self, owners_by_name: Dict[str, Iterable[str]]):
+        ordered = sorted(owners_by_name.items(), key=lambda item: (item[0].casefold(), item[0]))
+        self.keys = [name.casefold() for name, _ in ordered]
+        self.names = [name for name, _ in ordered]
+        self.owners = [sorted(owners) for _, owners in ordered]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def span(self, prefix: str) -> Tuple[int, int]:
+        """`(start, end)` positions of the names starting with `prefix` (case-insensitive)."""
+        folded = prefix.casefold()
+        return bisect_left(self.keys, folded), bisect_left(self.keys, folded + _PREFIX_END)
+
+
+class CompletionIndex:
+    """Sorted name arrays per kind, and per component for component members."""
+
+    def __init__(self, names: Dict[str, SortedNames], component_names: Dict[str, Dict[str, SortedNames]]):
+        self.names = names
+        self.component_names = component_names
+
+    def complete(self, prefix: str, kind: str, component_tag: Optional[str] = None,
+                 limit: int = 20) -> Optional[Dict[str, Any]]:
+        """Names of a kind starting with `prefix`, in case-insensitive order.
+
+        Args:
+            prefix: Start of the name (case-insensitive); empty for all names.
+            kind: One of COMPLETION_KINDS.
+            component_tag: Restrict prop, event and slot names to this component.
+            limit: Maximum number of completions.
+
+        Returns:
+            `{"total": matching names, "completions": [{"name", "components"?}]}`, or None
+            if the component is unknown or has no names of this kind.
+        """
+        if component_tag is not None and kind in COMPONENT_MEMBER_KINDS:
+            sorted_names = self.component_names.get(component_tag, {}).get(kind)
+            if sorted_names is None:
+                return None
+        else:
+            sorted_names = self.names[kind]
+        start, end = sorted_names.span(prefix)
+        completions = []
+        for position in range(start, min(end, start + max(limit, 0))):
+            completion = {"name": sorted_names.names[position]}
+            if kind in COMPONENT_MEMBER_KINDS and component_tag is None:
+                completion["components"] = sorted_names.owners[position]
+            completions.append(completion)
+        return {"total": end - start, "completions": completions}
+
+
+def build_completion_index(registry: Dict[str, Any]) -> CompletionIndex:
+    """Build the completion index of a registry snapshot."""
+    components = registry.get('components') or {}
+    owners: Dict[str, Dict[str, List[str]]] = {kind: {} for kind in COMPONENT_MEMBER_KINDS}
+    component_names: Dict[str, Dict[str, SortedNames]] = {}
+    for component_tag, component in components.items():
+        component_names[component_tag] = {}
+        for kind, section in COMPONENT_MEMBER_KINDS.items():
+            member_names = list(component.get(section) or {})
+            component_names[component_tag][kind] = SortedNames({name: () for name in member_names})
+            for name in member_names:
+                owners[kind].setdefault(name, []).append(component_tag)
+
+    css_variables = build_css_token_table(registry.get('predefined_css_definitions', "")).names
+    names = {
+        "tag": SortedNames({component_tag: () for component_tag in components}),
+        **{kind: SortedNames(owners[kind]) for kind in COMPONENT_MEMBER_KINDS},
+        "schema": SortedNames({schema_name: () for schema_name in registry.get('schemas') or {}}),
+        "css_variable": SortedNames({name: () for name in css_variables}),
+    }
+    return CompletionIndex(names, component_names)
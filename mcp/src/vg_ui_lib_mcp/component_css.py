@@ -0,0 +1,127 @@
+"""
+Index from VG UI Library component tags to the CSS custom properties they use.
+
+Styling one component should not require the whole stylesheet. For every
+component this index lists the custom properties it consumes (`var()`
+references) and exposes (properties it declares, i.e. its customization
+points), collected from:
+
+- the predefined CSS: rules whose selector names the component (e.g.
+  `.vg-theme-provider`), plus the theme scopes for `vg-theme-provider`,
+- the component stylesheets (`src/components/*/*.scss`), scanned at build
+  time by `setup.py` into `component-css-usage.json`, or directly from the
+  source tree during local development,
+- the component's examples (e.g. `style="--vg-accent-color: ..."`).
+"""
+
+import importlib.resources as pkg_resources
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from vg_ui_lib_mcp.css_tokens import iter_css_rules, iter_declarations, selector_theme
+from vg_ui_lib_mcp.framework_transformer import example_sources
+
+
+CSS_USAGE_FILE = "component-css-usage.json"
+# Component sources of the library when running from a source checkout
+COMPONENT_SOURCES_PATH = Path(__file__).parent.parent.parent.parent / "src" / "components"
+THEME_PROVIDER_TAG = "vg-theme-provider"
+
+_VAR_REFERENCE = re.compile(r"var\(\s*(--[\w-]+)")
+_DECLARATION = re.compile(r"(?<![\w-])(--[\w-]+)['\"]?\s*:")
+_CUSTOM_ELEMENT = re.compile(r"@customElement\(\s*[\"']([\w-]+)[\"']\s*\)")
+_STYLE_IMPORT = re.compile(r"from\s+[\"']\./([^\"'?]+\.s?css)(?:\?[^\"']*)?[\"']")
+
+
+def css_variable_usage(text: str) -> Tuple[Set[str], Set[str]]:
+    """Return `(consumed, declared)` custom property names of a stylesheet or source text."""
+    return set(_VAR_REFERENCE.findall(text)), set(_DECLARATION.findall(text))
+
+
+def scan_component_stylesheets(components_dir: Path) -> Dict[str, Dict[str, List[str]]]:
+    """Map each custom element defined under `components_dir` to the custom properties its stylesheets use.
+
+    Returns:
+        `{tag: {"consumes": [...], "declares": [...]}}` for every `@customElement` whose
+        module imports local stylesheets.
+    """
+    usage: Dict[str, Dict[str, List[str]]] = {}
+    for module in sorted(components_dir.glob("*/*.ts")):
+        source = module.read_text(encoding='utf-8')
+        tags = _CUSTOM_ELEMENT.findall(source)
+        stylesheets = [module.parent / name for name in _STYLE_IMPORT.findall(source)]
+        if not tags or not stylesheets:
+            continue
+        consumed, declared = set(), set()
+        for stylesheet in stylesheets:
+            if stylesheet.exists():
+                stylesheet_consumed, stylesheet_declared = css_variable_usage(stylesheet.read_text(encoding='utf-8'))
+                consumed |= stylesheet_consumed
+                declared |= stylesheet_declared
+        for tag in tags:
+            usage[tag] = {"consumes": sorted(consumed), "declares": sorted(declared)}
+    return usage
+
+
+def load_component_css_usage() -> Dict[str, Dict[str, List[str]]]:
+    """Stylesheet usage of every component, from the source tree if present, else the packaged scan."""
+    if COMPONENT_SOURCES_PATH.is_dir():
+        return scan_component_stylesheets(COMPONENT_SOURCES_PATH)
+    try:
+        return json.loads(pkg_resources.files('vg_ui_lib_mcp.data').joinpath(CSS_USAGE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _names_component(selector: str, tag: str) -> bool:
+    return re.search(rf"(?<![\w-]){re.escape(tag)}(?![\w-])", selector) is not None
+
+
+def build_component_css_index(registry: Dict[str, Any], stylesheet_usage: Dict[str, Dict[str, List[str]]]) -> Dict[str, Dict[str, Any]]:
+    """Build the component tag -> custom properties index.
+
+    Args:
+        registry: The component registry.
+        stylesheet_usage: Output of `scan_component_stylesheets` (may be empty).
+
+    Returns:
+        `{tag: {"consumes": [...], "exposes": [...], "sources": {name: [where it was found]}}}`
+        for every component, names sorted.
+    """
+    rules = list(iter_css_rules(registry.get('predefined_css_definitions', "")))
+    index: Dict[str, Dict[str, Any]] = {}
+    for component_tag, component in (registry.get('components') or {}).items():
+        consumes: Set[str] = set()
+        exposes: Set[str] = set()
+        sources: Dict[str, Set[str]] = {}
+
+        def add(names: Set[str], target: Set[str], source: str):
+            target |= names
+            for name in names:
+                sources.setdefault(name, set()).add(source)
+
+        for selector, block in rules:
+            if _names_component(selector, component_tag) or (component_tag == THEME_PROVIDER_TAG and selector_theme(selector)):
+                for name, value in iter_declarations(block):
+                    if name.startswith("--"):
+                        add({name}, exposes, "predefined CSS")
+                    add(set(_VAR_REFERENCE.findall(value)), consumes, "predefined CSS")
+
+        usage = stylesheet_usage.get(component_tag) or {}
+        add(set(usage.get("consumes") or []), consumes, "component stylesheet")
+        add(set(usage.get("declares") or []), exposes, "component stylesheet")
+
+        for example in component.get('examples') or []:
+            for source in example_sources(example).values():
+                consumed, declared = css_variable_usage(source)
+                add(consumed, consumes, "examples")
+                add(declared, exposes, "examples")
+
+        index[component_tag] = {
+            "consumes": sorted(consumes),
+            "exposes": sorted(exposes),
+            "sources": {name: sorted(found_in) for name, found_in in sorted(sources.items())},
+        }
+    return index
@@ -0,0 +1,107 @@
+"""
+Multi-level component digests for token-efficient component discovery.
+
+`list_components` used to return bare tags, so learning what each component
+does took one `get_component_by_tag` call per component. The digests below
+describe every component at increasing levels of detail. They are built at
+load (or packaging) time together with the serialized size of every level, so
+an agent can pick the cheapest level that answers its question:
+
+- `tags`: the component tags only
+- `summary`: tag, category and a one-line summary
+- `props`: summary plus prop, event and slot names
+- `full`: the complete API (prop types, enums, defaults, required flags,
+  event detail types, slots and example ids) without prose descriptions
+"""
+
+import re
+from typing import Any, Dict, List
+
+from vg_ui_lib_mcp import json_backend
+
+
+DIGEST_LEVELS = ("tags", "summary", "props", "full")
+
+_MAX_SUMMARY_LENGTH = 160
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _one_liner(component_tag: str, component: Dict[str, Any]) -> str:
+    """First sentence of the description, or a summary composed from the API when there is none."""
+    description = " ".join((component.get('descriptions') or '').split())
+    if description:
+        sentence = _SENTENCE_END.split(description, maxsplit=1)[0]
+        if len(sentence) > _MAX_SUMMARY_LENGTH:
+            sentence = sentence[:_MAX_SUMMARY_LENGTH - 1].rstrip() + "…"
+        return sentence
+
+    parts = [f"{component.get('category') or component_tag} component"]
+    events = list((component.get('events') or {}).keys())
+    if events:
+        parts.append(f"emits {', '.join(events)}")
+    slots = list((component.get('slots') or {}).keys())
+    if slots:
+        parts.append(f"slots: {', '.join(slots)}")
+    return "; ".join(parts)
+
+
+def _default_value(prop: Dict[str, Any]) -> Any:
+    default = prop.get('default')
+    if isinstance(default, dict):
+        return default.get('summary')
+    return default
+
+
+def _full_api(component_tag: str, component: Dict[str, Any]) -> Dict[str, Any]:
+    props = {}
+    for prop_name, prop in (component.get('props') or {}).items():
+        api = {"type": prop.get('type', '')}
+        if prop.get('enum'):
+            api["enum"] = prop['enum']
+        default = _default_value(prop)
+        if default is not None:
+            api["default"] = default
+        if prop.get('required'):
+            api["required"] = True
+        props[prop_name] = api
+    return {
+        "tag": component_tag,
+        "category": component.get('category', ''),
+        "summary": _one_liner(component_tag, component),
+        "props": props,
+        "events": {event_name: event.get('parameterType', '') for event_name, event in (component.get('events') or {}).items()},
+        "slots": list((component.get('slots') or {}).keys()),
+        "example_ids": [example.get('id', '') for example in component.get('examples') or [] if example.get('id')],
+    }
+
+
+def build_component_digests(components: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Build and serialize the digest of every level for all components.
+
+    Args:
+        components: The `components` mapping from the component registry.
+
+    Returns:
+        `{level: {"components": [...], "bytes": <serialized UTF-8 size>}}` for every level in DIGEST_LEVELS.
+    """
+    digests: Dict[str, List[Any]] = {level: [] for level in DIGEST_LEVELS}
+    for component_tag, component in components.items():
+        summary = {
+            "tag": component_tag,
+            "category": component.get('category', ''),
+            "summary": _one_liner(component_tag, component),
+        }
+        digests["tags"].append(component_tag)
+        digests["summary"].append(summary)
+        digests["props"].append({
+            **summary,
+            "props": list((component.get('props') or {}).keys()),
+            "events": list((component.get('events') or {}).keys()),
+            "slots": list((component.get('slots') or {}).keys()),
+        })
+        digests["full"].append(_full_api(component_tag, component))
+
+    return {
+        level: {"components": digest, "bytes": len(json_backend.dumps(digest).encode('utf-8'))}
+        for level, digest in digests.items()
+    }
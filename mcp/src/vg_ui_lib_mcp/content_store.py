@@ -0,0 +1,205 @@
+"""
+Content-addressed deduplication of the loaded component registry.
+
+A decoded registry holds many equal strings as separate objects: prop types,
+descriptions repeated across components and alias props (`helperText` and
+`helper-text`), event detail types, example args. Example sources repeat
+whole lines of boilerplate (imports, theme-provider wrappers, stylesheet
+links, event listener scaffolding) across examples and frameworks.
+
+`dedupe_registry` returns a copy of the registry in which every string is
+interned by a `ContentStore`, so equal contents share one object. Long
+example sources are stored as `PackedText`s (arrays of ids of interned line
+blocks, reassembled only when the source is read), held by a
+`PackedExample` outside its dict items: registry values stay plain JSON, and
+sources are read through `framework_transformer.example_sources()`.
+`report()` returns the byte counts before and after, so the saving can be
+verified on large registries:
+
+    python -m vg_ui_lib_mcp.content_store [path/to/component-registry.json]
+"""
+
+import os
+import sys
+from array import array
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+
+# Sources shorter than this are interned whole instead of packed into line blocks
+MIN_PACKED_LENGTH = 256
+
+
+class PackedText:
+    """A text stored as a sequence of content-addressed line blocks of a ContentStore."""
+
+    __slots__ = ("store", "block_ids")
+
+    def __init__(self, store: "ContentStore", block_ids: array):
+        self.store = store
+        self.block_ids = block_ids
+
+    def text(self) -> str:
+        """Reassemble the text from its blocks."""
+        blocks = self.store.blocks
+        return "\n".join([blocks[block_id] for block_id in self.block_ids])
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def __repr__(self) -> str:
+        return f"PackedText({len(self.block_ids)} blocks)"
+
+
+class PackedExample(dict):
+    """A deduplicated example whose sources are kept in `packed_sources`, not in its items.
+
+    `packed_sources` maps every framework of the example, in registry order, to
+    its source: a PackedText for long sources, an interned string otherwise. The
+    `sources` item stays in place (for key order) but holds None.
+    """
+
+    __slots__ = ("packed_sources",)
+
+
+def stored_sources(example: Dict[str, Any]) -> Dict[str, Any]:
+    """The sources stored for an example, in registry order (PackedTexts for a packed example)."""
+    packed_sources = getattr(example, "packed_sources", None)
+    return packed_sources if packed_sources is not None else (example.get('sources') or {})
+
+
+def unpack_text(value: Any) -> Any:
+    """Return the string a stored source stands for (reassembling a PackedText), other values unchanged."""
+    return value.text() if isinstance(value, PackedText) else value
+
+
+class ContentStore:
+    """Interned strings and line blocks shared by everything deduplicated into the store."""
+
+    def __init__(self, blocks: Optional[Sequence[str]] = None):
+        """
+        Args:
+            blocks: Existing line blocks (e.g. of a shared snapshot) for a store that
+                only reads the PackedTexts pointing to them; None for a new store.
+        """
+        self.strings: Dict[str, str] = {}
+        self.blocks: Sequence[str] = [] if blocks is None else blocks
+        self._block_ids: Dict[str, int] = {}
+        # Sizes of the values passed in, and number of references resolved to shared objects
+        self.input_bytes = 0
+        self.shared_references = 0
+        self.packed_texts = 0
+        self.packed_bytes = 0
+
+    def intern(self, value: str) -> str:
+        """Return the store's object for this string content."""
+        self.input_bytes += sys.getsizeof(value)
+        interned = self.strings.setdefault(value, value)
+        if interned is not value:
+            self.shared_references += 1
+        return interned
+
+    def pack(self, text: str) -> PackedText:
+        """Store a text as line blocks, sharing every line already in the store."""
+        self.input_bytes += sys.getsizeof(text)
+        self.packed_texts += 1
+        block_ids = array("I")
+        for line in text.split("\n"):
+            block_id = self._block_ids.get(line)
+            if block_id is None:
+                block_id = self._block_ids[line] = len(self.blocks)
+                self.blocks.append(line)
+            else:
+                self.shared_references += 1
+            block_ids.append(block_id)
+        packed = PackedText(self, block_ids)
+        self.packed_bytes += sys.getsizeof(packed) + sys.getsizeof(block_ids)
+        return packed
+
+    def intern_key(self, key: str) -> str:
+        """Return the store's object for a dict key, without accounting: JSON decoders already share repeated keys."""
+        return self.strings.setdefault(key, key)
+
+    def dedupe(self, value: Any) -> Any:
+        """Return a copy of a decoded JSON value with all strings (keys and values) interned."""
+        if isinstance(value, str):
+            return self.intern(value)
+        if isinstance(value, dict):
+            return {self.intern_key(key): self.dedupe(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.dedupe(item) for item in value]
+        return value
+
+    def dedupe_example(self, example: Dict[str, Any]) -> Dict[str, Any]:
+        """Return a deduplicated copy of an example, a PackedExample if any of its sources is long enough to pack."""
+        sources = example.get('sources') or {}
+        if not any(isinstance(source, str) and len(source) >= MIN_PACKED_LENGTH for source in sources.values()):
+            return self.dedupe(example)
+        packed = PackedExample({self.intern_key(key): None if key == 'sources' else self.dedupe(value)
+                                for key, value in example.items()})
+        packed.packed_sources = {
+            self.intern_key(framework): self.pack(source) if isinstance(source, str) and len(source) >= MIN_PACKED_LENGTH
+            else self.dedupe(source)
+            for framework, source in sources.items()
+        }
+        return packed
+
+    def report(self) -> Dict[str, Any]:
+        """Counts and sizes showing what deduplication saved.
+
+        Returns:
+            Unique strings and blocks, packed texts, references resolved to
+            shared objects, and `input_bytes` (every string as decoded) versus
+            `stored_bytes` (unique strings and blocks plus the packed texts).
+        """
+        stored_bytes = (sum(sys.getsizeof(value) for value in self.strings.values())
+                        + sum(sys.getsizeof(block) for block in self.blocks)
+                        + self.packed_bytes)
+        return {
+            "unique_strings": len(self.strings),
+            "unique_blocks": len(self.blocks),
+            "packed_texts": self.packed_texts,
+            "shared_references": self.shared_references,
+            "input_bytes": self.input_bytes,
+            "stored_bytes": stored_bytes,
+        }
+
+
+def dedupe_registry(registry: Dict[str, Any], store: Optional[ContentStore] = None) -> Tuple[Dict[str, Any], ContentStore]:
+    """Deduplicate a decoded registry: intern every string and pack long example sources.
+
+    Args:
+        registry: A decoded component registry (full or compact), left unchanged.
+        store: The store to deduplicate into; a new one when None.
+
+    Returns:
+        `(deduplicated registry, store)`; the store's `report()` describes the saving.
+    """
+    store = store if store is not None else ContentStore()
+    deduped = {}
+    for key, value in registry.items():
+        if key == 'components' and isinstance(value, dict):
+            value = {store.intern_key(component_tag): {
+                store.intern_key(field): [store.dedupe_example(example) for example in item]
+                if field == 'examples' and isinstance(item, list) else store.dedupe(item)
+                for field, item in component.items()
+            } for component_tag, component in value.items()}
+        else:
+            value = store.dedupe(value)
+        deduped[store.intern_key(key)] = value
+    return deduped, store
+
+
+if __name__ == "__main__":
+    import json
+    import time
+
+    registry_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "data", "component-registry.json")
+    with open(registry_path, "rb") as registry_file:
+        registry = json.loads(registry_file.read())
+    start = time.perf_counter()
+    report = dedupe_registry(registry)[1].report()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    saved = report["input_bytes"] - report["stored_bytes"]
+    print(f"Saved {saved} bytes ({100 * saved / report['input_bytes']:.1f}%) in {elapsed_ms:.1f} ms")
@@ -0,0 +1,294 @@
+"""
+CSS design-token extraction for the VG UI Library predefined CSS definitions.
+
+The registry ships the library stylesheet as one minified string
+(`predefined_css_definitions`). This module parses it into a flat table of
+CSS custom property declarations so tools can answer token questions without
+handing the whole stylesheet to the agent.
+
+`CssTokenTable` adds the resolved value of every declaration, computed by
+following its `var()` chain through memoized resolution with cycle detection,
+and indexes the rows by exact name, sorted name (for prefix lookups) and
+value, so "what is `--vg-color-primary` actually" is a dict lookup.
+
+The table also knows the themes of `vg-theme-provider`: every selector that
+only targets one theme (`.vg-theme-dark,[data-vg-theme=dark]`,
+`:host(.vg-theme-dark)`) is a theme scope layered over the provider and root
+scopes. The value of every token under every theme and the differences
+between every pair of themes are precomputed.
+"""
+
+import re
+from bisect import bisect_left
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+_AT_STATEMENT = re.compile(r"@(?:import|charset|namespace)[^;{}]*;")
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_VAR = re.compile(r"var\(\s*")
+
+_THEME_REFERENCE = re.compile(r"\.vg-theme-([\w-]+)|\[data-vg-theme=[\"']?([\w-]+)[\"']?\]")
+
+# Scopes whose declarations every other selector inherits when it doesn't declare a token itself
+ROOT_SCOPE = ":root"
+HOST_SCOPE = ":host"
+# Selector parts of the theme provider's own scope, which every theme is layered on
+THEME_PROVIDER_PARTS = frozenset({"[data-vg-theme]", ".vg-theme-provider"})
+# Pseudo-theme for tokens outside any theme provider
+DEFAULT_THEME = "default"
+
+
+def iter_css_rules(css: str) -> Iterator[Tuple[str, str]]:
+    """Yield `(selector, declarations)` pairs for every innermost rule block."""
+    css = _AT_STATEMENT.sub("", _COMMENT.sub("", css or ""))
+    for match in _RULE.finditer(css):
+        yield " ".join(match.group(1).split()), match.group(2)
+
+
+def iter_declarations(block: str) -> Iterator[Tuple[str, str]]:
+    """Yield `(property, value)` pairs from a declaration block, keeping parenthesized `;` intact."""
+    depth, start = 0, 0
+    for i, char in enumerate(block + ";"):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif char == ";" and depth == 0:
+            name, sep, value = block[start:i].partition(":")
+            start = i + 1
+            if sep and name.strip():
+                yield name.strip(), value.strip()
+
+
+def parse_css_custom_properties(css: str) -> List[Dict[str, str]]:
+    """Parse every CSS custom property declaration in the stylesheet.
+
+    Args:
+        css: The `predefined_css_definitions` string from the registry.
+
+    Returns:
+        A list of `{"name", "value", "selector"}` rows in source order.
+    """
+    tokens = []
+    for selector, block in iter_css_rules(css):
+        for name, value in iter_declarations(block):
+            if name.startswith("--"):
+                tokens.append({"name": name, "value": value, "selector": selector})
+    return tokens
+
+
+def _normalize_value(value: str) -> str:
+    return " ".join(value.split()).lower()
+
+
+def scope_chain(selector: str) -> Tuple[str, ...]:
+    """Scopes a declaration of `selector` resolves `var()` references in, most specific first.
+
+    A token not declared by the selector itself comes from `:host` for shadow
+    DOM selectors, and from `:root` otherwise.
+    """
+    chain = [selector]
+    if selector.startswith(HOST_SCOPE) and selector != HOST_SCOPE:
+        chain.append(HOST_SCOPE)
+    if selector != ROOT_SCOPE:
+        chain.append(ROOT_SCOPE)
+    return tuple(chain)
+
+
+def selector_theme(selector: str) -> Optional[str]:
+    """The theme a selector scopes tokens to, if every part of it targets the same single theme.
+
+    `.vg-theme-dark,[data-vg-theme=dark]` and `:host(.vg-theme-dark)` are `dark`;
+    selectors with descendant parts (`:host(.vg-theme-dark) ::slotted(*)`) are not theme scopes.
+    """
+    themes = set()
+    for part in selector.split(","):
+        part = part.strip()
+        references = {light or shadow for light, shadow in _THEME_REFERENCE.findall(part)}
+        if len(references) != 1 or " " in part:
+            return None
+        themes |= references
+    return themes.pop() if len(themes) == 1 else None
+
+
+def _is_theme_provider_scope(selector: str) -> bool:
+    return all(part.strip() in THEME_PROVIDER_PARTS for part in selector.split(","))
+
+
+def _split_var_arguments(css: str, start: int) -> Tuple[str, Optional[str], int]:
+    """Split the arguments of the `var(` call whose arguments start at `start`.
+
+    Returns:
+        `(name, fallback or None, index just after the closing parenthesis)`.
+    """
+    depth, comma = 0, None
+    for i in range(start, len(css)):
+        char = css[i]
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            if depth == 0:
+                if comma is None:
+                    return css[start:i].strip(), None, i + 1
+                return css[start:comma].strip(), css[comma + 1:i].strip(), i + 1
+            depth -= 1
+        elif char == "," and depth == 0 and comma is None:
+            comma = i
+    # Unbalanced: treat the rest as the name
+    return css[start:].strip(), None, len(css)
+
+
+class CssTokenTable:
+    """Every CSS custom property declaration with its resolved value, indexed for lookups.
+
+    Each row is `{"name", "value", "selector", "resolved"}` plus `"cycle": True`
+    when the declaration's `var()` chain runs into a cycle without a fallback
+    (its resolved value is then None, like an invalid value in the browser). References to tokens the
+    stylesheet doesn't declare stay as `var(...)` in the resolved value.
+    """
+
+    def __init__(self, tokens: List[Dict[str, str]]):
+        # (selector, name) -> raw value; later declarations win, like in the cascade
+        self._declarations: Dict[Tuple[str, str], str] = {}
+        for token in tokens:
+            self._declarations[(token["selector"], token["name"])] = token["value"]
+        self._memo: Dict[Tuple[Tuple[str, ...], str], Optional[str]] = {}
+        # Tokens at which a var() cycle was detected
+        self.cycles: List[str] = []
+
+        self.rows: List[Dict[str, Any]] = []
+        for token in tokens:
+            row = dict(token)
+            row["resolved"] = self.resolve(token["name"], scope_chain(token["selector"]))
+            if row["resolved"] is None:
+                row["cycle"] = True
+            self.rows.append(row)
+
+        self.by_name: Dict[str, List[int]] = {}
+        self.by_value: Dict[str, List[int]] = {}
+        for position, row in enumerate(self.rows):
+            self.by_name.setdefault(row["name"], []).append(position)
+            for value in {_normalize_value(row["value"]), _normalize_value(row["resolved"] or "")} - {""}:
+                self.by_value.setdefault(value, []).append(position)
+        self.names: List[str] = sorted(self.by_name)
+
+        # Theme -> scope chain (theme selectors, light DOM first, then the provider scopes and :root)
+        selectors = list(dict.fromkeys(token["selector"] for token in tokens))
+        provider_scopes = [selector for selector in selectors if _is_theme_provider_scope(selector)]
+        self.themes: Dict[str, Tuple[str, ...]] = {DEFAULT_THEME: (ROOT_SCOPE,)}
+        for selector in sorted(selectors, key=lambda selector: selector.startswith(HOST_SCOPE)):
+            theme = selector_theme(selector)
+            if theme:
+                self.themes[theme] = self.themes.get(theme, ()) + (selector,)
+        for theme, theme_scopes in self.themes.items():
+            if theme != DEFAULT_THEME:
+                self.themes[theme] = theme_scopes + tuple(provider_scopes) + (ROOT_SCOPE,)
+
+        # Theme -> {token name: resolved value} and (theme, other theme) -> {token name: [value, other value]}
+        self.theme_values: Dict[str, Dict[str, Optional[str]]] = {
+            theme: {name: self.resolve(name, chain) for name in self.names if self._declared_in(name, chain)}
+            for theme, chain in self.themes.items()
+        }
+        self.theme_diffs: Dict[Tuple[str, str], Dict[str, List[Optional[str]]]] = {}
+        for theme in self.themes:
+            for other in self.themes:
+                if theme < other:
+                    values, other_values = self.theme_values[theme], self.theme_values[other]
+                    self.theme_diffs[(theme, other)] = {
+                        name: [values.get(name), other_values.get(name)]
+                        for name in self.names
+                        if values.get(name) != other_values.get(name)
+                    }
+
+    def _declared_in(self, name: str, chain: Tuple[str, ...]) -> bool:
+        return any((scope, name) in self._declarations for scope in chain)
+
+    def resolve(self, name: str, chain: Tuple[str, ...]) -> Optional[str]:
+        """Resolve a token in a scope chain (memoized), or None if it is part of a cycle.
+
+        Args:
+            name: The custom property name, e.g. `--vg-shadow-soft`.
+            chain: Scopes to look the token (and the tokens it references) up in, most specific first.
+
+        Returns:
+            The value with every `var()` substituted, the literal `var(name)` if no scope
+            declares the token, or None if its `var()` chain is cyclic.
+        """
+        return self._resolve(name, chain, set())
+
+    def _resolve(self, name: str, chain: Tuple[str, ...], resolving: set) -> Optional[str]:
+        key = (chain, name)
+        if key in self._memo:
+            return self._memo[key]
+        raw = next((self._declarations[(scope, name)] for scope in chain if (scope, name) in self._declarations), None)
+        if raw is None:
+            return f"var({name})"
+        if key in resolving:
+            if name not in self.cycles:
+                self.cycles.append(name)
+            return None
+        resolving.add(key)
+        resolved = self._substitute(raw, chain, resolving)
+        resolving.discard(key)
+        self._memo[key] = resolved
+        return resolved
+
+    def _substitute(self, value: str, chain: Tuple[str, ...], resolving: set) -> Optional[str]:
+        parts, position = [], 0
+        for match in _VAR.finditer(value):
+            if match.start() < position:
+                continue
+            name, fallback, end = _split_var_arguments(value, match.end())
+            resolved = self._resolve(name, chain, resolving)
+            if resolved is None or resolved == f"var({name})" and fallback is not None:
+                # Cyclic or undeclared: the fallback applies, if there is one
+                if fallback is None:
+                    return None
+                resolved = self._substitute(fallback, chain, resolving)
+                if resolved is None:
+                    return None
+            parts.append(value[position:match.start()])
+            parts.append(resolved)
+            position = end
+        parts.append(value[position:])
+        return "".join(parts)
+
+    def lookup(self, name: str) -> List[Dict[str, Any]]:
+        """Every declaration of a token, in source order."""
+        return [self.rows[position] for position in self.by_name.get(name, [])]
+
+    def with_prefix(self, prefix: str) -> List[Dict[str, Any]]:
+        """Every declaration of the tokens whose name starts with `prefix`, by name."""
+        rows = []
+        for i in range(bisect_left(self.names, prefix), len(self.names)):
+            if not self.names[i].startswith(prefix):
+                break
+            rows.extend(self.lookup(self.names[i]))
+        return rows
+
+    def with_value(self, value: str) -> List[Dict[str, Any]]:
+        """Every declaration whose raw or resolved value equals `value` (case and whitespace insensitive)."""
+        return [self.rows[position] for position in self.by_value.get(_normalize_value(value), [])]
+
+    def theme_tokens(self, theme: str) -> Optional[Dict[str, Optional[str]]]:
+        """Resolved value of every token under a theme, or None if the theme is unknown."""
+        return self.theme_values.get(theme)
+
+    def theme_diff(self, theme: str, other: str) -> Optional[Dict[str, Dict[str, Optional[str]]]]:
+        """Tokens whose resolved value differs between two themes, or None if either theme is unknown.
+
+        Returns:
+            `{token name: {theme: value, other: value}}`; a token missing under a theme has the value None.
+        """
+        if theme not in self.themes or other not in self.themes:
+            return None
+        if theme == other:
+            return {}
+        first, second = sorted((theme, other))
+        return {name: {first: values[0], second: values[1]} for name, values in self.theme_diffs[(first, second)].items()}
+
+
+def build_css_token_table(css: str) -> CssTokenTable:
+    """Parse the stylesheet and resolve every custom property declaration."""
+    return CssTokenTable(parse_css_custom_properties(css))
@@ -0,0 +1,166 @@
+"""
+Unix domain socket transport for the persistent VG UI Library MCP server daemon.
+
+`vg-ui-lib-mcp-server --daemon` keeps one warm server process (registry,
+derived indexes, response cache, categorized CSS) and serves every connection
+on its socket as an independent MCP session, using the same newline-delimited
+JSON-RPC framing as the stdio transport. `vg_ui_lib_mcp.stdio_shim` is the
+client side. The daemon exits once no session has been connected for
+`DAEMON_IDLE_TIMEOUT` seconds; the shim starts a new one on the next use.
+"""
+
+import os
+import signal
+import sys
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Callable, Optional
+
+import anyio
+import anyio.lowlevel
+from anyio.streams.buffered import BufferedByteReceiveStream
+from fastmcp import FastMCP
+from mcp.server.lowlevel.server import NotificationOptions
+from mcp.shared.message import SessionMessage
+import mcp.types as types
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Largest single JSON-RPC message accepted from a client
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# Seconds without any connected session after which the daemon exits (0 to keep it running)
+DAEMON_IDLE_TIMEOUT: float = float(os.environ.get('FASTMCP_DAEMON_IDLE_TIMEOUT') or 600)
+
+
+@asynccontextmanager
+async def socket_session_streams(stream: anyio.abc.ByteStream):
+    """Adapt a connected byte stream to the MCP session read/write streams (like `stdio_server`)."""
+    read_stream_writer, read_stream = anyio.create_memory_object_stream(0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream(0)
+    buffered = BufferedByteReceiveStream(stream)
+
+    async def socket_reader():
+        try:
+            async with read_stream_writer:
+                while True:
+                    try:
+                        line = await buffered.receive_until(b"\n", MAX_MESSAGE_BYTES)
+                    except (anyio.EndOfStream, anyio.IncompleteRead, anyio.BrokenResourceError):
+                        break
+                    if not line.strip():
+                        continue
+                    try:
+                        message = types.JSONRPCMessage.model_validate_json(line)
+                    except Exception as exc:
+                        await read_stream_writer.send(exc)
+                        continue
+                    await read_stream_writer.send(SessionMessage(message))
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def socket_writer():
+        try:
+            async with write_stream_reader:
+                async for session_message in write_stream_reader:
+                    payload = session_message.message.model_dump_json(by_alias=True, exclude_none=True)
+                    await stream.send(payload.encode('utf-8') + b"\n")
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(socket_reader)
+        tg.start_soon(socket_writer)
+        yield read_stream, write_stream
+
+
+def _acquire_daemon_lock(socket_path: Path):
+    """Hold an exclusive lock for the daemon's lifetime so only one daemon serves a socket.
+
+    Returns:
+        The open lock file (keep a reference to it), or None if another daemon holds the lock.
+    """
+    lock_file = open(socket_path.with_name(socket_path.name + ".lock"), "a+b")
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return None
+    return lock_file
+
+
+async def serve_unix_socket(server: FastMCP, socket_path: Path, on_listening: Optional[Callable[[], None]] = None,
+                            idle_timeout: float = DAEMON_IDLE_TIMEOUT):
+    """Serve MCP sessions of `server` on a Unix domain socket until SIGTERM/SIGINT or idle.
+
+    Args:
+        server: The FastMCP server whose warm state every session shares.
+        socket_path: Path of the socket to listen on (replaced if stale).
+        on_listening: Called once the socket accepts connections (e.g. to warm caches).
+        idle_timeout: Stop after this many seconds without a connected session (0 or less never stops).
+    """
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = _acquire_daemon_lock(socket_path)
+    if lock_file is None:
+        print(f"VG UI Library MCP daemon already running on {socket_path}", file=sys.stderr)
+        return
+
+    try:
+        # The lock guarantees no live daemon owns an existing socket file
+        socket_path.unlink(missing_ok=True)
+        listener = await anyio.create_unix_listener(socket_path)
+        os.chmod(socket_path, 0o600)
+        print(f"VG UI Library MCP daemon listening on {socket_path}", file=sys.stderr)
+        if on_listening is not None:
+            on_listening()
+        initialization_options = server._mcp_server.create_initialization_options(
+            NotificationOptions(tools_changed=True, resources_changed=True)
+        )
+
+        sessions = 0
+        idle_since = time.monotonic()
+
+        async def handle_connection(stream: anyio.abc.ByteStream):
+            nonlocal sessions, idle_since
+            sessions += 1
+            try:
+                async with stream, socket_session_streams(stream) as (read_stream, write_stream):
+                    await server._mcp_server.run(read_stream, write_stream, initialization_options)
+            except Exception as e:
+                # A broken session must never take the daemon down
+                print(f"Daemon session ended with error: {e!r}", file=sys.stderr)
+            finally:
+                sessions -= 1
+                if sessions == 0:
+                    idle_since = time.monotonic()
+
+        async def stop_when_idle(cancel_scope: anyio.CancelScope):
+            while True:
+                # Checked and cancelled without yielding, so no connection is accepted in between
+                remaining = idle_timeout if sessions else idle_since + idle_timeout - time.monotonic()
+                if remaining <= 0:
+                    print(f"VG UI Library MCP daemon stopping after {idle_timeout:g}s without sessions", file=sys.stderr)
+                    cancel_scope.cancel()
+                    return
+                await anyio.sleep(remaining)
+
+        async def stop_on_signal(cancel_scope: anyio.CancelScope):
+            with anyio.open_signal_receiver(signal.SIGTERM, signal.SIGINT) as signals:
+                async for _ in signals:
+                    print("VG UI Library MCP daemon stopping", file=sys.stderr)
+                    cancel_scope.cancel()
+                    return
+
+        async with listener, anyio.create_task_group() as tg:
+            tg.start_soon(stop_on_signal, tg.cancel_scope)
+            if idle_timeout > 0:
+                tg.start_soon(stop_when_idle, tg.cancel_scope)
+            await listener.serve(handle_connection)
+    finally:
+        socket_path.unlink(missing_ok=True)
+        lock_file.close()
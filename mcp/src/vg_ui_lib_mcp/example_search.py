@@ -0,0 +1,263 @@
+"""
+Trigram code search over VG UI Library component example sources.
+
+Every distinct line of the `examples[].sources[framework]` entries is
+indexed by its case-folded character trigrams, one index per framework. A
+search intersects the posting lists of the query's trigrams and only
+verifies the few candidate lines that survive, so finding "how do I bind
+`@vg-change` in Vue" is one indexed lookup instead of downloading every
+example. Identical lines (closing tags, imports, boilerplate) are stored and
+indexed once, with the list of places they occur.
+
+Case folding is length-preserving (`fold_case`), so match spans found in the
+folded text are valid positions in the original line. Lines are indexed with
+two trailing padding characters, so every position of a line starts a
+trigram and terms of one or two characters are answered from the trigrams
+that start with them instead of a scan.
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from vg_ui_lib_mcp.framework_transformer import example_sources
+
+
+NGRAM_SIZE = 3
+# Never part of a stripped line, so padding trigrams only match short-term prefixes
+_PADDING = "\n" * (NGRAM_SIZE - 1)
+# Sorts after every character, so `prefix + _PREFIX_END` bounds the grams starting with `prefix`
+_PREFIX_END = "\U0010ffff"
+
+
+def fold_case(text: str) -> str:
+    """Lower-case `text` character by character, keeping its length.
+
+    Characters whose lower-case form is longer (e.g. `İ`) are kept as they are,
+    so offsets into the folded text are offsets into `text`.
+    """
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    return "".join(lowered if len(lowered) == 1 else char for char, lowered in ((char, char.lower()) for char in text))
+
+
+def _trigrams(text: str) -> set:
+    """Return the set of distinct trigrams in `text`."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class TrigramIndex:
+    """Line-level trigram index for the example sources of a single framework."""
+
+    def __init__(self, framework: str):
+        self.framework = framework
+        # Distinct stripped lines; line ids index this list
+        self.lines: List[str] = []
+        # Occurrences of line `i` are `occurrence_doc/occurrence_line_no[occurrence_starts[i]:occurrence_starts[i + 1]]`
+        self.occurrence_starts = array('I')
+        self.occurrence_doc = array('I')
+        self.occurrence_line_no = array('I')
+        # Documents are (component_tag, example_id) pairs
+        self.docs: List[Tuple[str, str]] = []
+        # Sorted grams; the posting list of `grams[i]` is `postings[gram_starts[i]:gram_starts[i + 1]]`
+        self.grams: List[str] = []
+        self.gram_starts = array('I')
+        self.postings = array('I')
+        self._pending: Dict[str, List[int]] = {}
+        self._occurrences: Dict[str, List[Tuple[int, int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def add_source(self, component_tag: str, example_id: str, source: str):
+        """Record every non-blank line of one example source."""
+        doc_id = len(self.docs)
+        self.docs.append((component_tag, example_id))
+        for line_no, line in enumerate(source.splitlines(), start=1):
+            stripped = line.strip()
+            if stripped:
+                # Interned, so lines and grams shared between frameworks are one object (and pickled once)
+                stripped = sys.intern(stripped)
+                self._occurrences.setdefault(stripped, []).append((doc_id, line_no))
+
+    def finalize(self):
+        """Index the recorded lines and pack the posting lists into flat arrays."""
+        pending: Dict[str, List[int]] = {}
+        for line_id, (line, occurrences) in enumerate(self._occurrences.items()):
+            self.lines.append(line)
+            self.occurrence_starts.append(len(self.occurrence_doc))
+            for doc_id, line_no in occurrences:
+                self.occurrence_doc.append(doc_id)
+                self.occurrence_line_no.append(line_no)
+            for gram in _trigrams(fold_case(line) + _PADDING):
+                pending.setdefault(gram, []).append(line_id)
+        self.occurrence_starts.append(len(self.occurrence_doc))
+        self._occurrences = {}
+
+        # Line ids and posting offsets fit in 16 bits for all but very large registries
+        self.postings = array('H' if len(self.lines) <= 0xFFFF else 'I')
+        starts = [0]
+        for gram in sorted(pending):
+            self.grams.append(sys.intern(gram))
+            self.postings.extend(pending[gram])
+            starts.append(len(self.postings))
+        self.gram_starts = array('H' if len(self.postings) <= 0xFFFF else 'I', starts)
+
+    def occurrences(self, line_id: int) -> List[Tuple[int, int]]:
+        """`(doc_id, line_no)` of every place a line occurs, in source order."""
+        start, end = self.occurrence_starts[line_id], self.occurrence_starts[line_id + 1]
+        return list(zip(self.occurrence_doc[start:end], self.occurrence_line_no[start:end]))
+
+    def _gram_range(self, gram: str) -> Tuple[int, int]:
+        position = bisect_left(self.grams, gram)
+        if position < len(self.grams) and self.grams[position] == gram:
+            return self.gram_starts[position], self.gram_starts[position + 1]
+        return 0, 0
+
+    def candidates(self, term: str) -> set:
+        """Return the ids of the lines that may contain the case-folded `term`."""
+        postings = memoryview(self.postings)
+        if len(term) < NGRAM_SIZE:
+            # Union of the posting lists of every gram starting with the term
+            first = bisect_left(self.grams, term)
+            last = bisect_left(self.grams, term + _PREFIX_END)
+            return set(postings[self.gram_starts[first]:self.gram_starts[last]])
+        spans = sorted((self._gram_range(gram) for gram in _trigrams(term)), key=lambda span: span[1] - span[0])
+        start, end = spans[0]
+        result = set(postings[start:end])
+        for start, end in spans[1:]:
+            if not result:
+                break
+            result.intersection_update(postings[start:end])
+        return result
+
+
+def build_example_indexes(components: Dict[str, Any]) -> Dict[str, TrigramIndex]:
+    """Build one TrigramIndex per framework from all component example sources.
+
+    Args:
+        components: The `components` mapping from the component registry.
+
+    Returns:
+        A dict mapping framework name to its TrigramIndex.
+    """
+    indexes: Dict[str, TrigramIndex] = {}
+    for component_tag, component in components.items():
+        for example in component.get('examples') or []:
+            example_id = example.get('id', '')
+            for framework, source in example_sources(example).items():
+                if not isinstance(source, str):
+                    continue
+                index = indexes.get(framework)
+                if index is None:
+                    index = indexes[framework] = TrigramIndex(framework)
+                index.add_source(component_tag, example_id, source)
+    for index in indexes.values():
+        index.finalize()
+    return indexes
+
+
+def _find_spans(folded_line: str, terms: List[str]) -> List[List[int]]:
+    """Return merged `[start, end)` spans of every term occurrence in the line."""
+    spans = []
+    for term in terms:
+        start = folded_line.find(term)
+        while start != -1:
+            spans.append([start, start + len(term)])
+            start = folded_line.find(term, start + 1)
+    spans.sort()
+    merged: List[List[int]] = []
+    for span in spans:
+        if merged and span[0] <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], span[1])
+        else:
+            merged.append(span)
+    return merged
+
+
+def _highlight(line: str, spans: List[List[int]]) -> str:
+    """Wrap each span of the line in `**` markers."""
+    parts, cursor = [], 0
+    for start, end in spans:
+        parts.append(line[cursor:start])
+        parts.append(f"**{line[start:end]}**")
+        cursor = end
+    parts.append(line[cursor:])
+    return "".join(parts)
+
+
+def search_example_indexes(
+    indexes: Dict[str, TrigramIndex],
+    query: str,
+    framework: Optional[str] = None,
+    component_tag: Optional[str] = None,
+    limit: int = 20,
+) -> List[Dict[str, Any]]:
+    """Search example sources for lines containing the query terms.
+
+    The query is split on whitespace; a line matches if it contains at least
+    one term. Lines are ranked by the number of distinct terms they contain,
+    then by whether the whole query appears verbatim, then by line length.
+
+    Args:
+        indexes: Per-framework indexes built by `build_example_indexes`.
+        query: Free text or code fragment to look for (case-insensitive).
+        framework: Restrict the search to one framework's sources.
+        component_tag: Restrict the search to one component's examples.
+        limit: Maximum number of hits to return.
+
+    Returns:
+        Ranked hits with component_tag, example_id, framework, line number,
+        the line snippet, highlighted spans and a highlighted snippet.
+    """
+    phrase = fold_case(query.strip())
+    terms = list(dict.fromkeys(term for term in phrase.split() if term))
+    if not terms:
+        return []
+
+    if framework:
+        targets = [indexes[framework]] if framework in indexes else []
+    else:
+        targets = list(indexes.values())
+
+    scored = []
+    for index in targets:
+        folded_lines: Dict[int, str] = {}
+        matched_terms: Dict[int, int] = {}
+        for term in terms:
+            for line_id in index.candidates(term):
+                folded = folded_lines.get(line_id)
+                if folded is None:
+                    folded = folded_lines[line_id] = fold_case(index.lines[line_id])
+                if term in folded:
+                    matched_terms[line_id] = matched_terms.get(line_id, 0) + 1
+
+        for line_id, term_count in matched_terms.items():
+            folded = folded_lines[line_id]
+            exact = len(terms) > 1 and phrase in folded
+            for doc_id, line_no in index.occurrences(line_id):
+                if component_tag and index.docs[doc_id][0] != component_tag:
+                    continue
+                sort_key = (-term_count, not exact, len(folded), index.framework, doc_id, line_no)
+                scored.append((sort_key, index, line_id, folded))
+
+    scored.sort(key=lambda item: item[0])
+
+    hits = []
+    for (neg_count, _, _, _, doc_id, line_no), index, line_id, folded in scored[:max(limit, 0)]:
+        tag, example_id = index.docs[doc_id]
+        line = index.lines[line_id]
+        spans = _find_spans(folded, terms)
+        hits.append({
+            "component_tag": tag,
+            "example_id": example_id,
+            "framework": index.framework,
+            "line": line_no,
+            "snippet": line,
+            "highlighted": _highlight(line, spans),
+            "spans": spans,
+            "score": round(-neg_count / len(terms), 3),
+        })
+    return hits
@@ -0,0 +1,458 @@
+"""
+Python port of `.storybook/utils/framework-transformer.ts`.
+
+The registry stores every example six times: one source per framework (html,
+react, react19, vue, angular, lit), all produced by the Storybook framework
+transformer from the same inputs (the story args plus the slot and child
+content of the rendered story). This module reproduces that transformer
+byte for byte, so a compact registry can keep only the canonical `html`
+source plus `args` and the server derives the other variants on demand.
+
+The transformer inputs are recovered from the canonical source: the component
+name and content come from its markup, and event handlers (which Storybook
+args lose when serialized to JSON) from its `addEventListener` calls.
+`compact_registry` only drops a framework's source after checking that
+deriving it reproduces the stored text exactly, so a compact registry is
+always equivalent to the full one. Derived sources are memoized in an LRU.
+
+Run `python -m vg_ui_lib_mcp.framework_transformer <component-registry.json>`
+to check equivalence against a full registry and report the size reduction.
+"""
+
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from vg_ui_lib_mcp.content_store import stored_sources, unpack_text
+
+
+FRAMEWORKS = ("html", "react", "react19", "vue", "angular", "lit")
+CANONICAL_FRAMEWORK = "html"
+# Example key listing the frameworks whose source is derived instead of stored (compact registries only)
+DERIVED_FRAMEWORKS_KEY = "derived_frameworks"
+DERIVED_SOURCES_CACHE_SIZE = int(os.environ.get('FASTMCP_DERIVED_SOURCES_CACHE') or 512)
+
+_UPPER = re.compile(r"([A-Z])")
+_DASH_LOWER = re.compile(r"-([a-z])")
+_LISTENER = re.compile(r"^  element\.addEventListener\('([^']*)', \(event\) => \{$", re.MULTILINE)
+_SLOT = re.compile(
+    r"<([a-z][a-z0-9-]*)\s+([^>]*\s)?slot=\"([^\"]+)\"([^>]*)>([\s\S]*?)</\1>"
+    r"|<([a-z][a-z0-9-]*)\s+([^>]*\s)?slot=\"([^\"]+)\"([^>]*)/>",
+    re.IGNORECASE,
+)
+
+
+# ---------------------------------------------------------------------------
+# JavaScript value formatting
+# ---------------------------------------------------------------------------
+
+def _js_number(value: float) -> Any:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e21:
+        return int(value)
+    return value
+
+
+def _js_normalize(value: Any) -> Any:
+    """Make Python JSON values print like JavaScript (integral floats as integers)."""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return _js_number(value)
+    if isinstance(value, dict):
+        return {key: _js_normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_js_normalize(item) for item in value]
+    return value
+
+
+def _json_stringify(value: Any) -> str:
+    """`JSON.stringify(value)`."""
+    return json.dumps(_js_normalize(value), ensure_ascii=False, separators=(',', ':'))
+
+
+def _js_string(value: Any) -> str:
+    """`String(value)` for primitives."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(_js_number(value))
+    return str(value)
+
+
+def _present(value: Any) -> bool:
+    """`value !== false && value !== undefined && value !== null`."""
+    return value is not False and value is not None
+
+
+def _kebab(key: str) -> str:
+    """`key.replace(/([A-Z])/g, '-$1').toLowerCase()`."""
+    return _UPPER.sub(r"-\1", key).lower()
+
+
+def _camel(key: str) -> str:
+    """`key.replace(/-([a-z])/g, (_, letter) => letter.toUpperCase())`."""
+    return _DASH_LOWER.sub(lambda match: match.group(1).upper(), key)
+
+
+def _event_name(key: str) -> str:
+    return re.sub(r"^on-", "", _kebab(key))
+
+
+def _content_lines(slots: Dict[str, str], children: str, indent: str, child_line: Optional[str] = None) -> List[str]:
+    lines = [f"{indent}{content}" for content in slots.values()]
+    if children:
+        lines.append(child_line if child_line is not None else f"{indent}{children}")
+    return lines
+
+
+# ---------------------------------------------------------------------------
+# Framework transforms (same order and output as the TypeScript functions)
+# ---------------------------------------------------------------------------
+
+def _html_attributes(attrs: Dict[str, Any]) -> str:
+    result = ""
+    for key, value in attrs.items():
+        attr_name = re.sub(r"^on-", "@", _kebab(key))
+        if attr_name.startswith("@"):
+            continue
+        if value is True:
+            result += f"\n  {attr_name}"
+        elif _present(value):
+            string_value = _json_stringify(value).replace('"', "'") if isinstance(value, (dict, list)) else _js_string(value)
+            result += f"\n  {attr_name}=\"{string_value}\""
+    return result
+
+
+def transform_to_html(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    slot_content = "\n".join(f"  {content}" for content in slots.values())
+    all_content = "\n  ".join(part for part in (slot_content, children) if part)
+    listeners = "\n".join(
+        f"  element.addEventListener('{_event_name(key)}', (event) => {{\n"
+        f"    console.log('{_event_name(key)}', event.detail);\n"
+        f"  }});"
+        for key in attrs if key.startswith("on")
+    )
+    return (f"<{component_name}{_html_attributes(attrs)}\n>\n  {all_content}\n</{component_name}>\n\n"
+            f"<script>\n  const element = document.querySelector('{component_name}');\n  \n"
+            f"  // Event listeners\n{listeners}\n</script>")
+
+
+def transform_to_react(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    pascal_name = "".join(part[:1].upper() + part[1:] for part in component_name.split("-"))
+    jsx_attrs = ""
+    for key, value in attrs.items():
+        prop_name = f"on{key[2:3].upper()}{key[3:]}" if key.startswith("on") else _camel(key)
+        if value is True:
+            jsx_attrs += f"\n      {prop_name}"
+        elif _present(value):
+            if isinstance(value, str):
+                jsx_attrs += f"\n      {prop_name}=\"{value}\""
+            else:
+                jsx_attrs += f"\n      {prop_name}={{{_json_stringify(value)}}}"
+    imports = [f"import {{ {pascal_name} }} from 'vg/react'", "import 'vg'"]
+    event_handlers = "\n\n".join(
+        f"const handleEvent = (event) => {{\n    console.log('{_event_name(key)}', event.detail);\n  }};"
+        for key in attrs if key.startswith("on")
+    )
+    lines = _content_lines(slots, children, "    ")
+    content = "\n" + "\n".join(lines) + "\n    " if lines else "\n    "
+    handlers = f"  {event_handlers}\n\n" if event_handlers else ""
+    return (f"{chr(10).join(imports)}\n\nfunction MyComponent() {{\n{handlers}  return (\n"
+            f"    <{pascal_name}{jsx_attrs}\n    >{content}</{pascal_name}>\n  );\n}}")
+
+
+def transform_to_vue(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    vue_attrs = ""
+    script_content = []
+    for key, value in attrs.items():
+        prop_name = _camel(key)
+        if key.startswith("on"):
+            vue_attrs += f"\n    @{_event_name(key)}=\"handleEvent\""
+        elif value is True:
+            vue_attrs += f"\n    {key}"
+        elif _present(value):
+            if isinstance(value, str):
+                vue_attrs += f"\n    {key}=\"{value}\""
+            else:
+                script_content.append(f"const {prop_name} = ref({_json_stringify(value)})")
+                vue_attrs += f"\n    :{key}=\"{prop_name}\""
+    if any(key.startswith("on") for key in attrs):
+        script_content.append("const handleEvent = (event) => {\n  console.log(event.type, event.detail);\n}")
+    lines = _content_lines(slots, children, "    ")
+    content = "\n" + "\n".join(lines) + "\n  " if lines else "\n  "
+    return (f"<script setup>\nimport 'vg/vue'\nimport {{ ref }} from 'vue'\n\n{chr(10).join(script_content)}\n</script>\n\n"
+            f"<template>\n  <{component_name}{vue_attrs}\n  >{content}</{component_name}>\n</template>")
+
+
+def transform_to_angular(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    angular_attrs = ""
+    properties = []
+    methods = []
+    for key, value in attrs.items():
+        prop_name = _camel(key)
+        if key.startswith("on"):
+            angular_attrs += f"\n    ({_event_name(key)})=\"onEvent($event)\""
+        elif value is True:
+            angular_attrs += f"\n    [{key}]=\"true\""
+        elif _present(value):
+            if isinstance(value, str):
+                properties.append(f"  public {prop_name} = '{value}';")
+            else:
+                properties.append(f"  public {prop_name} = {_json_stringify(value)};")
+            angular_attrs += f"\n    [{key}]=\"{prop_name}\""
+    if any(key.startswith("on") for key in attrs):
+        methods.append("  onEvent(event: Event) {\n    console.log((event as CustomEvent).detail);\n  }")
+    lines = _content_lines(slots, children, "  ")
+    content = "\n" + "\n".join(lines) + "\n" if lines else "\n"
+    return ("// component.ts\nimport { Component, CUSTOM_ELEMENTS_SCHEMA } from '@angular/core';\n\n"
+            "@Component({\n  selector: 'app-demo',\n  standalone: true,\n  templateUrl: './demo.component.html',\n"
+            "  schemas: [CUSTOM_ELEMENTS_SCHEMA]\n})\n"
+            f"export class DemoComponent {{\n{chr(10).join(properties)}\n\n{chr(10).join(methods)}\n}}\n\n"
+            f"// demo.component.html\n<{component_name}{angular_attrs}\n>{content}</{component_name}>")
+
+
+def transform_to_react19(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    jsx_attrs = ""
+    for key, value in attrs.items():
+        prop_name = re.sub(r"^on-", "on", _kebab(key)) if key.startswith("on") else _camel(key)
+        if key.startswith("on"):
+            jsx_attrs += f"\n      {prop_name}={{handleEvent}}"
+        elif value is True:
+            jsx_attrs += f"\n      {prop_name}"
+        elif _present(value):
+            if isinstance(value, str):
+                jsx_attrs += f"\n      {prop_name}=\"{value}\""
+            else:
+                jsx_attrs += f"\n      {prop_name}={{{_json_stringify(value)}}}"
+    imports = ["import 'vg/jsx'", "import 'vg/index.css'"]
+    event_handlers = "\n\n".join(
+        f"const handleEvent = (event: CustomEvent) => {{\n    console.log('{_event_name(key)}', event.detail);\n  }};"
+        for key in attrs if key.startswith("on")
+    )
+    lines = _content_lines(slots, children, "    ", child_line=f"    {{{_json_stringify(children)}}}")
+    content = "\n" + "\n".join(lines) + "\n    " if lines else "\n    "
+    handlers = f"  {event_handlers}\n\n" if event_handlers else ""
+    return (f"{chr(10).join(imports)}\n\nfunction MyComponent() {{\n{handlers}  return (\n"
+            f"    <{component_name}{jsx_attrs}\n    >{content}</{component_name}>\n  );\n}}")
+
+
+def transform_to_lit(component_name: str, attrs: Dict[str, Any], children: str, slots: Dict[str, str]) -> str:
+    html_attrs = ""
+    for key, value in attrs.items():
+        attr_name = re.sub(r"^on-", "@", _kebab(key))
+        if key.startswith("on"):
+            html_attrs += f"\n        {attr_name}=${{this.handleEvent}}"
+        elif value is True:
+            html_attrs += f"\n        ?{attr_name}=${{true}}"
+        elif _present(value):
+            if isinstance(value, str):
+                html_attrs += f"\n        {attr_name}=\"{value}\""
+            else:
+                html_attrs += f"\n        .{attr_name}=${{{_json_stringify(value)}}}"
+    has_events = any(key.startswith("on") for key in attrs)
+    lines = _content_lines(slots, children, "        ")
+    content = "\n" + "\n".join(lines) + "\n      " if lines else "\n      "
+    handler = "\n  handleEvent(e: CustomEvent) {\n    console.log(e.type, e.detail);\n  }\n" if has_events else ""
+    return ("import { LitElement, html } from 'lit';\nimport { customElement } from 'lit/decorators.js';\n\n"
+            f"@customElement('my-demo')\nexport class MyDemo extends LitElement {{\n{handler}\n"
+            f"  render() {{\n    return html`\n      <{component_name}{html_attrs}\n      >{content}</{component_name}>\n    `;\n  }}\n}}")
+
+
+TRANSFORMS = {
+    "html": transform_to_html,
+    "react": transform_to_react,
+    "react19": transform_to_react19,
+    "vue": transform_to_vue,
+    "angular": transform_to_angular,
+    "lit": transform_to_lit,
+}
+
+
+# ---------------------------------------------------------------------------
+# Recovering the transformer inputs from the canonical source
+# ---------------------------------------------------------------------------
+
+def _split_slots(content: str) -> Tuple[Dict[str, str], str]:
+    """Port of `extractSlotsFromHTML` applied to the component content."""
+    slots: Dict[str, str] = {}
+    slotted = []
+    for match in _SLOT.finditer(content):
+        slot_name = match.group(3) or match.group(8)
+        if slot_name:
+            slots[slot_name] = match.group(0).strip()
+            slotted.append(match.group(0))
+    remaining = content
+    for slot_content in slotted:
+        remaining = remaining.replace(slot_content, "", 1)
+    return slots, remaining.strip()
+
+
+def transform_inputs(canonical_source: str, args: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any], str, Dict[str, str]]]:
+    """Recover `(component_name, attrs, children, slots)` from a canonical html source and the example args.
+
+    Returns:
+        The transformer inputs, or None if the source doesn't have the transformer's html shape.
+    """
+    match = re.match(r"<([a-z][a-z0-9-]*)", canonical_source)
+    if not match:
+        return None
+    component_name = match.group(1)
+    attrs = {key: value for key, value in args.items() if key != "children"}
+    for event_name in _LISTENER.findall(canonical_source):
+        # Storybook keeps `onVgChange`-style handler args, which are dropped when serialized to JSON
+        key = "on" + "".join(part[:1].upper() + part[1:] for part in event_name.split("-"))
+        attrs.setdefault(key, None)
+
+    head = f"<{component_name}{_html_attributes(attrs)}\n>\n  "
+    tail_start = canonical_source.rfind(f"\n</{component_name}>\n\n<script>")
+    if not canonical_source.startswith(head) or tail_start < len(head):
+        return None
+    slots, children = _split_slots(canonical_source[len(head):tail_start])
+    return component_name, attrs, children, slots
+
+
+def _transform(framework: str, canonical_source: str, args: Dict[str, Any]) -> Optional[str]:
+    inputs = transform_inputs(canonical_source, args)
+    if inputs is None:
+        return None
+    return TRANSFORMS[framework](*inputs)
+
+
+@lru_cache(maxsize=DERIVED_SOURCES_CACHE_SIZE)
+def _derive_source(framework: str, canonical_source: str, args_json: str) -> Optional[str]:
+    return _transform(framework, canonical_source, json.loads(args_json))
+
+
+def derived_sources_cache_stats() -> Dict[str, int]:
+    """Entry count, capacity and hit/miss counters of the derived sources LRU."""
+    info = _derive_source.cache_info()
+    return {"entries": info.currsize, "max_entries": info.maxsize, "hits": info.hits, "misses": info.misses}
+
+
+def derive_source(framework: str, canonical_source: str, args: Dict[str, Any]) -> Optional[str]:
+    """Derive one framework's source of an example (memoized).
+
+    Args:
+        framework: One of FRAMEWORKS.
+        canonical_source: The example's `html` source.
+        args: The example's `args`.
+
+    Returns:
+        The derived source, or None if the canonical source can't be parsed.
+    """
+    if framework not in TRANSFORMS:
+        return None
+    return _derive_source(framework, canonical_source, json.dumps(args, ensure_ascii=False))
+
+
+def example_frameworks(example: Dict[str, Any]) -> List[str]:
+    """Frameworks an example has a source for (stored or derivable), in registry order, without deriving any."""
+    stored = list(stored_sources(example))
+    derived = example.get(DERIVED_FRAMEWORKS_KEY)
+    if not derived:
+        return stored
+    available = set(stored) | set(derived)
+    return [framework for framework in FRAMEWORKS if framework in available] + [
+        framework for framework in stored if framework not in FRAMEWORKS]
+
+
+def example_sources(example: Dict[str, Any], frameworks: Optional[List[str]] = None) -> Dict[str, str]:
+    """Return the framework sources of an example as strings, deriving the ones a compact registry omits.
+
+    Args:
+        example: An example from the registry (full or compact, packed or not).
+        frameworks: Only return (and derive) these frameworks; all of them when None.
+    """
+    sources = stored_sources(example)
+    if not example.get(DERIVED_FRAMEWORKS_KEY) or CANONICAL_FRAMEWORK not in sources:
+        return {framework: unpack_text(source) for framework, source in sources.items()
+                if frameworks is None or framework in frameworks}
+    canonical = unpack_text(sources[CANONICAL_FRAMEWORK])
+    result = {}
+    for framework in example_frameworks(example):
+        if frameworks is not None and framework not in frameworks:
+            continue
+        source = unpack_text(sources.get(framework))
+        if source is None:
+            source = derive_source(framework, canonical, example.get('args') or {})
+        if source is not None:
+            result[framework] = source
+    return result
+
+
+def expand_example(example: Dict[str, Any], frameworks: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Return a copy of an example in the full registry form (all sources, no compact bookkeeping)."""
+    expanded = {key: value for key, value in example.items() if key != DERIVED_FRAMEWORKS_KEY}
+    expanded['sources'] = example_sources(example, frameworks)
+    return expanded
+
+
+# ---------------------------------------------------------------------------
+# Compact registries
+# ---------------------------------------------------------------------------
+
+def compact_registry(registry: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Drop every example source that derives exactly from the canonical source and args.
+
+    Args:
+        registry: A full component registry.
+
+    Returns:
+        `(compact_registry, report)`; the report counts derived and kept sources
+        and lists the `(component, example, framework)` sources that didn't match.
+    """
+    report: Dict[str, Any] = {"examples": 0, "derived_sources": 0, "stored_sources": 0, "mismatches": []}
+    compact = dict(registry)
+    compact_components = {}
+    for component_tag, component in (registry.get('components') or {}).items():
+        compact_examples = []
+        for example in component.get('examples') or []:
+            report["examples"] += 1
+            sources = {framework: unpack_text(source) for framework, source in stored_sources(example).items()}
+            canonical = sources.get(CANONICAL_FRAMEWORK)
+            kept = dict(sources)
+            derived = []
+            if canonical is not None:
+                for framework, source in sources.items():
+                    if framework == CANONICAL_FRAMEWORK:
+                        continue
+                    # Uncached: verifying equivalence must not fill the derived sources LRU
+                    if _transform(framework, canonical, example.get('args') or {}) == source:
+                        derived.append(framework)
+                        del kept[framework]
+                    else:
+                        report["mismatches"].append((component_tag, example.get('id', ''), framework))
+            report["derived_sources"] += len(derived)
+            report["stored_sources"] += len(kept)
+            compact_example = {**example, 'sources': kept}
+            if derived:
+                compact_example[DERIVED_FRAMEWORKS_KEY] = derived
+            compact_examples.append(compact_example)
+        compact_components[component_tag] = {**component, 'examples': compact_examples}
+    compact['components'] = compact_components
+    return compact, report
+
+
+if __name__ == "__main__":
+    registry_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "data", "component-registry.json")
+    with open(registry_path, "rb") as registry_file:
+        registry_raw = registry_file.read()
+    compact, report = compact_registry(json.loads(registry_raw))
+    compact_raw = json.dumps(compact, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    full_raw = json.dumps(json.loads(registry_raw), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    print(f"Examples: {report['examples']}, derived sources: {report['derived_sources']}, stored sources: {report['stored_sources']}")
+    for component_tag, example_id, framework in report["mismatches"]:
+        print(f"  not derivable: {component_tag} / {example_id} / {framework}")
+    print(f"Registry size: {len(full_raw)} -> {len(compact_raw)} bytes ({100 - 100 * len(compact_raw) / len(full_raw):.1f}% smaller)")
+    # Equivalence: every example's sources, derived or stored, must equal the full registry's
+    full_components = json.loads(registry_raw)['components']
+    for component_tag, component in compact['components'].items():
+        for position, example in enumerate(component.get('examples') or []):
+            original = full_components[component_tag]['examples'][position]['sources']
+            if example_sources(example) != original or list(example_sources(example)) != list(original):
+                print(f"  MISMATCH after derivation: {component_tag} / {example.get('id', '')}")
+                sys.exit(1)
+    print("All derived sources are equivalent to the full registry")
@@ -0,0 +1,185 @@
+"""
+Pluggable JSON backend and typed decoding of the VG UI Library component registry.
+
+The fastest installed library is used for both decoding the registry and
+encoding tool responses: msgspec, then orjson, then the stdlib `json` module
+(which encodes through pydantic-core, already a FastMCP dependency and faster
+than `json.dumps`). Set `FASTMCP_JSON_BACKEND` to `msgspec`, `orjson` or
+`json` to force one.
+
+The registry types below mirror the `ComponentRegistry` interfaces emitted by
+`.storybook/utils/gen-comp-registry.ts`. They are TypedDicts, so a typed
+decode validates the registry while still producing the plain dicts every
+tool works with. msgspec decodes and validates in a single pass, orjson
+decodes and pydantic-core validates the decoded objects, and the stdlib
+backend validates with pydantic-core's JSON parser.
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, List, Optional, Tuple
+
+import pydantic_core
+from pydantic import BaseModel, TypeAdapter
+from typing_extensions import NotRequired, TypedDict
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+# ---------------------------------------------------------------------------
+# Registry types (keep in sync with .storybook/utils/gen-comp-registry.ts)
+# ---------------------------------------------------------------------------
+
+ComponentProp = TypedDict('ComponentProp', {
+    'type': str,
+    'enum': List[Any],
+    'default': Any,
+    'description': str,
+    'required': bool,
+    '$ref': str,
+}, total=False)
+
+
+class ComponentEvent(TypedDict):
+    name: str
+    event: str
+    parameterType: str
+    description: NotRequired[str]
+
+
+class ComponentSlot(TypedDict, total=False):
+    exposed_data: str
+    description: str
+
+
+class ComponentExample(TypedDict):
+    id: str
+    name: str
+    sources: Dict[str, str]
+    args: Dict[str, Any]
+    # Compact registries only: frameworks whose source is derived from `html` + `args` (see framework_transformer)
+    derived_frameworks: NotRequired[List[str]]
+
+
+class ComponentDefinition(TypedDict):
+    lit_component_tag: str
+    category: str
+    descriptions: NotRequired[str]
+    component_hierarchy: NotRequired[str]
+    component_type: NotRequired[str]
+    props: Dict[str, ComponentProp]
+    events: Dict[str, ComponentEvent]
+    slots: NotRequired[Dict[str, ComponentSlot]]
+    exposed: NotRequired[Dict[str, Any]]
+    examples: NotRequired[List[ComponentExample]]
+
+
+class CategoryDefinition(TypedDict):
+    name: str
+    description: NotRequired[str]
+    components: List[str]
+
+
+class ComponentRegistry(TypedDict):
+    version: str
+    framework: str
+    library: str
+    # Schemas are either `{"values": [...]}` literal unions or interface member maps
+    schemas: Dict[str, Dict[str, Any]]
+    components: Dict[str, ComponentDefinition]
+    categories: Dict[str, CategoryDefinition]
+    predefined_css_definitions: NotRequired[str]
+
+
+# ---------------------------------------------------------------------------
+# Backend selection
+# ---------------------------------------------------------------------------
+
+AVAILABLE_BACKENDS = [name for name, module in (("msgspec", msgspec), ("orjson", orjson)) if module is not None] + ["json"]
+
+
+def _select_backend() -> str:
+    requested = (os.environ.get('FASTMCP_JSON_BACKEND') or 'auto').lower()
+    if requested in AVAILABLE_BACKENDS:
+        return requested
+    return AVAILABLE_BACKENDS[0]
+
+
+BACKEND: str = _select_backend()
+
+_registry_adapter = TypeAdapter(ComponentRegistry)
+_msgspec_registry_decoder = msgspec.json.Decoder(ComponentRegistry) if msgspec is not None else None
+
+
+def _encode_fallback(value: Any) -> Any:
+    """Encode the values tool results hold that the JSON libraries don't know natively.
+
+    These are pydantic models, mappings that aren't dicts (e.g. shared snapshot sections),
+    sets and tuples.
+
+    Raises:
+        TypeError: For any other type, like `json.dumps` and `orjson.dumps`.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def loads(raw: bytes | str) -> Any:
+    """Decode JSON with the active backend."""
+    if BACKEND == "msgspec":
+        return msgspec.json.decode(raw)
+    if BACKEND == "orjson":
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def dumps(value: Any) -> str:
+    """Encode a value as compact JSON text with the active backend."""
+    if BACKEND == "msgspec":
+        return msgspec.json.encode(value, enc_hook=_encode_fallback).decode('utf-8')
+    if BACKEND == "orjson":
+        return orjson.dumps(value, default=_encode_fallback).decode('utf-8')
+    return pydantic_core.to_json(value, fallback=_encode_fallback).decode('utf-8')
+
+
+def decode_registry(raw: bytes) -> Tuple[Dict[str, Any], Optional[str]]:
+    """Decode the registry into validated plain dicts.
+
+    Args:
+        raw: The raw bytes of `component-registry.json`.
+
+    Returns:
+        `(registry, validation_error)`. When the registry doesn't match the
+        typed schema it is decoded untyped instead and the error is returned
+        so the caller can report it.
+    """
+    if _msgspec_registry_decoder is not None and BACKEND == "msgspec":
+        try:
+            return _msgspec_registry_decoder.decode(raw), None
+        except Exception as e:
+            return loads(raw), str(e)
+    if BACKEND == "orjson":
+        # orjson parses, pydantic-core only validates the decoded objects
+        registry = orjson.loads(raw)
+        try:
+            return _registry_adapter.validate_python(registry), None
+        except Exception as e:
+            return registry, str(e)
+    try:
+        return _registry_adapter.validate_json(raw), None
+    except Exception as e:
+        return loads(raw), str(e)
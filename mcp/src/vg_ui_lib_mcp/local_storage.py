@@ -0,0 +1,39 @@
+"""
+Per-user local storage location for the VG UI Library MCP server.
+
+Everything the server persists between runs (registry version history,
+usage statistics, profiles, traces, shared caches) lives under one cache
+directory: `$FASTMCP_CACHE_DIR` if set, otherwise
+`$XDG_CACHE_HOME/vg-ui-lib-mcp` (default `~/.cache/vg-ui-lib-mcp`).
+"""
+
+import os
+from pathlib import Path
+from typing import Optional
+
+
+def cache_path(*parts: str) -> Path:
+    """Return the path of a sub-directory of the local cache directory, without creating it.
+
+    Stores that may never write resolve their directory with this and create it on their first write.
+    """
+    base = os.environ.get('FASTMCP_CACHE_DIR')
+    if base:
+        root = Path(base)
+    else:
+        root = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / ".cache") / "vg-ui-lib-mcp"
+    return root.joinpath(*parts)
+
+
+def cache_dir(*parts: str) -> Optional[Path]:
+    """Return (and create) a sub-directory of the local cache directory.
+
+    Returns:
+        The directory path, or None if it cannot be created (read-only home, sandbox, ...).
+    """
+    directory = cache_path(*parts)
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return directory
@@ -1,29 +1,63 @@
 import os
 os.environ['DANGEROUSLY_OMIT_AUTH']="true"
 import sys
+import asyncio
 from pathlib import Path
 import json
 import re
 import traceback
 import argparse
+import atexit
+import gc
 from typing import List, Dict, Any, Optional
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
 from pathlib import Path
 import importlib.resources as pkg_resources
+import hashlib
+import weakref
 
 from fastmcp import FastMCP, Context
+from fastmcp.exceptions import ResourceError
 from fastmcp.prompts.prompt import PromptMessage, TextContent
 from fastmcp.server.dependencies import get_context
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+from fastmcp.tools.tool import ToolResult
+import mcp.types as mcp_types
 from pydantic import BaseModel
 
 from vg_ui_lib_mcp.framework_instructions import get_project_setup_instructions
+from vg_ui_lib_mcp.coaccess import CoAccessStats
+from vg_ui_lib_mcp.completion import COMPLETION_KINDS, COMPONENT_MEMBER_KINDS
+from vg_ui_lib_mcp.content_store import ContentStore, dedupe_registry
+from vg_ui_lib_mcp.artifacts import ARTIFACT_BUILDERS, ARTIFACTS_DIR, ArtifactStore, registry_content_hash
+from vg_ui_lib_mcp.component_digests import DIGEST_LEVELS
+from vg_ui_lib_mcp.example_search import search_example_indexes
+from vg_ui_lib_mcp.framework_transformer import compact_registry, derived_sources_cache_stats, example_frameworks, example_sources, expand_example
+from vg_ui_lib_mcp import json_backend
+from vg_ui_lib_mcp.response_cache import DEFAULT_MAX_BYTES, CachedResponse, ResponseCache
+from vg_ui_lib_mcp.sampling_control import DEFAULT_MAX_CONCURRENT, DEFAULT_MAX_QUEUED, DEFAULT_MAX_WAITING, DEFAULT_TIMEOUT, SamplingCoalescer, SamplingQueueFull
+from vg_ui_lib_mcp.local_storage import cache_dir, cache_path
+from vg_ui_lib_mcp.markup_validator import MARKUP_FRAMEWORKS, validate_markup as validate_vg_markup
+from vg_ui_lib_mcp import memory_report
+from vg_ui_lib_mcp.registry_changes import RegistryHistory, diff_entity_hashes, example_key, split_example_key
+from vg_ui_lib_mcp.profiling import DEFAULT_MAX_PROFILES, SORT_KEYS, ToolProfiler, parse_tool_selection, profile_tool_name, summarize_profiles
+from vg_ui_lib_mcp.progress import report_progress_while
+from vg_ui_lib_mcp.prop_query import QueryPredicate, query_prop_event_table
+from vg_ui_lib_mcp.semantic_search import DEFAULT_MIN_SCORE
+from vg_ui_lib_mcp.shared_snapshot import REGISTRY_DEPTH, REGISTRY_SECTION, SharedSnapshot, SnapshotMapping, attach_shared_snapshot
+from vg_ui_lib_mcp.stdio_shim import canonical_server_args, default_socket_path
+from vg_ui_lib_mcp.text_pages import DEFAULT_PAGE_CHARS, TextPager
+from vg_ui_lib_mcp.tracing import DEFAULT_MAX_BYTES as DEFAULT_TRACE_MAX_BYTES, TRACE_FILE, Tracer
 
 
 # Path to the component registry JSON file
 COMPONENT_REGISTRY_PATH = Path(__file__).parent.parent.parent.parent / "storybook-static" / "stories_doc" / "component-registry.json"
 # Embedded file path (relative to the package data directory)
 COMPONENT_REGISTRY_EMBEDDED = "component-registry.json"
+# Embedded compact registry (derivable framework sources dropped), generated by setup.py
+COMPONENT_REGISTRY_COMPACT = "component-registry.compact.json"
+COMPONENT_REGISTRY_COMPACT_SOURCE = "embedded compact data"
 
 # Global variables to store loaded data
 component_registry: Dict[str, Any] = {}
@@ -33,13 +67,146 @@ categories_data: Dict[str, Any] = {}
 css_definitions: str = ""
 css_categorized: Dict[str, str] = {}
 css_category_list: str = ""
+registry_hash: str = ""
+# Interned strings and example source blocks of the loaded registry (only the blocks when served from a shared snapshot)
+content_store: Optional[ContentStore] = None
+# Derived indexes for the loaded registry, filled lazily by get_derived()
+artifact_store: Optional[ArtifactStore] = None
+derived_cache: Dict[str, Any] = {}
+# Snapshot shared with the other local server processes (shared registry mode only)
+shared_snapshot: Optional[SharedSnapshot] = None
+
+
+def _trace_file(enabled: bool, path: Optional[str]) -> Optional[Path]:
+    """Trace export file: an explicit path, else the default one in the local cache when enabled, else None."""
+    if path:
+        return Path(path)
+    traces_dir = cache_dir("traces") if enabled else None
+    return traces_dir / TRACE_FILE if traces_dir else None
+
+
+# Spans of tool calls and their phases, exported to a local OTLP/JSON lines file (FASTMCP_TRACE=1 or FASTMCP_TRACE_FILE)
+tracer = Tracer(
+    _trace_file((os.environ.get('FASTMCP_TRACE') or '').lower() in ('1', 'true', 'yes'), os.environ.get('FASTMCP_TRACE_FILE')),
+    max_bytes=int(os.environ.get('FASTMCP_TRACE_MAX_BYTES') or DEFAULT_TRACE_MAX_BYTES),
+)
+
+
+def serialize_result(value: Any) -> str:
+    """Encode a tool result as JSON (traced as the serialization phase)."""
+    with tracer.span("serialize") as span:
+        payload = json_backend.dumps(value)
+        span.set_attribute("bytes", len(payload))
+    return payload
+
+
+# Serialized payloads of pure tool results, keyed by (tool, args) and invalidated when registry_hash changes
+response_cache = ResponseCache(int(os.environ.get('FASTMCP_RESPONSE_CACHE_BYTES') or DEFAULT_MAX_BYTES), serializer=serialize_result)
+# Per-entity hashes of recent registry versions, for get_registry_changes
+registry_history = RegistryHistory(cache_path("registry-history"))
+# Observed follow-up calls of prefetchable tools, and the byte budget of prefetched payloads per response
+coaccess_stats = CoAccessStats(cache_path("usage"))
+PREFETCH_MAX_BYTES: int = int(os.environ.get('FASTMCP_PREFETCH_BYTES') or 16 * 1024)
+# Large text results are delivered page by page, the remaining pages are served by get_text_page
+text_pager = TextPager(int(os.environ.get('FASTMCP_PAGE_CHARS') or DEFAULT_PAGE_CHARS))
+# Coalesces concurrent categorize_css sampling and bounds how many runs sample or wait at once
+css_sampler = SamplingCoalescer(
+    max_concurrent=int(os.environ.get('FASTMCP_SAMPLING_CONCURRENCY') or DEFAULT_MAX_CONCURRENT),
+    max_queued=int(os.environ.get('FASTMCP_SAMPLING_QUEUE') or DEFAULT_MAX_QUEUED),
+    timeout=float(os.environ.get('FASTMCP_SAMPLING_TIMEOUT') or DEFAULT_TIMEOUT),
+    max_waiting=int(os.environ.get('FASTMCP_SAMPLING_MAX_WAITING') or DEFAULT_MAX_WAITING),
+)
+# Sampled cProfile profiles of selected tools (FASTMCP_PROFILE_TOOLS, `*` for all), kept in a rotating directory
+tool_profiler = ToolProfiler(
+    cache_path("profiles"),
+    tools=parse_tool_selection(os.environ.get('FASTMCP_PROFILE_TOOLS')),
+    sample_rate=float(os.environ.get('FASTMCP_PROFILE_RATE') or 1.0),
+    max_profiles=int(os.environ.get('FASTMCP_PROFILE_MAX_FILES') or DEFAULT_MAX_PROFILES),
+)
+
+# Trace Python allocations from startup (FASTMCP_TRACEMALLOC=<frames>) so get_memory_report can attribute the registry load
+if os.environ.get('FASTMCP_TRACEMALLOC'):
+    memory_report.start_tracemalloc(int(os.environ['FASTMCP_TRACEMALLOC']) if os.environ['FASTMCP_TRACEMALLOC'].isdigit() else 1)
+
+# Key of the registry version stamp in every tool response's content `_meta`
+REGISTRY_VERSION_META_KEY = "vg/registry_version"
+# Registry version each client session last saw; a different one after a reload triggers resources/list_changed
+announced_versions: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
 
 # Global variable to store framework preference from command-line argument or environment
 _use_framework: Optional[str] = os.environ.get('FASTMCP_USE_FRAMEWORK') or None
+# Share the decoded registry and derived indexes with the other local server processes
+_shared_registry: bool = (os.environ.get('FASTMCP_SHARED_REGISTRY') or '').lower() in ('1', 'true', 'yes')
+# Intern repeated registry strings and share repeated example source lines (FASTMCP_DEDUPE_REGISTRY=0 disables)
+_dedupe_registry: bool = (os.environ.get('FASTMCP_DEDUPE_REGISTRY') or '1').lower() not in ('0', 'false', 'no')
+# Keep only canonical example sources in memory and derive the other frameworks on demand
+_compact_registry: bool = (os.environ.get('FASTMCP_COMPACT_REGISTRY') or '').lower() in ('1', 'true', 'yes')
+# Socket path when running as a persistent daemon (--daemon), None for the stdio transport
+_daemon_socket: Optional[Path] = None
+# Print the memory report and exit instead of serving (--memory-report)
+_print_memory_report: bool = False
+
+# Background registry loading: data-dependent tools wait on registry_ready (up to the timeout)
+REGISTRY_READY_TIMEOUT: float = float(os.environ.get('FASTMCP_REGISTRY_READY_TIMEOUT') or 30)
+registry_ready: asyncio.Event = asyncio.Event()
+registry_load_task: Optional[asyncio.Task] = None
+
+
+def _read_registry_file() -> tuple[bytes, str]:
+    """Read the raw registry bytes, preferring the development path over the embedded data.
+
+    This does blocking file I/O and is meant to run in a worker thread.
+    """
+    # Try to load from the development path first (for local development)
+    if COMPONENT_REGISTRY_PATH.exists():
+        return COMPONENT_REGISTRY_PATH.read_bytes(), "development path (storybook-static)"
+    # Fall back to embedded data (for packaged distribution)
+    data_files = pkg_resources.files('vg_ui_lib_mcp.data')
+    if _compact_registry and data_files.joinpath(COMPONENT_REGISTRY_COMPACT).is_file():
+        return data_files.joinpath(COMPONENT_REGISTRY_COMPACT).read_bytes(), COMPONENT_REGISTRY_COMPACT_SOURCE
+    return data_files.joinpath(COMPONENT_REGISTRY_EMBEDDED).read_bytes(), "embedded data"
+
+
+def _parse_registry(registry_raw: bytes, compact_on_load: bool = False) -> tuple[Dict[str, Any], str, Optional[str]]:
+    """Decode and validate the registry JSON and compute its content hash (CPU bound, run in a worker thread).
+
+    With `compact_on_load` (compact registry mode reading a full registry) the
+    registry is compacted after decoding; its hash is then marked so it never
+    matches artifacts built for the full form. Unless disabled, the decoded
+    registry's strings and example sources are then deduplicated into a ContentStore.
+    In shared registry mode the registry is served from the shared snapshot: the
+    one another process already published for this version, or the one this
+    process publishes after decoding (dropping its private copy).
+    """
+    global shared_snapshot, content_store
+    
+    new_registry_hash = registry_content_hash(registry_raw + b"\0compact" if compact_on_load else registry_raw)
+    if shared_snapshot and shared_snapshot.registry_hash != new_registry_hash:
+        shared_snapshot.detach()
+        shared_snapshot = None
+    if _shared_registry and shared_snapshot is None:
+        shared_snapshot = attach_shared_snapshot(cache_dir("shared"), new_registry_hash)
+    
+    content_store = None
+    if shared_snapshot:
+        registry = shared_snapshot.load(REGISTRY_SECTION)
+        if registry is not None:
+            content_store = shared_snapshot.content_store(REGISTRY_SECTION)
+            return registry, new_registry_hash, None
+    registry, validation_error = json_backend.decode_registry(registry_raw)
+    if compact_on_load:
+        registry, _ = compact_registry(registry)
+    if _dedupe_registry:
+        registry, content_store = dedupe_registry(registry)
+    if shared_snapshot and not validation_error and shared_snapshot.publish(REGISTRY_SECTION, registry, REGISTRY_DEPTH):
+        shared_registry = shared_snapshot.load(REGISTRY_SECTION)
+        if shared_registry is not None:
+            registry, content_store = shared_registry, shared_snapshot.content_store(REGISTRY_SECTION)
+    return registry, new_registry_hash, validation_error
 
 async def load_component_registry(no_ctx:bool=False) -> str:
     """Load the component registry from the JSON file."""
-    global component_registry, components_data, schemas_data, categories_data, css_definitions,_use_framework
+    global component_registry, components_data, schemas_data, categories_data, css_definitions,_use_framework, registry_hash, artifact_store, derived_cache
 
     if no_ctx:
         class fake_ctx:
@@ -47,7 +214,8 @@ async def load_component_registry(no_ctx:bool=False) -> str:
                 self.info = self.async_print
                 self.error = self.async_print
             async def async_print(self,msg):
-                print(msg) 
+                # stdout carries the stdio transport, so log to stderr
+                print(msg, file=sys.stderr)
         ctx=fake_ctx()
     else:
         ctx = get_context()
@@ -59,29 +227,44 @@ async def load_component_registry(no_ctx:bool=False) -> str:
     try:
         await ctx.info(f"Loading component registry from {COMPONENT_REGISTRY_PATH}")
         
-        # Try to load from the development path first (for local development)
-        if COMPONENT_REGISTRY_PATH.exists():
-            await ctx.info("Loading from development path (storybook-static)")
-            with open(COMPONENT_REGISTRY_PATH, 'r', encoding='utf-8') as f:
-                component_registry = json.load(f)
-        else:
-            # Fall back to embedded data (for packaged distribution)
-            await ctx.info("Development path not found, loading from embedded data")
-            try:
-                with pkg_resources.files('vg_ui_lib_mcp.data').joinpath(COMPONENT_REGISTRY_EMBEDDED).open('r', encoding='utf-8') as f:
-                    component_registry = json.load(f)
-                await ctx.info("Successfully loaded from embedded data")
-            except Exception as embed_error:
-                error_msg = f"Component registry file not found at {COMPONENT_REGISTRY_PATH} and failed to load embedded data: {str(embed_error)}"
-                await ctx.error(f"ERROR: {error_msg}")
-                return error_msg
+        # File I/O and JSON decoding run in a worker thread so the event loop keeps serving requests
+        try:
+            registry_raw, registry_source = await asyncio.to_thread(_read_registry_file)
+            await ctx.info(f"Loading from {registry_source}")
+        except Exception as embed_error:
+            error_msg = f"Component registry file not found at {COMPONENT_REGISTRY_PATH} and failed to load embedded data: {str(embed_error)}"
+            await ctx.error(f"ERROR: {error_msg}")
+            return error_msg
+        
+        registry, new_registry_hash, validation_error = await asyncio.to_thread(
+            _parse_registry, registry_raw, _compact_registry and registry_source != COMPONENT_REGISTRY_COMPACT_SOURCE
+        )
+        if validation_error:
+            await ctx.error(f"⚠️ Registry does not match the expected schema, loaded it untyped: {validation_error}")
+        if isinstance(registry, SnapshotMapping):
+            await ctx.info(f"🔗 Serving the registry from the shared snapshot ({len(content_store.blocks) if content_store else 0} source blocks)")
+        elif content_store:
+            dedupe_report = content_store.report()
+            await ctx.info(f"🧱 Deduplicated registry strings: {dedupe_report['input_bytes'] / 1024:.1f} KB -> {dedupe_report['stored_bytes'] / 1024:.1f} KB "
+                           f"({dedupe_report['unique_strings']} strings, {dedupe_report['unique_blocks']} source blocks)")
         
-        # Extract different sections
+        # Swap in the new state without awaiting in between: on a reload (ClearCache), other
+        # sessions keep reading the previous registry and indexes until here
+        previous_registry_hash = registry_hash
+        component_registry, registry_hash = registry, new_registry_hash
         components_data = component_registry.get('components', {})
         schemas_data = component_registry.get('schemas', {})
         categories_data = component_registry.get('categories', {})
         css_definitions = component_registry.get('predefined_css_definitions', "")
         
+        # Derived indexes are loaded lazily, from the shipped artifacts when they match this registry
+        artifact_store = ArtifactStore(pkg_resources.files('vg_ui_lib_mcp.data').joinpath(ARTIFACTS_DIR), registry_hash)
+        derived_cache = {}
+        await asyncio.to_thread(lambda: registry_history.record(registry_hash, get_derived("entity_hashes")))
+        registry_ready.set()
+        if registry_hash != previous_registry_hash:
+            await announce_registry_version()
+        
         success_msg = f"Successfully loaded component registry with {len(components_data)} components, {len(schemas_data)} schemas, and {len(categories_data)} categories"
         await ctx.info(success_msg)
         return success_msg
@@ -93,6 +276,143 @@ async def load_component_registry(no_ctx:bool=False) -> str:
         return error_msg
 
 
+async def ensure_registry_loaded(ctx: Context) -> Optional[str]:
+    """Wait until the component registry is ready, starting a load if none is in flight.
+
+    Returns:
+        None when the registry is ready, otherwise a message explaining why it is not.
+    """
+    if registry_ready.is_set():
+        _remember_session(ctx)
+        return None
+    
+    with tracer.span("registry.wait") as span:
+        registry_error = await _wait_for_registry(ctx)
+        span.set_attribute("ready", registry_error is None)
+    return registry_error
+
+
+async def _wait_for_registry(ctx: Context) -> Optional[str]:
+    global registry_load_task
+    
+    if registry_load_task is None or registry_load_task.done():
+        await ctx.debug("Registry not loaded, loading now...")
+        registry_load_task = asyncio.create_task(load_component_registry(True))
+    else:
+        await ctx.debug("Registry is loading in the background, waiting for it to be ready...")
+    
+    try:
+        async with report_progress_while(ctx, "Loading the component registry", total=REGISTRY_READY_TIMEOUT):
+            load_result = await asyncio.wait_for(asyncio.shield(registry_load_task), timeout=REGISTRY_READY_TIMEOUT)
+    except asyncio.TimeoutError:
+        await ctx.warning(f"⚠️ Component registry not ready after {REGISTRY_READY_TIMEOUT}s")
+        return f"The component registry is still loading after {REGISTRY_READY_TIMEOUT} seconds. Please retry shortly."
+    
+    if not registry_ready.is_set():
+        await ctx.error(f"❌ {load_result}")
+        return load_result
+    
+    await ctx.debug(f"Registry loaded with {len(components_data)} components")
+    await announce_registry_version(ctx)
+    return None
+
+
+def _remember_session(ctx: Context):
+    """Record the registry version a client session sees first (nothing before the registry is loaded)."""
+    if registry_hash:
+        try:
+            announced_versions.setdefault(ctx.session, registry_hash)
+        except (RuntimeError, ValueError):
+            # Not inside a request (e.g. a background load)
+            pass
+
+
+async def announce_registry_version(ctx: Optional[Context] = None):
+    """Send resources/list_changed to every known client session that last saw another registry version.
+
+    Args:
+        ctx: The calling session's context, remembered first if the session is new.
+    """
+    if ctx is not None:
+        _remember_session(ctx)
+    for session, version in list(announced_versions.items()):
+        if version == registry_hash:
+            continue
+        announced_versions[session] = registry_hash
+        try:
+            await session.send_resource_list_changed()
+        except Exception:
+            # The client went away; it lists the resources again when it reconnects
+            announced_versions.pop(session, None)
+
+
+async def reload_registry(ctx: Context) -> str:
+    """Drop the caches built from the current registry and reload it in place.
+
+    Other sessions keep being served from the previous state until the reload
+    replaces it. A load already in flight is awaited instead of starting another
+    one. Sessions are then told about a new registry version (resources/list_changed).
+
+    Returns:
+        The result message of the load.
+    """
+    global css_categorized, css_category_list, registry_load_task
+    
+    # The caller sees the version it reloads from, so it is notified if the reload changes it
+    _remember_session(ctx)
+    if registry_load_task is None or registry_load_task.done():
+        css_categorized = {}
+        css_category_list = ""
+        response_cache.clear()
+        registry_load_task = asyncio.create_task(load_component_registry(True))
+    load_result = await asyncio.shield(registry_load_task)
+    if registry_ready.is_set() and load_result.startswith("Successfully"):
+        await announce_registry_version(ctx)
+    return load_result
+
+
+def get_derived(name: str) -> Any:
+    """Return a derived index for the loaded registry.
+
+    In shared registry mode the shared snapshot comes first. Otherwise uses the
+    precomputed build-time artifact when it matches the loaded registry, or builds
+    it from the registry. Artifacts and built indexes are published to the shared
+    snapshot, and a dict index is then served from it (decoded per entry) rather
+    than kept privately. The result is cached until the next load.
+    """
+    if name in derived_cache:
+        return derived_cache[name]
+    with tracer.span("index.lookup", index=name) as span:
+        artifact = None
+        if shared_snapshot:
+            source = "shared"
+            artifact = shared_snapshot.load(name)
+        if artifact is None and artifact_store:
+            source = "artifact"
+            artifact = artifact_store.load(name)
+        if artifact is None:
+            source = "built"
+            artifact = ARTIFACT_BUILDERS[name](component_registry)
+        if source != "shared" and shared_snapshot and artifact is not None and shared_snapshot.publish(name, artifact):
+            # Only split dicts gain from the mapped copy: a single-object section would be decoded privately again
+            shared_artifact = shared_snapshot.load(name) if isinstance(artifact, dict) else None
+            if shared_artifact is not None:
+                artifact = shared_artifact
+        span.set_attribute("source", source)
+        derived_cache[name] = artifact
+    return artifact
+
+
+def _detach_shared_snapshot():
+    """Release this process's reference to the shared snapshot (removed when the last process exits)."""
+    if shared_snapshot:
+        shared_snapshot.detach()
+
+
+atexit.register(_detach_shared_snapshot)
+atexit.register(coaccess_stats.save)
+atexit.register(tracer.flush)
+
 
 def parse_args():
     """Parse command-line arguments."""
@@ -107,17 +427,73 @@ def parse_args():
         choices=["html", "react", "react19", "vue", "angular", "lit"],
         help="Filter component examples to show only the specified framework (html, react, react19, vue, angular, lit)"
     )
+    parser.add_argument(
+        "--shared-registry",
+        action="store_true",
+        help="Share the loaded registry and derived indexes with other local server processes through a memory-mapped snapshot"
+    )
+    parser.add_argument(
+        "--compact-registry",
+        action="store_true",
+        help="Keep only canonical example sources in memory and derive the other framework variants on demand"
+    )
+    parser.add_argument(
+        "--profile-tools",
+        type=str,
+        default=None,
+        help="Comma-separated tools whose calls are profiled with cProfile ('*' for all); profiles are written to the local cache directory"
+    )
+    parser.add_argument(
+        "--profile-rate",
+        type=float,
+        default=None,
+        help="Fraction of the calls of --profile-tools to profile (default 1.0)"
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Export spans of every tool call and its phases to a local OTLP/JSON lines file (default: traces/traces.jsonl in the local cache directory)"
+    )
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        default=None,
+        help="Path of the trace file (implies --trace)"
+    )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Load the registry and every derived index, print the memory report (deep sizes and top tracemalloc allocators) as JSON and exit"
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run as a persistent local daemon serving MCP sessions on a Unix domain socket (connect with vg-ui-lib-mcp-shim)"
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=None,
+        help="Unix domain socket path for --daemon (default: per-configuration socket in the local cache directory)"
+    )
     return parser.parse_args()
 
 
 @asynccontextmanager
 async def app_lifespan(server: FastMCP) -> AsyncIterator[str]:
-    """Load the component registry on startup."""
-    # Load the component registry during startup
-    await load_component_registry(True)
+    """Start loading the component registry in the background on startup."""
+    global registry_load_task
+    # Don't block initialize/tools/list on the registry; data tools wait on registry_ready instead.
+    # In daemon mode every session runs this lifespan, and later ones find the registry loaded or loading.
+    started_load_task = None
+    if not registry_ready.is_set() and (registry_load_task is None or registry_load_task.done()):
+        registry_load_task = started_load_task = asyncio.create_task(load_component_registry(True))
     # Yield to indicate startup is complete, then keep running
-    yield "started"
-    # The function continues to run here, keeping the server alive
+    try:
+        yield "started"
+    finally:
+        if started_load_task is not None and not started_load_task.done():
+            started_load_task.cancel()
 
 
 instructions="""
@@ -187,35 +563,155 @@ When fetching component examples, you can use the `--use-framework` command-line
 - Leverage TypeScript schemas for type-safe component integration
 """
 
+def _component_example_payload(component_tag: str, example_id: str) -> Optional[Dict[str, Any]]:
+    """Payload of get_component_example without logging, or None if the example doesn't exist."""
+    example_position = get_derived("example_map").get(component_tag, {}).get(example_id)
+    if example_position is None:
+        return None
+    example = components_data[component_tag]['examples'][example_position]
+    use_framework = _use_framework if _use_framework in example_frameworks(example) else None
+    with tracer.span("framework.filter", framework=use_framework or "all"):
+        example_data = expand_example(example, [use_framework] if use_framework else None)
+    return {
+        "component_tag": component_tag,
+        "example_id": example_id,
+        "framework_filter": _use_framework if _use_framework else "none",
+        "example": example_data
+    }
+
+
+# Tools whose calls are recorded for co-access statistics, and how to compute their payload for prefetching
+PREFETCH_RESOLVERS = {
+    "get_component_by_tag": lambda component_tag: (
+        component_documentation(component_tag, components_data[component_tag]) if component_tag in components_data else None),
+    "get_component_example": _component_example_payload,
+    "get_schema_definition": lambda schema_name: (
+        {"name": schema_name, "definition": schemas_data[schema_name]} if schema_name in schemas_data else None),
+}
+
+
+def cached_tool_result(response: CachedResponse) -> ToolResult:
+    """Tool result of a cached response: its serialized text and its value as structured content.
+
+    The structured content is set directly, so a cache hit does not convert or encode the value again.
+    """
+    result = ToolResult(content=[TextContent(type="text", text=response.payload)])
+    result.structured_content = {"result": response.value}
+    return result
+
+
+def attach_prefetch(tool_name: str, arguments: Dict[str, Any], response: CachedResponse) -> ToolResult:
+    """Wrap a tool result with the payloads of its most likely follow-up calls.
+
+    Follow-ups come from the observed co-access statistics and are added, most likely
+    first, while they fit in PREFETCH_MAX_BYTES.
+    """
+    prefetched = []
+    prefetched_values = []
+    remaining_bytes = PREFETCH_MAX_BYTES
+    for follow_tool, follow_arguments, probability in coaccess_stats.likely_followups(tool_name, arguments):
+        resolver = PREFETCH_RESOLVERS.get(follow_tool)
+        try:
+            payload = resolver(**follow_arguments) if resolver else None
+        except TypeError:
+            payload = None
+        if payload is None:
+            continue
+        payload_json = json_backend.dumps(payload)
+        payload_bytes = len(payload_json.encode('utf-8'))
+        if payload_bytes > remaining_bytes:
+            continue
+        remaining_bytes -= payload_bytes
+        followup = {"tool": follow_tool, "arguments": follow_arguments, "probability": round(probability, 3)}
+        prefetched.append(json_backend.dumps(followup)[:-1] + ',"result":' + payload_json + '}')
+        prefetched_values.append({**followup, "result": payload})
+    payload = '{"result":' + response.payload + ',"prefetched":[' + ','.join(prefetched) + ']}'
+    return cached_tool_result(CachedResponse(payload, {"result": response.value, "prefetched": prefetched_values}, len(payload)))
+
+
+class TracingMiddleware(Middleware):
+    """Trace every tool call as a root span (its phases are child spans)."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        if not tracer.enabled:
+            return await call_next(context)
+        session_id = context.fastmcp_context.session_id if context.fastmcp_context else "default"
+        with tracer.span(f"tools/call {context.message.name}", server=True,
+                         **{"mcp.tool.name": context.message.name, "mcp.session.id": session_id}) as span:
+            result = await call_next(context)
+            span.set_attribute("vg.registry_version", registry_hash)
+            return result
+
+
+class RegistryVersionMiddleware(Middleware):
+    """Stamp every tool response with the content hash of the registry it was computed from."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        result = await call_next(context)
+        if registry_hash:
+            for block in result.content:
+                block.meta = {**(block.meta or {}), REGISTRY_VERSION_META_KEY: registry_hash}
+        return result
+
+
+class CoAccessMiddleware(Middleware):
+    """Record the sequence of prefetchable tool calls of each session for co-access statistics."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        result = await call_next(context)
+        tool_name = context.message.name
+        if tool_name in PREFETCH_RESOLVERS:
+            arguments = {name: value for name, value in (context.message.arguments or {}).items() if name != "prefetch"}
+            session_id = context.fastmcp_context.session_id if context.fastmcp_context else "default"
+            coaccess_stats.record(session_id, tool_name, arguments)
+        return result
+
+
+class ProfilingMiddleware(Middleware):
+    """Profile the sampled calls of the tools selected for profiling."""
+    
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool_name = context.message.name
+        profile = tool_profiler.start(tool_name)
+        if profile is None:
+            return await call_next(context)
+        try:
+            return await call_next(context)
+        finally:
+            tool_profiler.finish(profile, tool_name, context.message.arguments or {}, registry_hash)
+
+
 # Initialize FastMCP server
 mcp = FastMCP(
     name="VG UI Library Web Components Documentation Server",
     lifespan=app_lifespan,
     instructions=instructions,
-    version="0.1.0"
+    version="0.1.0",
+    tool_serializer=serialize_result
 )
+mcp.add_middleware(TracingMiddleware())
+mcp.add_middleware(RegistryVersionMiddleware())
+mcp.add_middleware(CoAccessMiddleware())
+mcp.add_middleware(ProfilingMiddleware())
 
 
-@mcp.tool(name="ClearCache")
-def ClearCache() -> PromptMessage:
-    """Clear all cached VG UI Library web components data and reset to default state."""
-    global component_registry, components_data, schemas_data, categories_data, css_definitions, css_categorized, css_category_list
-    
-    # Reset all global variables to their default empty state
-    component_registry = {}
-    components_data = {}
-    schemas_data = {}
-    categories_data = {}
-    css_definitions = ""
-    css_categorized = {}
-    css_category_list = ""
+@mcp.tool(name="ClearCache", description="Clear the cached VG UI Library web components data (responses, derived indexes, categorized CSS) and reload the component registry. The data is shared by every session of the server (all IDE windows connected to a daemon).")
+async def ClearCache(ctx: Context) -> PromptMessage:
+    """Clear all cached VG UI Library web components data and reload the registry.
+
+    The state is shared by every session of a daemon, so it is never left empty
+    (see `reload_registry`).
+    """
+    load_result = await reload_registry(ctx)
+    if not registry_ready.is_set() or not load_result.startswith("Successfully"):
+        await ctx.error(f"❌ {load_result}")
+        text = f"Cache cleared, but reloading the registry failed: {load_result}"
+    else:
+        text = "Cache cleared successfully. The VG UI Library web components data has been reloaded."
     
     return PromptMessage(
         role="assistant",
-        content=TextContent(
-            type="text",
-            text="Cache cleared successfully. All VG UI Library web components data has been reset to default state."
-        )
+        content=TextContent(type="text", text=text)
     )
 
 @mcp.tool(name="StartupInstructions", description="Provides special startup instructions for the VG UI Library web components documentation server. It should be called for every user prompt.")
@@ -237,53 +733,56 @@ def InitialProjectSetup() -> PromptMessage:
         role="assistant",
         content=TextContent(
             type="text",
-            text=get_project_setup_instructions(_use_framework)
+            text=text_pager.first_page(get_project_setup_instructions(_use_framework))
         )
     )
 
-@mcp.tool(name="list_components", description="List all available VG UI Library web components with basic information including props, events, slots and examples_ids.")
-async def list_components(ctx: Context) -> List[str]:
-    """List all available VG UI Library web components with basic information including props, events, slots and examples_ids."""
-    await ctx.info("🔍 Listing all available VG UI Library web components")
-    await ctx.debug("Checking if component registry is loaded")
-    
-    if not components_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(components_data)} components")
-    
-    components_list = []
-    for i, (component_tag, component_info) in enumerate(components_data.items()):
-        components_list.append(component_tag)
-    
-    await ctx.info(f"✅ Successfully listed {len(components_list)} components")
-    return components_list
 
+@mcp.tool(name="get_text_page", description="Get the next part of a long text result. Tools whose result is too long end it with a note like `Call get_text_page with cursor \"<cursor>\" for the next part`; pass that cursor here.", output_schema=None)
+async def get_text_page(cursor: str, ctx: Context) -> str:
+    """Get the page of a long text result that a continuation cursor points to."""
+    page = text_pager.page(cursor)
+    if page is None:
+        await ctx.warning(f"❌ Unknown or expired cursor '{cursor}'")
+        return f"Cursor '{cursor}' is unknown or expired. Call the original tool again to get a fresh cursor."
+    await ctx.info(f"✅ Retrieved text page for cursor '{cursor}'")
+    return page
 
-@mcp.tool(name="get_component_by_tag", description="Get detailed documentation for a specific VG UI Library web component by its tag name including props, events, slots, and usage examples.")
-async def get_component_by_tag(component_tag: str, ctx: Context) -> Dict[str, Any] | str:
-    """Get detailed documentation for a specific VG UI Library web component by its tag name including props, events, slots, and usage examples."""
-    await ctx.info(f"🔍 Looking up component: {component_tag}")
-    await ctx.debug("Checking if component registry is loaded")
+@mcp.tool(name="list_components", description="List all available VG UI Library web components. `detail` picks the digest level: `tags` (tag names only, default), `summary` (tag, category, one-line summary), `props` (summary plus prop, event and slot names) or `full` (complete API: prop types, enums, defaults, event detail types, slots, example ids). Non-`tags` responses report the byte size of every level in `sizes`, so prefer the cheapest level that answers the question instead of calling get_component_by_tag per component.")
+async def list_components(ctx: Context, detail: str = "tags") -> List[str] | Dict[str, Any] | str:
+    """List all available VG UI Library web components at the requested level of detail."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
     
-    if not components_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(components_data)} components")
+    if detail not in DIGEST_LEVELS:
+        return f"Invalid detail level '{detail}'. Use one of: {', '.join(DIGEST_LEVELS)}"
     
-    component = components_data.get(component_tag)
-    if not component:
-        available_components = list(components_data.keys())
-        await ctx.warning(f"❌ Component '{component_tag}' not found")
-        await ctx.debug(f"Available components: {available_components}")
-        return f"Component '{component_tag}' not found, so check for other variants or other similar components. Available components: {available_components}"
+    cache_key = ("list_components", detail)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return cached_tool_result(cached)
     
-    await ctx.debug(f"Found component data with {len(component.get('props', {}))} props, {len(component.get('events', {}))} events")
+    await ctx.info(f"🔍 Listing all available VG UI Library web components (detail: {detail})")
+    digests = get_derived("component_digests")
+    digest = digests[detail]
     
+    await ctx.info(f"✅ Successfully listed {len(digest['components'])} components ({digest['bytes']} bytes)")
+    if detail == "tags":
+        return cached_tool_result(response_cache.put(registry_hash, cache_key, digest['components']))
+    return cached_tool_result(response_cache.put(registry_hash, cache_key, {
+        "detail": detail,
+        "sizes": {level: digests[level]['bytes'] for level in DIGEST_LEVELS},
+        "components": digest['components']
+    }))
+
+
+def component_documentation(component_tag: str, component: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the documentation payload of a component (props, events, slots and example ids)."""
     examples = component.get('examples', [])
     example_ids = [example.get('id', '') for example in examples if example.get('id')]
     
-    result = {
+    return {
         "tag": component_tag,
         "category": component.get('category', ''),
         "description": component.get('descriptions', ''),
@@ -295,19 +794,70 @@ async def get_component_by_tag(component_tag: str, ctx: Context) -> Dict[str, An
         "exposed": component.get('exposed', {}),
         "example_ids": example_ids
     }
+
+
+@mcp.tool(name="get_component_by_tag", description="Get detailed documentation for a specific VG UI Library web component by its tag name including props, events, slots, and usage examples. With prefetch=true the response is `{result, prefetched}`, where `prefetched` holds the payloads of the calls that usually follow this one (e.g. its examples and referenced schemas), learned from past usage.")
+async def get_component_by_tag(component_tag: str, ctx: Context, prefetch: bool = False) -> Dict[str, Any] | str:
+    """Get detailed documentation for a specific VG UI Library web component by its tag name including props, events, slots, and usage examples."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    cache_key = ("get_component_by_tag", component_tag)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return attach_prefetch("get_component_by_tag", {"component_tag": component_tag}, cached) if prefetch else cached_tool_result(cached)
+    
+    await ctx.info(f"🔍 Looking up component: {component_tag}")
+    component = components_data.get(component_tag)
+    if not component:
+        available_components = list(components_data.keys())
+        await ctx.warning(f"❌ Component '{component_tag}' not found")
+        await ctx.debug(f"Available components: {available_components}")
+        return f"Component '{component_tag}' not found, so check for other variants or other similar components. Available components: {available_components}"
+    
+    await ctx.debug(f"Found component data with {len(component.get('props', {}))} props, {len(component.get('events', {}))} events")
+    
+    result = component_documentation(component_tag, component)
     
     await ctx.info(f"✅ Successfully retrieved component '{component_tag}' with complete documentation")
-    return result
+    response = response_cache.put(registry_hash, cache_key, result)
+    return attach_prefetch("get_component_by_tag", {"component_tag": component_tag}, response) if prefetch else cached_tool_result(response)
 
 
-@mcp.tool(name="search_components", description="Search for VG UI Library web components by nacomponent_tagme or category.")
-async def search_components(search_term: str, ctx: Context) -> List[Dict]:
-    """Search for VG UI Library web components by component_tag, or category."""
-    await ctx.debug(f"Searching for components with term: {search_term}")
-    if not components_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(components_data)} components")
+@mcp.tool(name="search_components", description="Search for VG UI Library web components by component_tag or category. Set mode='semantic' to rank components by meaning over descriptions, prop docs and example names (e.g. 'select an option' finds vg-dropdown). Semantic matches scoring below min_score are left out, so an empty list means no component matches.")
+async def search_components(search_term: str, ctx: Context, mode: str = "keyword", limit: int = 10,
+                            min_score: float = DEFAULT_MIN_SCORE) -> List[Dict] | str:
+    """Search for VG UI Library web components by component_tag, or category, or semantically."""
+    await ctx.debug(f"Searching for components with term: {search_term} (mode: {mode})")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    if mode == "semantic":
+        semantic_index = get_derived("semantic_index")
+        if semantic_index is None:
+            await ctx.warning("❌ Semantic search unavailable: NumPy is not installed")
+            return "Semantic search is unavailable because NumPy is not installed. Install it with `pip install vg-ui-lib-mcp-server[semantic]` or use mode='keyword'."
+        
+        matching_components = []
+        for component_tag, score in semantic_index.rank(search_term, limit, min_score):
+            component_info = components_data.get(component_tag, {})
+            matching_components.append({
+                "tag": component_tag,
+                "category": component_info.get('category', ''),
+                "description": component_info.get('descriptions', ''),
+                "match_reason": "semantic",
+                "score": round(score, 4)
+            })
+        if not matching_components:
+            await ctx.info(f"⚠️ No component scored at least {min_score} for '{search_term}'")
+        else:
+            await ctx.info(f"✅ Ranked {len(matching_components)} components semantically for '{search_term}'")
+        return matching_components
+    
+    if mode != "keyword":
+        return f"Unknown search mode '{mode}'. Supported modes: ['keyword', 'semantic']"
     
     search_term_lower = search_term.lower()
     matching_components = []
@@ -329,47 +879,87 @@ async def search_components(search_term: str, ctx: Context) -> List[Dict]:
 
 
 @mcp.tool(name="list_schemas", description="List all available TypeScript schemas and type definitions used by VG UI Library web components.")
-async def list_schemas(ctx: Context) -> List[str]:
+async def list_schemas(ctx: Context) -> List[str] | str:
     """List all available TypeScript schemas and type definitions used by VG UI Library web components."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    cache_key = ("list_schemas",)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return cached_tool_result(cached)
+    
     await ctx.debug("Fetching TypeScript schemas and type definitions")
-    if not schemas_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(schemas_data)} schemas")
-    return [schema_name for schema_name, schema_def in schemas_data.items()]
+    return cached_tool_result(response_cache.put(registry_hash, cache_key, [schema_name for schema_name, schema_def in schemas_data.items()]))
 
 
-@mcp.tool(name="get_schema_definition", description="Get the full definition of a specific TypeScript schema including interfaces, enums, and type aliases.")
-async def get_schema_definition(schema_name: str, ctx: Context) -> Dict[str, Any] | str:
+@mcp.tool(name="get_schema_definition", description="Get the full definition of a specific TypeScript schema including interfaces, enums, and type aliases. With prefetch=true the response is `{result, prefetched}` with the payloads of the calls that usually follow this one.")
+async def get_schema_definition(schema_name: str, ctx: Context, prefetch: bool = False) -> Dict[str, Any] | str:
     """Get the full definition of a specific TypeScript schema including interfaces, enums, and type aliases."""
-    await ctx.debug(f"Retrieving schema definition for: {schema_name}")
-    if not schemas_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(schemas_data)} schemas")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    cache_key = ("get_schema_definition", schema_name)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return attach_prefetch("get_schema_definition", {"schema_name": schema_name}, cached) if prefetch else cached_tool_result(cached)
     
-    schema = schemas_data.get(schema_name)
+    await ctx.debug(f"Retrieving schema definition for: {schema_name}")
+    with tracer.span("schema.resolve", schema=schema_name) as span:
+        schema = schemas_data.get(schema_name)
+        span.set_attribute("found", schema is not None)
     if not schema:
         await ctx.warning(f"❌ Schema '{schema_name}' not found")
         available_schemas = list(schemas_data.keys())
         await ctx.debug(f"Available schemas: {available_schemas}")
         return f"Schema '{schema_name}' not found, so check for other schema names. Available schemas: {available_schemas}"
     
-    return {
+    response = response_cache.put(registry_hash, cache_key, {
         "name": schema_name,
         "definition": schema
-    }
+    })
+    return attach_prefetch("get_schema_definition", {"schema_name": schema_name}, response) if prefetch else cached_tool_result(response)
+
+
+@mcp.tool(name="query_props_and_events", description="Run a structured query over all VG UI Library component props and events. Filter with predicates on fields (component, kind, name, type, default, required, enum, description) using operators eq, ne, contains, startswith, in, exists, and project the returned columns with select. Use component_has to require components that have matching rows, e.g. a boolean `disabled` prop and a `vg-change` event.")
+async def query_props_and_events(
+    ctx: Context,
+    where: Optional[List[QueryPredicate]] = None,
+    select: Optional[List[str]] = None,
+    component_has: Optional[List[List[QueryPredicate]]] = None,
+    limit: int = 100
+) -> Dict[str, Any] | str:
+    """Run a structured query over all VG UI Library component props and events."""
+    await ctx.debug(f"Querying props/events with where={where}, component_has={component_has}, select={select}")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    try:
+        result = query_prop_event_table(get_derived("prop_event_table"), where, select, component_has, limit)
+    except ValueError as e:
+        await ctx.warning(f"❌ Invalid query: {str(e)}")
+        return f"Invalid query: {str(e)}"
+    
+    await ctx.info(f"✅ Query matched {result['total']} rows across {len(result['components'])} components")
+    return result
 
 
 @mcp.tool(name="list_categories", description="List all component categories and their associated components for better organization and discovery.")
-async def list_categories(ctx: Context) -> List[Dict]:
+async def list_categories(ctx: Context) -> List[Dict] | str:
     """List all component categories and their associated components for better organization and discovery."""
-    await ctx.debug("Fetching component categories and organization")
-    if not categories_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(categories_data)} categories")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    cache_key = ("list_categories",)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return cached_tool_result(cached)
     
+    await ctx.debug("Fetching component categories and organization")
     categories_list = []
     for category_name, category_info in categories_data.items():
         categories_list.append({
@@ -378,11 +968,11 @@ async def list_categories(ctx: Context) -> List[Dict]:
             "components": category_info.get('components', [])
         })
     
-    return categories_list
+    return cached_tool_result(response_cache.put(registry_hash, cache_key, categories_list))
 
 
-@mcp.tool(name="get_component_example", description="Get a specific example for a VG UI Library web component by example ID, including code samples for different frameworks. Use --use-framework CLI argument to filter by framework.")
-async def get_component_example(component_tag: str, example_id: str, ctx: Context) -> Dict[str, Any] | str:
+@mcp.tool(name="get_component_example", description="Get a specific example for a VG UI Library web component by example ID, including code samples for different frameworks. Use --use-framework CLI argument to filter by framework. With prefetch=true the response is `{result, prefetched}` with the payloads of the calls that usually follow this one.")
+async def get_component_example(component_tag: str, example_id: str, ctx: Context, prefetch: bool = False) -> Dict[str, Any] | str:
     """Get a specific example for a VG UI Library web component by example ID, including code samples for different frameworks."""
     await ctx.debug(f"Retrieving example '{example_id}' for component: {component_tag}")
     
@@ -393,10 +983,9 @@ async def get_component_example(component_tag: str, example_id: str, ctx: Contex
     if use_framework:
         await ctx.info(f"🎯 Framework filter active: {use_framework}")
     
-    if not components_data:
-        await ctx.debug("Registry not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"Registry loaded with {len(components_data)} components")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
     
     component = components_data.get(component_tag)
     if not component:
@@ -406,11 +995,8 @@ async def get_component_example(component_tag: str, example_id: str, ctx: Contex
     examples = component.get('examples', [])
     
     # Find the example with matching ID
-    target_example = None
-    for example in examples:
-        if example.get('id') == example_id:
-            target_example = example
-            break
+    example_position = get_derived("example_map").get(component_tag, {}).get(example_id)
+    target_example = examples[example_position] if example_position is not None else None
     
     if not target_example:
         available_example_ids = [ex.get('id', '') for ex in examples if ex.get('id')]
@@ -418,80 +1004,204 @@ async def get_component_example(component_tag: str, example_id: str, ctx: Contex
         await ctx.debug(f"Available example IDs: {available_example_ids}")
         return f"Example '{example_id}' not found for component '{component_tag}'. Available example IDs: {available_example_ids}"
     
-    # Filter sources based on use-framework header
-    example_data = target_example.copy()
-    sources = example_data.get('sources', {})
+    # Filter sources based on use-framework header (only the returned sources are derived in compact mode)
+    supported_frameworks = example_frameworks(target_example)
+    filter_framework = use_framework if use_framework and use_framework in supported_frameworks else None
+    with tracer.span("framework.filter", framework=filter_framework or "all"):
+        example_data = expand_example(target_example, [filter_framework] if filter_framework else None)
     
-    if use_framework and sources:
-        supported_frameworks = list(sources.keys())
-        
-        if use_framework in sources:
-            # Filter to only include the requested framework
-            filtered_sources = {use_framework: sources[use_framework]}
-            example_data['sources'] = filtered_sources
-            await ctx.info(f"✅ Successfully retrieved example '{example_id}' for component '{component_tag}' (framework: {use_framework})")
-        else:
-            # Framework not found, warn but return all sources
-            await ctx.warning(f"⚠️ Framework '{use_framework}' not found in example sources. Available frameworks: {supported_frameworks}")
-            await ctx.info(f"✅ Retrieved example '{example_id}' for component '{component_tag}' with all frameworks")
+    if filter_framework:
+        await ctx.info(f"✅ Successfully retrieved example '{example_id}' for component '{component_tag}' (framework: {use_framework})")
+    elif use_framework and supported_frameworks:
+        # Framework not found, warn but return all sources
+        await ctx.warning(f"⚠️ Framework '{use_framework}' not found in example sources. Available frameworks: {supported_frameworks}")
+        await ctx.info(f"✅ Retrieved example '{example_id}' for component '{component_tag}' with all frameworks")
     else:
         await ctx.info(f"✅ Successfully retrieved example '{example_id}' for component '{component_tag}' with all frameworks")
     
-    return {
+    result = {
         "component_tag": component_tag,
         "example_id": example_id,
         "framework_filter": use_framework if use_framework else "none",
         "example": example_data
     }
+    if prefetch:
+        return attach_prefetch("get_component_example", {"component_tag": component_tag, "example_id": example_id},
+                               CachedResponse(serialize_result(result), result, 0))
+    return result
+
+
+@mcp.tool(name="search_examples", description="Search the code of all VG UI Library component examples (html, react, react19, vue, angular, lit) for lines containing the given terms, e.g. '@vg-change' with framework 'vue'. Returns ranked (component_tag, example_id, framework, line snippet) hits with highlighted spans. Defaults to the --use-framework framework when set.")
+async def search_examples(
+    query: str,
+    ctx: Context,
+    framework: Optional[str] = None,
+    component_tag: Optional[str] = None,
+    limit: int = 20
+) -> List[Dict[str, Any]] | str:
+    """Search the code of all VG UI Library component examples using the trigram index."""
+    global _use_framework
+    framework = framework or _use_framework
+    await ctx.debug(f"Searching example sources for '{query}' (framework: {framework or 'all'}, component: {component_tag or 'all'})")
+    
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    example_indexes = get_derived("example_indexes")
+    if framework and framework not in example_indexes:
+        available_frameworks = list(example_indexes.keys())
+        await ctx.warning(f"❌ Framework '{framework}' not found in example sources")
+        return f"Framework '{framework}' not found in example sources. Available frameworks: {available_frameworks}"
+    
+    hits = search_example_indexes(example_indexes, query, framework, component_tag, limit)
+    await ctx.info(f"✅ Found {len(hits)} example lines matching '{query}'")
+    return hits
+
+
+def _registry_entity(kind: str, key: str) -> Any:
+    """Current definition of one registry entity (a component without its examples, a full example), or None."""
+    if kind == "components":
+        component = components_data.get(key)
+        return None if component is None else {k: v for k, v in component.items() if k != 'examples'}
+    if kind == "examples":
+        component_tag, example_id = split_example_key(key)
+        example_position = get_derived("example_map").get(component_tag, {}).get(example_id)
+        return None if example_position is None else expand_example(components_data[component_tag]['examples'][example_position])
+    return (schemas_data if kind == "schemas" else categories_data).get(key)
+
+
+@mcp.tool(name="get_registry_changes", description="Get the components, examples, schemas and categories that were added, removed or modified since a given registry version. Every tool response carries the current version in its content `_meta` under 'vg/registry_version'; pass the version your cached data came from to refresh only what changed. Set include_data to also return the current definitions of added and modified entities.")
+async def get_registry_changes(since_version: str, ctx: Context, include_data: bool = False) -> Dict[str, Any] | str:
+    """Get the registry entities that changed since a given registry version."""
+    await ctx.debug(f"Computing registry changes since version: {since_version}")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    if since_version == registry_hash:
+        await ctx.info("✅ Registry unchanged since the given version")
+        return {"since_version": since_version, "current_version": registry_hash, "up_to_date": True}
+    
+    previous_hashes = registry_history.get(since_version)
+    if previous_hashes is None:
+        await ctx.warning(f"⚠️ Unknown registry version '{since_version}', a full refresh is required")
+        return {
+            "since_version": since_version,
+            "current_version": registry_hash,
+            "up_to_date": False,
+            "full_refresh_required": True
+        }
+    
+    changes = diff_entity_hashes(previous_hashes, get_derived("entity_hashes"))
+    result: Dict[str, Any] = {
+        "since_version": since_version,
+        "current_version": registry_hash,
+        "up_to_date": False,
+        "changes": changes
+    }
+    
+    if include_data:
+        # Only the added and modified entities are materialized, so the cost follows the size of the change
+        result["data"] = {}
+        for kind, kind_changes in changes.items():
+            result["data"][kind] = {}
+            for key in kind_changes["added"] + kind_changes["modified"]:
+                entity = _registry_entity(kind, key)
+                if entity is not None:
+                    result["data"][kind][key] = entity
+    
+    changed_count = sum(len(keys) for kind_changes in changes.values() for keys in kind_changes.values())
+    await ctx.info(f"✅ {changed_count} registry entities changed since version '{since_version}'")
+    return result
+
+
+def _parse_css_categories(text: str) -> Dict[str, str]:
+    """Extract the `{"category_name": "css_content"}` JSON object from a sampling response."""
+    # Remove thinking tags if present
+    resp = re.sub(r'<think>.*?</think>', '', text, flags=re.DOTALL)
+    resp = resp.replace('<think>', '').replace('</think>', '')
+    # Extract JSON from response
+    resp = re.sub(r'[\s\S]*\{(\s|\")([\s\S]*?)(\s|\")\}[\s\S]*', r'{\1\2\3}', resp, flags=re.DOTALL)
+    return json.loads(resp)
+
+
+def _css_fallback(reason: str) -> str:
+    """Answer categorize_css without sampling: the last good categorization, or the raw CSS when there is none."""
+    global css_category_list
+    
+    if css_categorized:
+        return f"{reason}. Serving the last successful categorization into the following categories:\n\n{css_category_list}"
+    css_category_list = css_definitions
+    return text_pager.first_page(f"{reason}, but here is the raw CSS content:\n\n{css_definitions}")
 
 
 @mcp.tool(name="categorize_css", description="Categorize the VG UI Library CSS (Cascading Style Sheets) and index it for later reference. Returns categorized CSS to be reviewed by user (Avoid calling categorize_css unless necessary).")
 async def categorize_css(ctx: Context) -> str:
-    """Categorize the VG UI Library CSS (Cascading Style Sheets) and index it for later reference. Returns categorized CSS to be reviewed by user (Avoid calling categorize_css unless necessary)."""
-    global css_definitions, css_categorized, css_category_list
+    """Categorize the VG UI Library CSS (Cascading Style Sheets) and index it for later reference. Returns categorized CSS to be reviewed by user (Avoid calling categorize_css unless necessary).
+
+    Identical concurrent calls share one sampling run; when sampling is unsupported,
+    rejected by the sampling queue, times out or fails, the last good categorization is returned.
+    """
+    global css_category_list
     
-    if not css_definitions:
-        await ctx.debug("CSS definitions not loaded, loading now...")
-        await load_component_registry()
-        await ctx.debug(f"CSS definitions loaded: {len(css_definitions)} characters")
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
     
     if not css_definitions:
         return "No CSS definitions found in the component registry."
     
+    if ctx.fastmcp.sampling_handler is None and not ctx.session.check_client_capability(
+            mcp_types.ClientCapabilities(sampling=mcp_types.SamplingCapability())):
+        await ctx.warning("⚠️ Client doesn't support sampling, skipping CSS categorization")
+        return _css_fallback("Client side sampling not supported by the client")
+    
     prompt = f"""Categorize the following CSS(Cascading Style Sheets) properties and variables into different categories based on its usage like font types, colors, graph colors, color shades, color variants, font name, spacing, layout, animations, etc., making sure the css variables and style/properties are properly identified and differentiated and return the categorized css in the format of {{"category_name": "css_content"}}. css_content should contain the property exactly same as given in input, and it should be STRICTLY in valid JSON format and output should not contain any other content along with JSON.
 
 {css_definitions}"""
     
-    response = {"text": "Client side sampling not supported by the client"}
-    try:
-        await ctx.info("🧠 Using LLM sampling to categorize CSS...")
-        response = await ctx.sample(prompt, max_tokens=10000)
-        css_category_list = response.text
-        resp = response.text
+    async def sample_css_categories(sampling_ctx: Context) -> Optional[str]:
+        """One sampling run shared by all identical callers, through one waiting caller's session
+        (another one's if that caller leaves); applies a parsed result and returns None, or the unparsable text."""
+        global css_categorized, css_category_list
         
+        await sampling_ctx.info("🧠 Using LLM sampling to categorize CSS...")
+        response = await sampling_ctx.sample(prompt, max_tokens=10000)
         try:
-            # Remove thinking tags if present
-            resp = resp.replace('<think>', '').replace('</think>', '')
-            import re
-            # Extract JSON from response
-            resp = re.sub(r'<think>.*?</think>', '', resp, flags=re.DOTALL)
-            resp = re.sub(r'[\s\S]*\{(\s|\")([\s\S]*?)(\s|\")\}[\s\S]*', r'{\1\2\3}', resp, flags=re.DOTALL)
-            
-            data = json.loads(resp)  # Validate JSON format
-            css_categorized = data
-            css_category_list = "\n".join(data.keys())
-            await ctx.info(f"✅ Successfully categorized CSS into {len(data)} categories")
+            data = _parse_css_categories(response.text)
         except Exception as e:
-            await ctx.warning(f"Failed to parse JSON response: {str(e)}")
-            await ctx.debug(f"Raw response:\n{resp}")
+            await sampling_ctx.warning(f"Failed to parse JSON response: {str(e)}")
+            await sampling_ctx.debug(f"Raw response:\n{response.text}")
             return response.text
-            
+        css_categorized = data
+        css_category_list = "\n".join(data.keys())
+        await sampling_ctx.info(f"✅ Successfully categorized CSS into {len(data)} categories")
+        # The set of vg://css/{category} resources changed
+        await sampling_ctx.send_resource_list_changed()
+        return None
+    
+    try:
+        # Cancelling this request (notifications/cancelled) cancels the sampling run unless other callers share it
+        async with report_progress_while(ctx, "Categorizing CSS with LLM sampling", total=css_sampler.timeout):
+            with tracer.span("sampling"):
+                unparsed_text = await css_sampler.run(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), sample_css_categories, ctx)
+    except SamplingQueueFull as e:
+        await ctx.warning(f"⚠️ CSS categorization rejected: {e}")
+        return _css_fallback("Too many CSS categorizations in progress")
+    except asyncio.TimeoutError:
+        await ctx.warning(f"⚠️ CSS categorization timed out after {css_sampler.timeout}s")
+        return _css_fallback(f"CSS categorization did not finish within {css_sampler.timeout} seconds")
     except Exception as e:
         error_msg = f"Failed to execute FastMCP client sampling: {str(e)}"
         await ctx.error(error_msg)
-        css_category_list = css_definitions
-        return f"Failed to execute FastMCP client sampling, but here is the raw CSS content:\n\n{css_definitions}"
+        return _css_fallback("Failed to execute FastMCP client sampling")
     
+    if unparsed_text is not None:
+        if css_categorized:
+            return _css_fallback("The sampled categorization was not valid JSON")
+        css_category_list = unparsed_text
+        return text_pager.first_page(unparsed_text)
     return f"CSS categorized successfully into the following categories:\n\n{css_category_list}"
 
 
@@ -536,13 +1246,378 @@ async def get_css_for_category(category_name: str, ctx: Context) -> str | Dict:
         return "Error decoding JSON data. Please run `categorize_css` to categorize the CSS styles."
 
 
+@mcp.tool(name="get_css_tokens", description="Look up VG UI Library CSS custom properties (design tokens) without reading the stylesheet. Pass exactly one of `name` (exact, e.g. '--vg-text-color-primary'), `prefix` (e.g. '--vg-spacing-') or `value` (raw or resolved, e.g. '#38bdf8'). Every declaration is returned with its selector/scope, raw value and resolved value (var() chains substituted; null if cyclic). Optionally restrict to one selector.")
+async def get_css_tokens(
+    ctx: Context,
+    name: Optional[str] = None,
+    prefix: Optional[str] = None,
+    value: Optional[str] = None,
+    selector: Optional[str] = None,
+    limit: int = 100
+) -> Dict[str, Any] | str:
+    """Look up CSS design tokens by exact name, name prefix or value in the precomputed token table."""
+    lookups = {"name": name, "prefix": prefix, "value": value}
+    given = [kind for kind, argument in lookups.items() if argument]
+    if len(given) != 1:
+        return "Pass exactly one of `name`, `prefix` or `value`."
+    
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    table = get_derived("css_tokens")
+    if name:
+        rows = table.lookup(name)
+    elif prefix:
+        rows = table.with_prefix(prefix)
+    else:
+        rows = table.with_value(value)
+    if selector:
+        rows = [row for row in rows if row["selector"] == selector]
+    
+    if not rows:
+        await ctx.warning(f"❌ No CSS tokens match {given[0]} '{lookups[given[0]]}'")
+    else:
+        await ctx.info(f"✅ Found {len(rows)} CSS token declarations for {given[0]} '{lookups[given[0]]}'")
+    return {
+        "match": {given[0]: lookups[given[0]], "selector": selector},
+        "total": len(rows),
+        "tokens": rows[:max(limit, 0)]
+    }
+
+
+@mcp.tool(name="get_theme_tokens", description="Get the resolved VG UI Library CSS token values under a vg-theme-provider theme (e.g. dark, light, glass, cartoon; 'default' is outside any theme provider), or with `compare_to` only the tokens that differ between two themes. Optionally restrict to token names starting with `prefix`. Answered from precomputed per-theme tables.")
+async def get_theme_tokens(
+    theme: str,
+    ctx: Context,
+    compare_to: Optional[str] = None,
+    prefix: Optional[str] = None
+) -> Dict[str, Any] | str:
+    """Get the resolved CSS token values of a theme, or the differences between two themes."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    table = get_derived("css_tokens")
+    for requested in (theme, compare_to):
+        if requested is not None and requested not in table.themes:
+            await ctx.warning(f"❌ Theme '{requested}' not found")
+            return f"Theme '{requested}' not found. Available themes: {list(table.themes.keys())}"
+    
+    if compare_to is None:
+        tokens = table.theme_tokens(theme)
+        result = {"theme": theme, "scopes": list(table.themes[theme])}
+    else:
+        tokens = table.theme_diff(theme, compare_to)
+        result = {"theme": theme, "compare_to": compare_to}
+    if prefix:
+        tokens = {name: value for name, value in tokens.items() if name.startswith(prefix)}
+    
+    await ctx.info(f"✅ {len(tokens)} tokens for theme '{theme}'" + (f" differ from '{compare_to}'" if compare_to else ""))
+    return {**result, "total": len(tokens), "tokens": tokens}
+
+
+@mcp.tool(name="get_css_for_component", description="Get only the CSS custom properties a VG UI Library component uses: those it consumes (var() references in its stylesheet, the predefined CSS and its examples) and those it exposes for customization, with their values under a theme (default, dark, light, glass, cartoon). Use this instead of categorize_css or the whole stylesheet when styling one component.")
+async def get_css_for_component(component_tag: str, ctx: Context, theme: str = "default") -> Dict[str, Any] | str:
+    """Get the slice of the CSS custom properties that one component consumes or exposes."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    entry = get_derived("component_css").get(component_tag)
+    if entry is None:
+        await ctx.warning(f"❌ Component '{component_tag}' not found")
+        return f"Component '{component_tag}' not found."
+    theme_values = get_derived("css_tokens").theme_tokens(theme)
+    if theme_values is None:
+        await ctx.warning(f"❌ Theme '{theme}' not found")
+        return f"Theme '{theme}' not found. Available themes: {list(get_derived('css_tokens').themes.keys())}"
+    
+    cache_key = ("get_css_for_component", component_tag, theme)
+    cached = response_cache.get(registry_hash, cache_key)
+    if cached is not None:
+        return cached_tool_result(cached)
+    
+    css_lines = []
+    for role, names in (("Consumed", entry["consumes"]), ("Exposed", entry["exposes"])):
+        if names:
+            css_lines.append(f"/* {role} by {component_tag} (theme: {theme}) */")
+            for name in names:
+                value = theme_values.get(name)
+                css_lines.append(f"{name}: {value};" if value is not None else f"/* {name}: not defined by the library stylesheet */")
+    
+    await ctx.info(f"✅ {len(entry['consumes'])} consumed and {len(entry['exposes'])} exposed CSS custom properties for '{component_tag}'")
+    return cached_tool_result(response_cache.put(registry_hash, cache_key, {
+        "tag": component_tag,
+        "theme": theme,
+        "consumes": entry["consumes"],
+        "exposes": entry["exposes"],
+        "css": "\n".join(css_lines)
+    }))
+
+
+@mcp.tool(name="complete", description="Complete a partial VG UI Library name by prefix (case-insensitive): `kind` is tag (component tags, e.g. 'vg-dr'), prop (prop and attribute names), event, slot, schema or css_variable (CSS custom properties, e.g. '--vg-color-'). Pass component_tag to complete only the props, events or slots of one component. Returns the total number of matches and up to `limit` names in order.")
+async def complete(prefix: str, ctx: Context, kind: str = "tag", component_tag: Optional[str] = None, limit: int = 20) -> Dict[str, Any] | str:
+    """Complete a name prefix from the precomputed sorted name arrays."""
+    if kind not in COMPLETION_KINDS:
+        return f"Invalid kind '{kind}'. Valid kinds: {list(COMPLETION_KINDS)}"
+    
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    if component_tag is not None and kind in COMPONENT_MEMBER_KINDS and component_tag not in components_data:
+        await ctx.warning(f"❌ Component '{component_tag}' not found")
+        return f"Component '{component_tag}' not found."
+    result = get_derived("completion_index").complete(prefix, kind, component_tag, limit)
+    
+    await ctx.debug(f"{result['total']} {kind} names start with '{prefix}'")
+    scope = {"component_tag": component_tag} if component_tag is not None and kind in COMPONENT_MEMBER_KINDS else {}
+    return {"kind": kind, "prefix": prefix, **scope, **result}
+
+
+@mcp.tool(name="validate_markup", description="Validate the VG UI Library elements in a markup snippet before using it: an HTML, JSX (react: VgButton wrappers, react19: vg-button elements), Vue or Angular template, or Lit source. Every vg-* element is checked against its component's props (unknown props, enum/number/boolean values, required props), events (unknown vg-* events, native events used instead of vg-* ones) and slots (slot=\"...\" of its children). Binding syntax is interpreted per framework; dynamic values are not checked. Defaults to the --use-framework framework, else html. Returns the issues with line, column and suggestions.")
+async def validate_markup(code: str, ctx: Context, framework: Optional[str] = None) -> Dict[str, Any] | str:
+    """Check every vg-* element of a snippet against the compiled validator tables."""
+    framework = framework or _use_framework or "html"
+    if framework not in MARKUP_FRAMEWORKS:
+        return f"Invalid framework '{framework}'. Valid frameworks: {list(MARKUP_FRAMEWORKS)}"
+    
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    result = validate_vg_markup(code, framework, get_derived("markup_validators"))
+    if result["valid"]:
+        await ctx.info(f"✅ {result['elements']} VG elements valid ({result['warnings']} warnings)")
+    else:
+        await ctx.warning(f"❌ {result['errors']} errors and {result['warnings']} warnings in {result['elements']} VG elements")
+    return {"framework": framework, **result}
+
+
+@mcp.tool(name="configure_profiling", description="Admin: profile a sampled fraction of the calls to the given tools with cProfile (comma-separated names, '*' for all tools, empty string to stop profiling). Profiles are written to the local cache directory, named after the tool, an arguments hash and the registry version; summarize them with get_profile_summary.")
+async def configure_profiling(tools: str, ctx: Context, sample_rate: float = 1.0) -> Dict[str, Any] | str:
+    """Select the tools to profile and the fraction of their calls."""
+    selection = parse_tool_selection(tools)
+    if selection and not tool_profiler.ensure_directory():
+        await ctx.warning("❌ No writable local cache directory for profiles")
+        return "Profiling is unavailable: the local cache directory is not writable (set FASTMCP_CACHE_DIR)."
+
+    tool_profiler.configure(selection, sample_rate)
+    await ctx.info(f"✅ Profiling {sorted(tool_profiler.tools) or 'no tools'} at sample rate {tool_profiler.sample_rate}")
+    return {
+        "tools": sorted(tool_profiler.tools),
+        "sample_rate": tool_profiler.sample_rate,
+        "directory": str(tool_profiler.directory),
+        "profiles": len(tool_profiler.profiles())
+    }
+
+
+@mcp.tool(name="get_profile_summary", description="Admin: list the hottest functions across the collected tool call profiles (see configure_profiling), optionally of one tool. `sort` is cumulative (time including callees, default), tottime (own time) or calls.")
+async def get_profile_summary(ctx: Context, tool: Optional[str] = None, sort: str = "cumulative", limit: int = 20) -> Dict[str, Any] | str:
+    """Merge the collected profiles and list their top functions."""
+    if sort not in SORT_KEYS:
+        return f"Invalid sort '{sort}'. Valid values: {list(SORT_KEYS)}"
+
+    paths = [path for path in tool_profiler.profiles() if tool is None or profile_tool_name(path) == tool]
+    if not paths:
+        await ctx.warning("❌ No profiles collected" + (f" for tool '{tool}'" if tool else ""))
+        return "No profiles collected" + (f" for tool '{tool}'" if tool else "") + ". Enable profiling with configure_profiling, --profile-tools or FASTMCP_PROFILE_TOOLS."
+
+    summary = summarize_profiles(paths, sort=sort, limit=limit)
+    await ctx.info(f"✅ Summarized {summary['profiles']} profiles")
+    return {"directory": str(tool_profiler.directory), **summary}
+
+
+def build_memory_report(include_components: bool = False) -> Dict[str, Any]:
+    """Deep sizes of the loaded registry (per section, optionally per component), derived indexes, caches and CSS data."""
+    report = {
+        "registry_version": registry_hash,
+        "process": memory_report.process_memory(),
+        "registry": {
+            "total_bytes": memory_report.deep_sizeof(component_registry),
+            "sections": memory_report.section_sizes(component_registry),
+        },
+        "css": {
+            "css_definitions": memory_report.deep_sizeof(css_definitions),
+            "css_categorized": memory_report.deep_sizeof(css_categorized),
+            "css_category_list": memory_report.deep_sizeof(css_category_list),
+        },
+        "content_store": {**content_store.report(), "deep_bytes": memory_report.deep_sizeof(content_store)} if content_store else None,
+        "derived_indexes": memory_report.section_sizes(derived_cache),
+        "caches": {
+            "response_cache": {**response_cache.stats(), "deep_bytes": memory_report.deep_sizeof(response_cache)},
+            "text_pages": {"bytes": text_pager.total_bytes, "deep_bytes": memory_report.deep_sizeof(text_pager)},
+            "derived_sources": derived_sources_cache_stats(),
+            "coaccess_stats": {"deep_bytes": memory_report.deep_sizeof(coaccess_stats)},
+        },
+    }
+    if include_components:
+        report["components"] = {
+            component_tag: {
+                "total_bytes": memory_report.deep_sizeof(component),
+                "examples_bytes": memory_report.deep_sizeof(component.get('examples') or []),
+            }
+            for component_tag, component in sorted(components_data.items(), key=lambda item: memory_report.deep_sizeof(item[1]), reverse=True)
+        }
+    return report
+
+
+@mcp.tool(name="get_memory_report", description="Admin: report the memory this server process holds: deep sizes of the registry per section (per component with include_components), the derived indexes, caches, CSS data and the deduplicated content store, plus the process RSS. tracemalloc_limit > 0 adds the top allocating source lines (tracemalloc); diff_reload reloads the registry like ClearCache and reports the allocation changes across the reload.")
+async def get_memory_report(
+    ctx: Context,
+    include_components: bool = False,
+    tracemalloc_limit: int = 0,
+    diff_reload: bool = False
+) -> Dict[str, Any] | str:
+    """Report deep sizes of the registry, indexes and caches, optionally with tracemalloc statistics."""
+    registry_error = await ensure_registry_loaded(ctx)
+    if registry_error:
+        return registry_error
+    
+    allocations = None
+    if tracemalloc_limit > 0 or diff_reload:
+        traced_from_startup = memory_report.start_tracemalloc()
+        if not traced_from_startup:
+            await ctx.warning("⚠️ tracemalloc started now: earlier allocations (e.g. the registry load) are not attributed. Set FASTMCP_TRACEMALLOC=1 to trace from startup")
+        limit = tracemalloc_limit if tracemalloc_limit > 0 else 10
+        if diff_reload:
+            before = memory_report.take_snapshot()
+            built_indexes = list(derived_cache)
+            load_result = await reload_registry(ctx)
+            if not load_result.startswith("Successfully"):
+                await ctx.error(f"❌ {load_result}")
+                return load_result
+            # Rebuild the indexes that were loaded before, so the diff compares like with like
+            for name in built_indexes:
+                get_derived(name)
+            gc.collect()
+            after = memory_report.take_snapshot()
+            allocations = {"top_allocators": memory_report.top_allocators(after, limit),
+                           "reload_diff": memory_report.snapshot_diff(before, after, limit)}
+        else:
+            allocations = {"top_allocators": memory_report.top_allocators(memory_report.take_snapshot(), limit)}
+        allocations = {"traced_from_startup": traced_from_startup, **memory_report.traced_memory(), **allocations}
+    
+    report = build_memory_report(include_components)
+    if allocations is not None:
+        report["tracemalloc"] = allocations
+    await ctx.info(f"✅ Registry holds {report['registry']['total_bytes'] / 1024:.1f} KB")
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Resources: stable, cacheable URIs for components, examples, schemas and CSS
+# ---------------------------------------------------------------------------
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+
+
+async def _resource_registry_ready():
+    """Wait for the registry inside a resource read, raising if it is not available."""
+    registry_error = await ensure_registry_loaded(get_context())
+    if registry_error:
+        raise ResourceError(registry_error)
+
+
+@mcp.resource("vg://index", name="VG UI Library resource index", mime_type="application/json",
+              description="Every VG UI Library resource URI with its content hash and the registry version. Re-read a resource only when its hash changed.")
+async def resource_index() -> str:
+    """List all component, example, schema and CSS resource URIs with their content hashes."""
+    await _resource_registry_ready()
+    entity_hashes = get_derived("entity_hashes")
+    
+    resources = {}
+    for component_tag, component in components_data.items():
+        resources[f"vg://component/{component_tag}"] = entity_hashes["components"].get(component_tag, "")
+        for example in component.get('examples') or []:
+            example_hash = entity_hashes["examples"].get(example_key(component_tag, example.get('id', '')), "")
+            for framework in example_frameworks(example):
+                resources[f"vg://component/{component_tag}/example/{example.get('id', '')}/{framework}"] = example_hash
+    for schema_name in schemas_data:
+        resources[f"vg://schema/{schema_name}"] = entity_hashes["schemas"].get(schema_name, "")
+    for category_name, css_text in css_categorized.items():
+        resources[f"vg://css/{category_name}"] = _content_hash(css_text)
+    
+    return json_backend.dumps({"registry_version": registry_hash, "resources": resources})
+
+
+@mcp.resource("vg://component/{tag}", name="VG UI Library component", mime_type="application/json",
+              description="Documentation of a VG UI Library web component (props, events, slots, example ids) with its content hash.")
+async def component_resource(tag: str) -> str:
+    """Serve a component's documentation as a cacheable resource."""
+    await _resource_registry_ready()
+    component = components_data.get(tag)
+    if not component:
+        raise ResourceError(f"Component '{tag}' not found. Available components: {list(components_data.keys())}")
+    return json_backend.dumps({
+        **component_documentation(tag, component),
+        "content_hash": get_derived("entity_hashes")["components"].get(tag, "")
+    })
+
+
+@mcp.resource("vg://component/{tag}/example/{example_id}/{framework}", name="VG UI Library component example source", mime_type="text/plain",
+              description="Source code of one VG UI Library component example for one framework (html, react, react19, vue, angular, lit).")
+async def component_example_resource(tag: str, example_id: str, framework: str) -> str:
+    """Serve one framework's source of a component example as a cacheable resource."""
+    await _resource_registry_ready()
+    component = components_data.get(tag)
+    if not component:
+        raise ResourceError(f"Component '{tag}' not found. Available components: {list(components_data.keys())}")
+    example_position = get_derived("example_map").get(tag, {}).get(example_id)
+    if example_position is None:
+        raise ResourceError(f"Example '{example_id}' not found for component '{tag}'")
+    example = component['examples'][example_position]
+    sources = example_sources(example, [framework])
+    if framework not in sources:
+        raise ResourceError(f"Framework '{framework}' not found for example '{example_id}'. Available frameworks: {example_frameworks(example)}")
+    return sources[framework]
+
+
+@mcp.resource("vg://schema/{name}", name="VG UI Library schema", mime_type="application/json",
+              description="Definition of a TypeScript schema used by VG UI Library web components, with its content hash.")
+async def schema_resource(name: str) -> str:
+    """Serve a schema definition as a cacheable resource."""
+    await _resource_registry_ready()
+    schema = schemas_data.get(name)
+    if not schema:
+        raise ResourceError(f"Schema '{name}' not found. Available schemas: {list(schemas_data.keys())}")
+    return json_backend.dumps({
+        "name": name,
+        "definition": schema,
+        "content_hash": get_derived("entity_hashes")["schemas"].get(name, "")
+    })
+
+
+@mcp.resource("vg://css/{category}", name="VG UI Library CSS category", mime_type="text/css",
+              description="CSS variables and styles of one category produced by `categorize_css`.")
+async def css_category_resource(category: str) -> str:
+    """Serve the CSS of one category as a cacheable resource."""
+    if category not in css_categorized:
+        raise ResourceError(f"CSS category '{category}' not found. Run `categorize_css` first. Available categories: {list(css_categorized.keys())}")
+    return css_categorized[category]
+
+
 def load_user_configs():
     # Parse arguments first
-    global _use_framework
-    # Don't parse args again if already set
+    global _use_framework, _shared_registry, _compact_registry, _daemon_socket, _print_memory_report
+    args = parse_args()
+    # Don't override the framework if already set
     if _use_framework is None:
-        args = parse_args()
         _use_framework = args.use_framework
+    _shared_registry = _shared_registry or args.shared_registry
+    _compact_registry = _compact_registry or args.compact_registry
+    if args.profile_tools is not None or args.profile_rate is not None:
+        tools = parse_tool_selection(args.profile_tools) if args.profile_tools is not None else tool_profiler.tools
+        rate = args.profile_rate if args.profile_rate is not None else tool_profiler.sample_rate
+        tool_profiler.configure(tools, rate)
+    if args.trace_file or (args.trace and not tracer.enabled):
+        tracer.configure(_trace_file(True, args.trace_file))
+    _print_memory_report = args.memory_report
+    if args.daemon:
+        # Named like the shim names it, from the same options (without --daemon itself)
+        _daemon_socket = Path(args.socket) if args.socket else default_socket_path(canonical_server_args([arg for arg in sys.argv[1:] if arg != "--daemon"]))
     
     
     # Build server arguments to pass to subprocess servers
@@ -560,13 +1635,53 @@ def load_user_configs():
         # However, since dev() spawns external processes, we need a different approach
         # Let's use environment variable as a fallback
         os.environ['FASTMCP_USE_FRAMEWORK'] = _use_framework if _use_framework else ''
+    if _shared_registry:
+        os.environ['FASTMCP_SHARED_REGISTRY'] = '1'
+    if _compact_registry:
+        os.environ['FASTMCP_COMPACT_REGISTRY'] = '1'
+    if tool_profiler.tools:
+        os.environ['FASTMCP_PROFILE_TOOLS'] = ",".join(sorted(tool_profiler.tools))
+        os.environ['FASTMCP_PROFILE_RATE'] = str(tool_profiler.sample_rate)
+    if tracer.path:
+        os.environ['FASTMCP_TRACE_FILE'] = str(tracer.path)
     # return original_argv
         
 
 
+async def run_daemon(socket_path: Path):
+    """Warm the registry, then serve MCP sessions on a Unix domain socket until terminated."""
+    from vg_ui_lib_mcp.daemon import serve_unix_socket
+    
+    def warm_registry():
+        global registry_load_task
+        registry_load_task = asyncio.create_task(load_component_registry(True))
+    
+    await serve_unix_socket(mcp, socket_path, on_listening=warm_registry)
+
+
+async def print_memory_report():
+    """Load the registry and every derived index with tracemalloc on, then print the memory report as JSON."""
+    memory_report.start_tracemalloc()
+    await load_component_registry(True)
+    if not registry_ready.is_set():
+        return
+    for name in ARTIFACT_BUILDERS:
+        get_derived(name)
+    report = build_memory_report(include_components=True)
+    report["tracemalloc"] = {**memory_report.traced_memory(),
+                             "top_allocators": memory_report.top_allocators(memory_report.take_snapshot(), 15)}
+    print(json.dumps(report, indent=2))
+
+
 def run():
     """Run the MCP server."""
     load_user_configs()
+    if _print_memory_report:
+        asyncio.run(print_memory_report())
+        return
+    if _daemon_socket is not None:
+        asyncio.run(run_daemon(_daemon_socket))
+        return
     mcp.run(transport="stdio")
 
 
@@ -0,0 +1,408 @@
+"""
+Validation of `vg-*` elements in HTML, JSX, Vue, Angular and Lit markup.
+
+Agents write markup like `<vg-button variant="...">` and only find bad
+props, invalid enum values or unknown events at runtime. The registry's
+`props` (type, enum, required), `events` and `slots` are compiled once per
+snapshot into a `ComponentRules` table per component (see
+`build_markup_validators`); `validate_markup` then scans a snippet with a
+tolerant tag/attribute tokenizer and checks every VG element against its
+table:
+
+- unknown components, props/attributes, and `vg-*` events,
+- static (or literal-bound) values against the prop's enum, number and
+  boolean types, e.g. `disabled="false"` (true whenever present),
+- required props that are missing,
+- `slot="..."` of direct children against the parent component's slots.
+
+Framework binding syntax is understood per framework: `:prop`/`@event`
+(Vue), `[prop]`/`(event)` (Angular), `.prop`/`?attr`/`@event` (Lit),
+`onVgChange` on `VgButton` wrappers (React) and `onvg-change` (React 19).
+Dynamic values (expressions, `${...}`, `{{...}}`) are not checked.
+"""
+
+import difflib
+import re
+from bisect import bisect_right
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+MARKUP_FRAMEWORKS = ("html", "react", "react19", "vue", "angular", "lit")
+
+# Attributes every element accepts (compared case-insensitively), besides `data-*` and `aria-*`
+GLOBAL_ATTRIBUTES = frozenset((
+    "id", "class", "style", "title", "hidden", "lang", "dir", "tabindex", "role", "part", "exportparts", "is",
+    "inert", "autofocus", "draggable", "contenteditable", "translate", "accesskey", "nonce", "spellcheck",
+    "key", "ref", "classname", "htmlfor", "children", "dangerouslysetinnerhtml", "suppresshydrationwarning",
+))
+_PRIMITIVE_TYPES = {"string", "number", "boolean", "null", "undefined", "any", "unknown", "object"}
+
+_TAG = re.compile(r"<!--.*?-->|<(/?)([A-Za-z][\w.:-]*)", re.DOTALL)
+_ATTRIBUTE_NAME = re.compile(r"[^\s=>/\"'{}<]+")
+_WHITESPACE = re.compile(r"\s*")
+_UNQUOTED_VALUE = re.compile(r"(?:[^\s>/]|/(?!>))*")
+_NUMBER = re.compile(r"^-?(\d+(\.\d*)?|\.\d+)([eE][-+]?\d+)?$")
+_UPPER = re.compile(r"(?<!^)(?=[A-Z])")
+
+
+class PropRule:
+    """How one prop's values are checked."""
+
+    __slots__ = ("name", "type", "kind", "enum", "required")
+
+    def __init__(self, name: str, prop_type: str, enum: Optional[List[Any]], required: bool):
+        self.name = name
+        self.type = prop_type
+        parts = {part.strip() for part in prop_type.split("|")} - {"null", "undefined"}
+        if parts == {"boolean"}:
+            self.kind = "boolean"
+        elif parts == {"number"}:
+            self.kind = "number"
+        elif enum and not parts <= _PRIMITIVE_TYPES:
+            # Enums of plain primitive types are artifacts of the registry generator, not constraints
+            self.kind = "enum"
+        elif parts <= {"string"}:
+            self.kind = "string"
+        else:
+            self.kind = "any"
+        self.enum = tuple(str(value) for value in enum) if self.kind == "enum" else ()
+        self.required = required
+
+
+class ComponentRules:
+    """Compiled validator table of one component."""
+
+    __slots__ = ("tag", "props", "attributes", "events", "slots", "required")
+
+    def __init__(self, tag: str, component: Dict[str, Any]):
+        self.tag = tag
+        self.props: Dict[str, PropRule] = {
+            name: PropRule(name, str(prop.get('type') or ""), prop.get('enum'), bool(prop.get('required', False)))
+            for name, prop in (component.get('props') or {}).items()
+        }
+        # Case-folded prop names and their kebab-case attribute forms -> rule
+        self.attributes: Dict[str, PropRule] = {}
+        for name, rule in self.props.items():
+            self.attributes.setdefault(name.casefold(), rule)
+            self.attributes.setdefault(_kebab(name), rule)
+        self.events: FrozenSet[str] = frozenset(component.get('events') or {})
+        self.slots: FrozenSet[str] = frozenset(component.get('slots') or {})
+        self.required: Tuple[str, ...] = tuple(name for name, rule in self.props.items() if rule.required)
+
+
+def build_markup_validators(registry: Dict[str, Any]) -> Dict[str, ComponentRules]:
+    """Compile the validator table of every component of a registry snapshot."""
+    return {tag: ComponentRules(tag, component) for tag, component in (registry.get('components') or {}).items()}
+
+
+def _kebab(name: str) -> str:
+    return _UPPER.sub("-", name).lower()
+
+
+def _suggest(name: str, candidates) -> Optional[str]:
+    matches = difflib.get_close_matches(name, sorted(candidates), n=1, cutoff=0.6)
+    return matches[0] if matches else None
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer
+# ---------------------------------------------------------------------------
+
+def _skip_string(code: str, pos: int) -> int:
+    end = code.find(code[pos], pos + 1)
+    return len(code) if end < 0 else end + 1
+
+
+def _skip_braces(code: str, pos: int) -> int:
+    """Position after the `}` matching the `{` at `pos` (quoted strings are skipped)."""
+    depth = 0
+    while pos < len(code):
+        char = code[pos]
+        if char in "\"'`":
+            pos = _skip_string(code, pos)
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return pos
+
+
+def _read_value(code: str, pos: int) -> Tuple[str, bool, int]:
+    """Read an attribute value at `pos`; return `(value, dynamic, end)`."""
+    char = code[pos:pos + 1]
+    if char and char in "\"'":
+        end = _skip_string(code, pos)
+        value = code[pos + 1:end - 1]
+        return value, "${" in value or "{{" in value, end
+    if code.startswith(("\\\"", "\\'"), pos):
+        # Markup inside a JS string literal, e.g. innerHTML = "<vg-button variant=\"primary\">"
+        end = code.find(code[pos:pos + 2], pos + 2)
+        end = len(code) if end < 0 else end
+        value = code[pos + 2:end]
+        return value, "${" in value or "{{" in value, end + 2
+    if char == "{" or code.startswith("${", pos):
+        start = pos + (char == "$")
+        end = _skip_braces(code, start)
+        return code[start + 1:end - 1], True, end
+    match = _UNQUOTED_VALUE.match(code, pos)
+    return match.group(), False, match.end()
+
+
+def _parse_attributes(code: str, pos: int) -> Tuple[List[Tuple[str, Optional[str], bool, int]], int, bool]:
+    """Parse the attributes of a tag whose name ends at `pos`.
+
+    Returns:
+        `([(name, value, dynamic, offset)], end, self_closing)`; `value` is None for valueless attributes.
+    """
+    attributes = []
+    while pos < len(code):
+        pos = _WHITESPACE.match(code, pos).end()
+        if pos >= len(code) or code[pos] == "<":
+            break
+        if code[pos] == ">":
+            return attributes, pos + 1, False
+        if code.startswith("/>", pos):
+            return attributes, pos + 2, True
+        if code[pos] == "{":
+            # JSX spread attributes
+            pos = _skip_braces(code, pos)
+            continue
+        match = _ATTRIBUTE_NAME.match(code, pos)
+        if not match:
+            pos += 1
+            continue
+        name, offset = match.group(), pos
+        pos = _WHITESPACE.match(code, match.end()).end()
+        value, dynamic = None, False
+        if pos < len(code) and code[pos] == "=":
+            value, dynamic, pos = _read_value(code, _WHITESPACE.match(code, pos + 1).end())
+        attributes.append((name, value, dynamic, offset))
+    return attributes, pos, False
+
+
+def _element_tag(name: str, framework: str) -> Optional[str]:
+    """The VG component tag an element name stands for, or None."""
+    if name.startswith("vg-"):
+        return name
+    if framework == "react" and name.startswith("Vg") and name[2:3].isupper():
+        return _kebab(name)
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Binding syntax and value checks
+# ---------------------------------------------------------------------------
+
+def _classify(framework: str, name: str) -> Optional[Tuple[str, str, str]]:
+    """Classify an attribute as `(kind, name, binding)`.
+
+    `kind` is prop, event or slot; `binding` is attribute (static text), property
+    (an expression), boolean (Lit `?attr`), jsx, or inline (HTML `on*` handlers).
+    Returns None for framework directives that aren't checked.
+    """
+    if framework == "lit" and name[:1] in ".?@":
+        return ("event", name[1:], "") if name[0] == "@" else ("prop", name[1:], "property" if name[0] == "." else "boolean")
+    if framework == "vue":
+        if name.startswith(("@", "v-on:")):
+            return "event", (name.split(":", 1)[1] if name.startswith("v-on:") else name[1:]).split(".")[0], ""
+        if name.startswith((":", "v-bind:")):
+            return "prop", name.split(":", 1)[1].split(".")[0], "property"
+        if name.startswith(("v-", "#")):
+            return None
+    if framework == "angular":
+        if name.startswith("[(") or name.startswith(("*", "#", "let-")):
+            return None
+        if name.startswith("[") and name.endswith("]"):
+            bound = name[1:-1]
+            if bound.startswith(("class.", "style.")) or bound in ("ngClass", "ngStyle"):
+                return None
+            return "prop", bound[5:] if bound.startswith("attr.") else bound, "property"
+        if name.startswith("(") and name.endswith(")"):
+            return "event", name[1:-1].split(".")[0], ""
+    if framework in ("react", "react19") and name.startswith("on") and len(name) > 2:
+        handler = name[2:]
+        if handler[0].isupper():
+            # React event props: onVgChange on wrappers, onClick (React's own events)
+            return "event", _kebab(handler) if framework == "react" else handler.lower(), ""
+        if framework == "react19":
+            return "event", handler, ""
+    if framework == "html" and name.lower().startswith("on"):
+        return "event", name[2:].lower(), "inline"
+    if name.lower() == "slot":
+        return "slot", "slot", "attribute"
+    return "prop", name, "jsx" if framework in ("react", "react19") else "attribute"
+
+
+def _literal(expression: str) -> Tuple[bool, Any]:
+    """`(True, value)` if an expression is a plain string, boolean or number literal, else `(False, None)`."""
+    expression = expression.strip()
+    if expression.startswith("${") and expression.endswith("}"):
+        expression = expression[2:-1].strip()
+    if len(expression) >= 2 and expression[0] == expression[-1] and expression[0] in "\"'`" \
+            and expression[0] not in expression[1:-1] and "${" not in expression:
+        return True, expression[1:-1]
+    if expression in ("true", "false"):
+        return True, expression == "true"
+    if _NUMBER.match(expression):
+        return True, float(expression)
+    return False, None
+
+
+def _check_value(rule: PropRule, binding: str, value: Optional[str], dynamic: bool) -> Optional[Tuple[str, str]]:
+    """`(severity, message)` if the value is invalid for the prop, else None."""
+    if binding == "boolean":
+        if rule.kind not in ("boolean", "any"):
+            return "warning", f"`?{rule.name}` binds a boolean attribute, but `{rule.name}` is `{rule.type}`"
+        return None
+    if value is None:
+        return None
+    if binding == "jsx":
+        # JSX: "text" is a static string, {expression} a bound value
+        binding = "property" if dynamic else "attribute"
+    if binding == "attribute":
+        if dynamic:
+            return None
+        text = value
+        if rule.kind == "boolean" and text.strip().lower() == "false":
+            return "warning", (f"`{rule.name}` is a boolean attribute: it is true whenever present, "
+                               f"so `{rule.name}=\"false\"` still enables it. Remove it or bind a boolean instead")
+        if rule.kind == "number" and not _NUMBER.match(text.strip()):
+            return "error", f"`{rule.name}` expects a number (`{rule.type}`), got \"{text}\""
+        if rule.kind == "enum" and text not in rule.enum:
+            return "error", f"Invalid value \"{text}\" for `{rule.name}` (`{rule.type}`). Expected one of: {', '.join(rule.enum)}"
+        return None
+
+    is_literal, literal = _literal(value)
+    if not is_literal or rule.kind == "any":
+        return None
+    expected = {"boolean": bool, "number": float, "string": str, "enum": str}[rule.kind]
+    if not isinstance(literal, expected):
+        return "error", f"`{rule.name}` expects `{rule.type}`, got {value.strip()}"
+    if rule.kind == "enum" and literal not in rule.enum:
+        return "error", f"Invalid value \"{literal}\" for `{rule.name}` (`{rule.type}`). Expected one of: {', '.join(rule.enum)}"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Validation
+# ---------------------------------------------------------------------------
+
+def validate_markup(code: str, framework: str, validators: Dict[str, ComponentRules]) -> Dict[str, Any]:
+    """Check every VG element of a markup snippet against the compiled validator tables.
+
+    Args:
+        code: HTML, JSX, Vue or Angular template, or Lit source with `html` templates.
+        framework: One of MARKUP_FRAMEWORKS; selects the binding syntax.
+        validators: Output of `build_markup_validators`.
+
+    Returns:
+        `{"valid", "elements", "errors", "warnings", "issues"}` where each issue has
+        severity, line, column, element, attribute (if any), message and suggestion (if any).
+    """
+    line_starts = [0] + [match.end() for match in re.finditer(r"\n", code)]
+    issues: List[Dict[str, Any]] = []
+
+    def report(severity: str, offset: int, element: str, message: str,
+               attribute: Optional[str] = None, suggestion: Optional[str] = None):
+        line = bisect_right(line_starts, offset)
+        issue = {"severity": severity, "line": line, "column": offset - line_starts[line - 1] + 1,
+                 "element": element, "message": message}
+        if attribute is not None:
+            issue["attribute"] = attribute
+        if suggestion:
+            issue["suggestion"] = suggestion
+        issues.append(issue)
+
+    # Open elements: (element name, component tag or None)
+    stack: List[Tuple[str, Optional[str]]] = []
+    elements = 0
+    pos = 0
+    while True:
+        match = _TAG.search(code, pos)
+        if match is None:
+            break
+        pos = match.end()
+        if match.group(2) is None:
+            continue
+        name = match.group(2)
+        if match.group(1):
+            # Close the element and anything left open inside it
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][0] == name:
+                    del stack[depth:]
+                    break
+            continue
+
+        attributes, pos, self_closing = _parse_attributes(code, pos)
+        tag = _element_tag(name, framework)
+        parent_tag = stack[-1][1] if stack else None
+        if not self_closing:
+            stack.append((name, tag))
+
+        for attribute, value, dynamic, offset in attributes:
+            if attribute.lower() == "slot" and parent_tag in validators and value is not None and not dynamic:
+                slots = validators[parent_tag].slots
+                if value not in slots:
+                    report("error", offset, name, f"`{parent_tag}` has no slot \"{value}\". Slots: {', '.join(sorted(slots)) or 'none'}",
+                           attribute, _suggest(value, slots))
+        if tag is None:
+            continue
+
+        elements += 1
+        rules = validators.get(tag)
+        if rules is None:
+            report("error", match.start(), name, f"Unknown component `{tag}`", suggestion=_suggest(tag, validators))
+            continue
+
+        present = set()
+        for attribute, value, dynamic, offset in attributes:
+            classified = _classify(framework, attribute)
+            if classified is None:
+                continue
+            kind, attribute_name, binding = classified
+            if kind == "slot":
+                continue
+            if kind == "event":
+                if attribute_name in rules.events:
+                    if binding == "inline":
+                        report("warning", offset, name, f"Inline `on{attribute_name}` handlers are never called for the custom event "
+                               f"`{attribute_name}`. Use addEventListener('{attribute_name}', ...)", attribute)
+                elif attribute_name.startswith("vg-"):
+                    report("error", offset, name, f"`{tag}` has no event `{attribute_name}`. Events: {', '.join(sorted(rules.events)) or 'none'}",
+                           attribute, _suggest(attribute_name, rules.events))
+                elif f"vg-{attribute_name}" in rules.events and binding != "inline":
+                    report("warning", offset, name, f"`{attribute_name}` is a native DOM event; `{tag}` emits `vg-{attribute_name}`",
+                           attribute, f"vg-{attribute_name}")
+                continue
+
+            rule = rules.props.get(attribute_name) or rules.attributes.get(attribute_name.casefold())
+            if rule is None:
+                lowered = attribute_name.lower()
+                if lowered in GLOBAL_ATTRIBUTES or lowered.startswith(("data-", "aria-")):
+                    continue
+                report("error", offset, name, f"`{tag}` has no prop `{attribute_name}`", attribute,
+                       _suggest(attribute_name, rules.props))
+                continue
+            present.add(rule.name)
+            problem = _check_value(rule, binding, value, dynamic)
+            if problem:
+                report(problem[0], offset, name, problem[1], attribute,
+                       _suggest(value, rule.enum) if rule.kind == "enum" and value and not dynamic else None)
+
+        for required in rules.required:
+            if required not in present:
+                report("error", match.start(), name, f"Missing required prop `{required}` of `{tag}`")
+
+    issues.sort(key=lambda issue: (issue["line"], issue["column"]))
+    errors = sum(1 for issue in issues if issue["severity"] == "error")
+    return {
+        "valid": errors == 0,
+        "elements": elements,
+        "errors": errors,
+        "warnings": len(issues) - errors,
+        "issues": issues,
+    }
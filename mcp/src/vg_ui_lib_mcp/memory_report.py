@@ -0,0 +1,155 @@
+"""
+Memory accounting for the loaded registry, its derived indexes and caches.
+
+Dozens of server processes can run on one host, so what each of them holds
+matters. `deep_sizeof` walks a value's object graph and adds up
+`sys.getsizeof` of every object reachable from it, counting shared objects
+once; `section_sizes` applies it per key of a mapping (e.g. per registry
+section or per component). Values are measured independently, so objects
+shared between them (interned strings, shared example source blocks) are
+counted in each, and the sizes of parts can add up to more than the whole.
+
+`tracemalloc` complements this with the source lines that allocated the
+memory: `top_allocators` lists the largest allocation sites of a snapshot,
+`snapshot_diff` what changed between two snapshots (e.g. across a registry
+reload, to spot leaks). Tracing only sees allocations made after it
+started, so start it early (`FASTMCP_TRACEMALLOC`) to attribute the initial
+registry load.
+"""
+
+import os
+import sys
+import tracemalloc
+from array import array
+from collections import deque
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from vg_ui_lib_mcp.content_store import PackedText
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+# Objects whose size is not attributed to the values referencing them
+_OPAQUE_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+# Objects without references to other objects worth following
+_ATOMIC_TYPES = (str, bytes, bytearray, int, float, complex, bool, type(None), array, range, memoryview)
+
+
+def deep_sizeof(value: Any, seen: Optional[Set[int]] = None) -> int:
+    """Total size in bytes of `value` and every object reachable from it, each counted once.
+
+    Args:
+        value: The value to measure.
+        seen: Ids of objects already counted (shared between calls to skip them), None for a fresh walk.
+
+    Returns:
+        The deep size in bytes. A `PackedText` counts its block ids and the blocks
+        it uses, not the whole content store it points to. Other mappings than
+        dicts (e.g. a shared snapshot's SnapshotMapping) count their items as
+        decoded, not the storage behind them.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _OPAQUE_TYPES):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, PackedText):
+            blocks = obj.store.blocks
+            stack.append(obj.block_ids)
+            stack.extend(blocks[block_id] for block_id in obj.block_ids)
+        elif isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+            if type(obj) is not dict:
+                # Subclasses such as PackedExample hold more in their slots
+                stack.extend(_attribute_values(obj))
+        elif isinstance(obj, Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+            stack.extend(obj)
+        else:
+            stack.extend(_attribute_values(obj))
+    return total
+
+
+def _attribute_values(obj: Any) -> List[Any]:
+    values = [vars(obj)] if hasattr(obj, "__dict__") else []
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if hasattr(obj, slot):
+                values.append(getattr(obj, slot))
+    return values
+
+
+def section_sizes(mapping: Mapping[str, Any]) -> Dict[str, int]:
+    """Deep size of every value of a mapping, measured independently, largest first."""
+    sizes = {key: deep_sizeof(value) for key, value in mapping.items()}
+    return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+
+def process_memory() -> Dict[str, Optional[int]]:
+    """Current and peak resident set size of this process in bytes (None where unavailable)."""
+    rss_bytes = max_rss_bytes = None
+    try:
+        with open("/proc/self/statm") as statm:
+            rss_bytes = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        max_rss_bytes = max_rss if sys.platform == "darwin" else max_rss * 1024
+    return {"rss_bytes": rss_bytes, "max_rss_bytes": max_rss_bytes}
+
+
+def start_tracemalloc(frames: int = 1) -> bool:
+    """Start tracing allocations unless already tracing; return whether it was already running."""
+    if tracemalloc.is_tracing():
+        return True
+    tracemalloc.start(max(1, frames))
+    return False
+
+
+def traced_memory() -> Dict[str, int]:
+    """Current and peak size in bytes of the memory traced by tracemalloc."""
+    traced_bytes, peak_traced_bytes = tracemalloc.get_traced_memory()
+    return {"traced_bytes": traced_bytes, "peak_traced_bytes": peak_traced_bytes}
+
+
+def take_snapshot() -> tracemalloc.Snapshot:
+    """Snapshot of the traced allocations, without tracemalloc's and the import system's own."""
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+
+
+def top_allocators(snapshot: tracemalloc.Snapshot, limit: int = 10) -> List[Dict[str, Any]]:
+    """The source lines holding the most traced memory in a snapshot."""
+    return [{
+        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+        "size_bytes": stat.size,
+        "count": stat.count,
+    } for stat in snapshot.statistics("lineno")[:max(limit, 0)]]
+
+
+def snapshot_diff(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int = 10) -> List[Dict[str, Any]]:
+    """The source lines whose traced memory changed the most between two snapshots."""
+    return [{
+        "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+        "size_diff_bytes": stat.size_diff,
+        "count_diff": stat.count_diff,
+        "size_bytes": stat.size,
+    } for stat in after.compare_to(before, "lineno")[:max(limit, 0)]]
@@ -0,0 +1,177 @@
+"""
+Sampled cProfile profiling of tool calls.
+
+When a tool call is slow in production, `ToolProfiler` profiles a sampled
+fraction of the calls to chosen tools (or all tools with `*`) and writes each
+profile as a `pstats` file to a local directory, named after the call:
+
+    <timestamp>_<tool>_<arguments hash>_<registry version>.prof
+
+Only the newest `max_profiles` files are kept. `summarize_profiles` merges
+the collected profiles (optionally of one tool) and lists the hottest
+functions. The files can also be opened with `python -m pstats` or snakeviz.
+
+cProfile profiles the whole thread, so other requests running concurrently
+on the event loop show up in a profile too, and only one call is profiled at
+a time. Profiling is off unless tools are selected.
+"""
+
+import cProfile
+import hashlib
+import pstats
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from vg_ui_lib_mcp.coaccess import access_key
+
+
+PROFILE_SUFFIX = ".prof"
+DEFAULT_MAX_PROFILES = 200
+ALL_TOOLS = "*"
+SORT_KEYS = ("cumulative", "tottime", "calls")
+
+
+def parse_tool_selection(value: Optional[str]) -> Set[str]:
+    """Parse a comma-separated tool list (`*` selects every tool)."""
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+def arguments_hash(tool: str, arguments: Dict[str, Any]) -> str:
+    """Short stable hash of a tool call's arguments."""
+    return hashlib.sha256(access_key(tool, arguments).encode('utf-8')).hexdigest()[:12]
+
+
+def profile_tool_name(path: Path) -> str:
+    """Tool name encoded in a profile file name."""
+    _, _, rest = path.stem.partition("_")
+    return rest.rsplit("_", 2)[0]
+
+
+class ToolProfiler:
+    """Profiles a sampled fraction of the calls to selected tools into a rotating directory."""
+
+    def __init__(self, directory: Optional[Path], tools: Iterable[str] = (), sample_rate: float = 1.0,
+                 max_profiles: int = DEFAULT_MAX_PROFILES):
+        self.directory = directory
+        self.max_profiles = max(1, max_profiles)
+        self.written = 0
+        self._active = False
+        self.configure(tools, sample_rate)
+
+    def configure(self, tools: Iterable[str], sample_rate: float):
+        """Select the tools to profile (empty disables profiling) and the fraction of their calls."""
+        self.tools = set(tools)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tools) and self.sample_rate > 0 and self.directory is not None
+
+    def ensure_directory(self) -> bool:
+        """Create the profile directory if needed; False if there is none or it cannot be created."""
+        if self.directory is None:
+            return False
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        return True
+
+    def start(self, tool: str) -> Optional[cProfile.Profile]:
+        """Start profiling this call if its tool is selected and it is sampled, else return None."""
+        if not self.enabled or self._active:
+            return None
+        if ALL_TOOLS not in self.tools and tool not in self.tools:
+            return None
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return None
+        self._active = True
+        return profile
+
+    def finish(self, profile: cProfile.Profile, tool: str, arguments: Dict[str, Any],
+               registry_version: str) -> Optional[Path]:
+        """Stop a profile started by `start`, write it and rotate old profiles out.
+
+        Returns:
+            The path of the written profile, or None if it couldn't be written.
+        """
+        profile.disable()
+        self._active = False
+        name = f"{time.time_ns()}_{tool}_{arguments_hash(tool, arguments)}_{registry_version[:12] or 'none'}{PROFILE_SUFFIX}"
+        path = self.directory / name
+        if not self.ensure_directory():
+            return None
+        try:
+            profile.dump_stats(path)
+        except OSError:
+            return None
+        self.written += 1
+        self._rotate()
+        return path
+
+    def profiles(self) -> List[Path]:
+        """Collected profile files, oldest first."""
+        if self.directory is None:
+            return []
+        return sorted(self.directory.glob(f"*{PROFILE_SUFFIX}"))
+
+    def _rotate(self):
+        profiles = self.profiles()
+        for path in profiles[:max(len(profiles) - self.max_profiles, 0)]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+
+def summarize_profiles(paths: List[Path], sort: str = "cumulative", limit: int = 20) -> Dict[str, Any]:
+    """Merge profiles and list their hottest functions.
+
+    Args:
+        paths: Profile files to merge.
+        sort: `cumulative` (time including callees), `tottime` (own time) or `calls`.
+        limit: Number of functions to return.
+
+    Returns:
+        Profile counts per tool and the top functions, each with its call count,
+        own time and cumulative time in seconds (summed over the profiles).
+    """
+    stats: Optional[pstats.Stats] = None
+    per_tool: Dict[str, int] = {}
+    for path in paths:
+        try:
+            if stats is None:
+                stats = pstats.Stats(str(path))
+            else:
+                stats.add(str(path))
+        except (OSError, TypeError, ValueError, EOFError):
+            continue
+        tool = profile_tool_name(path)
+        per_tool[tool] = per_tool.get(tool, 0) + 1
+    if stats is None:
+        return {"profiles": 0, "tools": {}, "functions": []}
+
+    column = {"cumulative": 3, "tottime": 2, "calls": 1}[sort]
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][column], reverse=True)
+    functions = []
+    for (filename, line, function), (_, calls, own_time, cumulative_time, _) in rows[:max(limit, 0)]:
+        functions.append({
+            "function": pstats.func_std_string((filename, line, function)),
+            "calls": calls,
+            "tottime": round(own_time, 6),
+            "cumtime": round(cumulative_time, 6),
+        })
+    return {
+        "profiles": sum(per_tool.values()),
+        "tools": per_tool,
+        "total_time": round(stats.total_tt, 6),
+        "functions": functions,
+    }
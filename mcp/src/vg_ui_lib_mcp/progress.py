@@ -0,0 +1,51 @@
+"""
+MCP progress notifications for long-running tool calls.
+
+`report_progress_while` sends `notifications/progress` for the current
+request at a fixed interval while the wrapped block runs, using the elapsed
+seconds as progress and the block's time budget as total. Clients that didn't
+send a progress token get nothing (`Context.report_progress` is a no-op then).
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from fastmcp import Context
+
+
+DEFAULT_INTERVAL = 2.0
+
+
+@asynccontextmanager
+async def report_progress_while(ctx: Context, message: str, total: Optional[float] = None,
+                                interval: float = DEFAULT_INTERVAL) -> AsyncIterator[None]:
+    """Report progress every `interval` seconds until the block exits, then a final notification.
+
+    Args:
+        ctx: The context of the request to report progress for.
+        message: Describes what the request is waiting for.
+        total: Time budget of the block in seconds (e.g. its timeout), if bounded.
+        interval: Seconds between notifications.
+    """
+    start = time.monotonic()
+
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(interval)
+            elapsed = time.monotonic() - start
+            await ctx.report_progress(min(elapsed, total) if total else elapsed, total, f"{message} ({elapsed:.0f}s)")
+
+    await ctx.report_progress(0, total, message)
+    task = asyncio.create_task(heartbeat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        try:
+            await task
+        except (asyncio.CancelledError, Exception):
+            pass
+    elapsed = time.monotonic() - start
+    await ctx.report_progress(total if total else elapsed, total, f"{message}: done")
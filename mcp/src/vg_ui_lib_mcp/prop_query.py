@@ -0,0 +1,230 @@
+"""
+Structured prop/event query engine for the VG UI Library component registry.
+
+This module flattens every component prop and event into one columnar table
+(parallel lists indexed by row id) so structured queries such as
+"components with a boolean `disabled` prop and a `vg-change` event" are a
+single pass over compact arrays instead of a walk through nested dicts.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+
+# Columns exposed to queries, in projection order
+TABLE_COLUMNS = ("component", "kind", "name", "type", "default", "required", "enum", "description")
+
+# Columns that have an exact-match hash index (value -> row ids)
+INDEXED_COLUMNS = ("component", "kind", "name")
+
+SUPPORTED_OPERATORS = ("eq", "ne", "contains", "startswith", "in", "exists")
+
+
+class QueryPredicate(BaseModel):
+    """A single filter predicate applied to one column of the prop/event table.
+
+    Operators:
+        eq / ne: exact (case-insensitive for strings) equality
+        contains: substring match for text columns, membership for `enum`
+        startswith: prefix match for text columns
+        in: column value is one of the given list of values (a list is required)
+        exists: column is non-empty (value true) or empty (value false)
+    """
+    field: str
+    op: str = "eq"
+    value: Any = None
+
+
+def _normalize_default(raw: Any) -> Optional[str]:
+    """Flatten registry default values (plain strings or `{"summary": ...}` dicts) to a string."""
+    if raw is None:
+        return None
+    if isinstance(raw, dict):
+        raw = raw.get('summary', raw)
+    return raw if isinstance(raw, str) else str(raw)
+
+
+class PropEventTable:
+    """Columnar table of every prop and event across all registry components."""
+
+    def __init__(self):
+        self.component: List[str] = []
+        self.kind: List[str] = []
+        self.name: List[str] = []
+        self.type: List[str] = []
+        self.default: List[Optional[str]] = []
+        self.required: List[bool] = []
+        self.enum: List[tuple] = []
+        self.description: List[str] = []
+        # Lower-cased copies of the text columns, precomputed once for matching
+        self._folded: Dict[str, List[str]] = {}
+        self._index: Dict[str, Dict[str, List[int]]] = {column: {} for column in INDEXED_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.name)
+
+    def _append(self, component: str, kind: str, name: str, type_: str, default: Optional[str],
+                required: bool, enum: Iterable[Any], description: str):
+        row_id = len(self.name)
+        self.component.append(component)
+        self.kind.append(kind)
+        self.name.append(name)
+        self.type.append(type_)
+        self.default.append(default)
+        self.required.append(required)
+        self.enum.append(tuple(str(value) for value in enum))
+        self.description.append(description)
+        for column, value in (("component", component), ("kind", kind), ("name", name)):
+            self._index[column].setdefault(value.lower(), []).append(row_id)
+
+    def _finalize(self):
+        for column in ("component", "kind", "name", "type", "description"):
+            self._folded[column] = [value.lower() for value in getattr(self, column)]
+        self._folded["default"] = [(value or "").lower() for value in self.default]
+
+    def row(self, row_id: int, select: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Materialize a single row as a dict, projected onto `select` columns."""
+        columns = select or TABLE_COLUMNS
+        result = {}
+        for column in columns:
+            value = getattr(self, column)[row_id]
+            result[column] = list(value) if column == "enum" else value
+        return result
+
+    def _candidates(self, predicates: List[QueryPredicate]) -> Iterable[int]:
+        """Pick the narrowest candidate row set using the exact-match indexes."""
+        best: Optional[List[int]] = None
+        for predicate in predicates:
+            if predicate.op == "eq" and predicate.field in INDEXED_COLUMNS and isinstance(predicate.value, str):
+                rows = self._index[predicate.field].get(predicate.value.lower(), [])
+                if best is None or len(rows) < len(best):
+                    best = rows
+        return range(len(self)) if best is None else best
+
+    def _matcher(self, predicate: QueryPredicate):
+        """Compile a predicate into a `row_id -> bool` function over the columns."""
+        if predicate.field not in TABLE_COLUMNS:
+            raise ValueError(f"Unknown field '{predicate.field}'. Available fields: {list(TABLE_COLUMNS)}")
+        if predicate.op not in SUPPORTED_OPERATORS:
+            raise ValueError(f"Unknown operator '{predicate.op}'. Supported operators: {list(SUPPORTED_OPERATORS)}")
+
+        field, op, value = predicate.field, predicate.op, predicate.value
+        if op == "in" and not isinstance(value, (list, tuple, set, frozenset)):
+            # A string would otherwise match any of its characters
+            raise ValueError(f"Operator 'in' expects a list of values, got {type(value).__name__} {value!r}")
+        column = getattr(self, field)
+
+        if op == "exists":
+            expected = True if value is None else bool(value)
+            return lambda row_id: bool(column[row_id]) == expected
+
+        if field == "required":
+            if op in ("eq", "ne"):
+                expected = value if isinstance(value, bool) else str(value).lower() == "true"
+                return (lambda row_id: column[row_id] == expected) if op == "eq" else (lambda row_id: column[row_id] != expected)
+            raise ValueError(f"Operator '{op}' is not supported for field 'required'")
+
+        if field == "enum":
+            if op == "contains":
+                needle = str(value)
+                return lambda row_id: needle in column[row_id]
+            if op == "in":
+                wanted = {str(v) for v in value}
+                return lambda row_id: bool(wanted.intersection(column[row_id]))
+            raise ValueError(f"Operator '{op}' is not supported for field 'enum'")
+
+        folded = self._folded[field]
+        if op == "in":
+            wanted = {str(v).lower() for v in value}
+            return lambda row_id: folded[row_id] in wanted
+        needle = str(value).lower()
+        if op == "eq":
+            return lambda row_id: folded[row_id] == needle
+        if op == "ne":
+            return lambda row_id: folded[row_id] != needle
+        if op == "contains":
+            return lambda row_id: needle in folded[row_id]
+        return lambda row_id: folded[row_id].startswith(needle)
+
+    def select_rows(self, predicates: List[QueryPredicate]) -> List[int]:
+        """Return the ids of all rows matching every predicate (AND)."""
+        matchers = [self._matcher(predicate) for predicate in predicates]
+        return [row_id for row_id in self._candidates(predicates) if all(match(row_id) for match in matchers)]
+
+
+def build_prop_event_table(components: Dict[str, Any]) -> PropEventTable:
+    """Flatten the `components` section of the registry into a PropEventTable.
+
+    Args:
+        components: The `components` mapping from the component registry.
+
+    Returns:
+        A PropEventTable with one row per prop and per event.
+    """
+    table = PropEventTable()
+    for component_tag, component in components.items():
+        for prop_name, prop in (component.get('props') or {}).items():
+            table._append(
+                component_tag, "prop", prop_name,
+                prop.get('type', '') or '',
+                _normalize_default(prop.get('default')),
+                bool(prop.get('required', False)),
+                prop.get('enum') or (),
+                prop.get('description', '') or '',
+            )
+        for event_name, event in (component.get('events') or {}).items():
+            table._append(
+                component_tag, "event", event.get('name', event_name) or event_name,
+                event.get('parameterType', '') or '',
+                None,
+                False,
+                (),
+                event.get('description', '') or '',
+            )
+    table._finalize()
+    return table
+
+
+def query_prop_event_table(
+    table: PropEventTable,
+    where: Optional[List[QueryPredicate]] = None,
+    select: Optional[List[str]] = None,
+    component_has: Optional[List[List[QueryPredicate]]] = None,
+    limit: int = 100,
+) -> Dict[str, Any]:
+    """Run a structured query against the prop/event table.
+
+    Args:
+        table: The table built by `build_prop_event_table`.
+        where: Row predicates that are ANDed together.
+        select: Columns to project in each returned row (all columns if omitted).
+        component_has: Component-level conditions; each entry is a predicate group
+                       and a component qualifies only if some row matches every group.
+        limit: Maximum number of rows to return.
+
+    Returns:
+        A dict with the matching `rows`, the `total` match count, and the
+        `components` the rows belong to.
+    """
+    where = where or []
+    if select:
+        unknown = [column for column in select if column not in TABLE_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown select fields {unknown}. Available fields: {list(TABLE_COLUMNS)}")
+
+    allowed_components: Optional[set] = None
+    for group in component_has or []:
+        matched = {table.component[row_id] for row_id in table.select_rows(group)}
+        allowed_components = matched if allowed_components is None else allowed_components & matched
+
+    row_ids = table.select_rows(where)
+    if allowed_components is not None:
+        row_ids = [row_id for row_id in row_ids if table.component[row_id] in allowed_components]
+
+    components = list(dict.fromkeys(table.component[row_id] for row_id in row_ids))
+    return {
+        "total": len(row_ids),
+        "components": components,
+        "rows": [table.row(row_id, select) for row_id in row_ids[:max(limit, 0)]],
+    }
@@ -0,0 +1,110 @@
+"""
+Registry change feed for incremental client caches.
+
+Each registry snapshot is identified by its content hash. For every snapshot
+the server keeps a small map of per-entity hashes (components, examples,
+schemas, categories); diffing two of those maps tells a client exactly which
+entities were added, removed or modified since the version it has cached.
+The maps of recent snapshots are persisted locally so the diff still works
+after a server restart.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from vg_ui_lib_mcp.framework_transformer import expand_example
+
+
+ENTITY_KINDS = ("components", "examples", "schemas", "categories")
+
+DEFAULT_MAX_SNAPSHOTS = 20
+
+
+def _entity_hash(value: Any) -> str:
+    canonical = json.dumps(value, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def example_key(component_tag: str, example_id: str) -> str:
+    """Return the entity key used for an example (`<tag>::<example_id>`)."""
+    return f"{component_tag}::{example_id}"
+
+
+def split_example_key(key: str) -> Tuple[str, str]:
+    """Return the `(component_tag, example_id)` of an example entity key."""
+    component_tag, _, example_id = key.partition("::")
+    return component_tag, example_id
+
+
+def build_entity_hashes(registry: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """Hash every component, example, schema and category of a registry.
+
+    Component hashes exclude their examples, which are tracked as separate entities.
+    Examples are hashed in their full form (all sources, see `expand_example`), so a
+    registry and its compact or deduplicated form have the same hashes.
+    """
+    hashes: Dict[str, Dict[str, str]] = {kind: {} for kind in ENTITY_KINDS}
+    for component_tag, component in registry.get('components', {}).items():
+        hashes["components"][component_tag] = _entity_hash({k: v for k, v in component.items() if k != 'examples'})
+        for example in component.get('examples') or []:
+            hashes["examples"][example_key(component_tag, example.get('id', ''))] = _entity_hash(expand_example(example))
+    for schema_name, schema in registry.get('schemas', {}).items():
+        hashes["schemas"][schema_name] = _entity_hash(schema)
+    for category_name, category in registry.get('categories', {}).items():
+        hashes["categories"][category_name] = _entity_hash(category)
+    return hashes
+
+
+def diff_entity_hashes(old: Dict[str, Dict[str, str]], new: Dict[str, Dict[str, str]]) -> Dict[str, Dict[str, List[str]]]:
+    """Return the added, removed and modified entity keys per kind."""
+    changes = {}
+    for kind in ENTITY_KINDS:
+        before, after = old.get(kind, {}), new.get(kind, {})
+        changes[kind] = {
+            "added": [key for key in after if key not in before],
+            "removed": [key for key in before if key not in after],
+            "modified": [key for key, value in after.items() if key in before and before[key] != value],
+        }
+    return changes
+
+
+class RegistryHistory:
+    """Entity hash maps of recent registry snapshots, in memory and on disk."""
+
+    def __init__(self, directory: Optional[Path], max_snapshots: int = DEFAULT_MAX_SNAPSHOTS):
+        self.directory = directory
+        self.max_snapshots = max_snapshots
+        self._snapshots: Dict[str, Dict[str, Dict[str, str]]] = {}
+
+    def record(self, registry_hash: str, hashes: Dict[str, Dict[str, str]]):
+        """Remember the entity hashes of a snapshot and persist them (creating the directory on the first write)."""
+        self._snapshots[registry_hash] = hashes
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{registry_hash}.json"
+            if not path.exists():
+                path.write_text(json.dumps(dict(hashes)), encoding='utf-8')
+            else:
+                path.touch()
+            snapshots = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+            for stale in snapshots[self.max_snapshots:]:
+                stale.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def get(self, registry_hash: str) -> Optional[Dict[str, Dict[str, str]]]:
+        """Return the entity hashes of a snapshot, or None if it was never seen."""
+        if registry_hash in self._snapshots:
+            return self._snapshots[registry_hash]
+        if self.directory is None or not registry_hash or not all(c in "0123456789abcdef" for c in registry_hash):
+            return None
+        try:
+            hashes = json.loads((self.directory / f"{registry_hash}.json").read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        self._snapshots[registry_hash] = hashes
+        return hashes
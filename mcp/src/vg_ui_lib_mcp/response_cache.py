@@ -0,0 +1,94 @@
+"""
+Pre-serialized response cache for immutable tool results.
+
+For a given registry snapshot, tools like `list_components` or
+`get_component_by_tag(tag)` are pure functions of their arguments. This cache
+keeps the already-encoded JSON payload per `(tool, arguments)` key, together
+with the value it encodes (for the tool's structured content), so a repeat
+call is a dict lookup instead of rebuilding and re-encoding the result.
+Entries are evicted least-recently-used once the byte budget is exceeded,
+and the whole cache is dropped when the snapshot (registry content hash)
+changes.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional
+
+from vg_ui_lib_mcp import json_backend
+
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+class CachedResponse(NamedTuple):
+    """A cached tool result: its serialized JSON and the value it encodes (shared, never mutated)."""
+
+    payload: str
+    value: Any
+    size: int
+
+
+class ResponseCache:
+    """Byte-budgeted LRU of serialized tool responses for one registry snapshot."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, serializer: Callable[[Any], str] = json_backend.dumps):
+        self.max_bytes = max_bytes
+        self.serializer = serializer
+        self.snapshot: Optional[str] = None
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        """Drop every entry (e.g. when the registry is cleared or reloaded)."""
+        self._entries.clear()
+        self.total_bytes = 0
+        self.snapshot = None
+
+    def _check_snapshot(self, snapshot: str):
+        if snapshot != self.snapshot:
+            self.clear()
+            self.snapshot = snapshot
+
+    def get(self, snapshot: str, key: Hashable) -> Optional[CachedResponse]:
+        """Return the cached response for `key` in this snapshot, or None."""
+        self._check_snapshot(snapshot)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, snapshot: str, key: Hashable, value: Any) -> CachedResponse:
+        """Serialize `value`, cache it under `key` if it fits the budget, and return the response."""
+        payload = self.serializer(value)
+        self._check_snapshot(snapshot)
+        response = CachedResponse(payload, value, len(payload.encode('utf-8')))
+        if response.size > self.max_bytes:
+            return response
+
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.total_bytes -= previous.size
+        self._entries[key] = response
+        self.total_bytes += response.size
+        while self.total_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.total_bytes -= evicted.size
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, byte usage and hit/miss counters."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
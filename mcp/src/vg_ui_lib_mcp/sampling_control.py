@@ -0,0 +1,165 @@
+"""
+Admission control and request coalescing for LLM sampling.
+
+Sampling (`ctx.sample`) is the most expensive thing a tool can do: it costs
+client-side LLM tokens and can take minutes. `SamplingCoalescer` makes sure
+that
+
+- identical in-flight requests (same key, e.g. a hash of the prompt) share one
+  sampling run instead of starting their own,
+- at most `max_concurrent` runs sample at a time and at most `max_queued` more
+  wait for a slot, and at most `max_waiting` callers wait in total (identical
+  requests included); further requests are rejected with `SamplingQueueFull`
+  so the caller can fall back immediately,
+- every caller waits at most `timeout` seconds, and a run is cancelled as soon
+  as no caller is waiting for it anymore (all timed out or were cancelled).
+
+A shared run samples through one of its waiting callers (e.g. that caller's
+MCP session). If that caller stops waiting, the run moves to the next waiting
+caller that hasn't been tried, so one caller going away doesn't fail the
+others. If sampling through it fails (e.g. its client disconnected), the run
+is retried through another waiting caller at most `MAX_FAILURE_RETRIES` times,
+and then fails for every caller, so a failing LLM isn't asked once per
+waiting caller. The run applies its result itself, so concurrent callers
+never race to overwrite shared state.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_CONCURRENT = 1
+DEFAULT_MAX_QUEUED = 4
+DEFAULT_MAX_WAITING = 16
+DEFAULT_TIMEOUT = 120.0
+# Attempts after a failed sampling attempt of a run (attempts of callers that stopped waiting don't count)
+MAX_FAILURE_RETRIES = 1
+
+
+class SamplingQueueFull(Exception):
+    """Raised when a sampling request is refused because the queue is full."""
+
+
+class _Flight:
+    __slots__ = ("task", "callers", "sampler", "attempt", "sampler_left")
+
+    def __init__(self):
+        self.task: Optional[asyncio.Task] = None
+        # Callers waiting for the run, in arrival order
+        self.callers: List[Any] = []
+        # The caller the current attempt samples through, and that attempt
+        self.sampler: Any = None
+        self.attempt: Optional[asyncio.Task] = None
+        self.sampler_left = False
+
+
+class SamplingCoalescer:
+    """Coalesces identical sampling runs and bounds concurrent, queued and waiting ones."""
+
+    def __init__(self, max_concurrent: int = DEFAULT_MAX_CONCURRENT, max_queued: int = DEFAULT_MAX_QUEUED,
+                 timeout: float = DEFAULT_TIMEOUT, max_waiting: int = DEFAULT_MAX_WAITING):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queued = max(0, max_queued)
+        self.max_waiting = max(1, max_waiting)
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flights: Dict[str, _Flight] = {}
+        self.stats = {"started": 0, "coalesced": 0, "rejected": 0, "timed_out": 0, "cancelled": 0, "failed_over": 0}
+
+    @property
+    def in_flight(self) -> int:
+        """Sampling runs currently running or queued."""
+        return len(self._flights)
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently waiting for a sampling run."""
+        return sum(len(flight.callers) for flight in self._flights.values())
+
+    async def run(self, key: str, sample: Callable[[Any], Awaitable[T]], caller: Any) -> T:
+        """Run `sample(caller)` under admission control, or join the identical run already in flight.
+
+        Args:
+            key: Identity of the request; callers with the same key share one run.
+            sample: Starts the sampling run through the given caller (e.g. its Context) and applies its result.
+            caller: What this caller's attempts sample through, should the run fall to it.
+
+        Returns:
+            The result of the (possibly shared) run.
+
+        Raises:
+            SamplingQueueFull: If `max_waiting` callers already wait, or no run with this
+                key is in flight and the queue is full.
+            asyncio.TimeoutError: If the run didn't finish within `timeout` seconds.
+        """
+        flight = self._flights.get(key)
+        if self.waiting >= self.max_waiting:
+            self.stats["rejected"] += 1
+            raise SamplingQueueFull(f"{self.waiting} callers already wait for sampling (limit {self.max_waiting})")
+        if flight is None:
+            if len(self._flights) >= self.max_concurrent + self.max_queued:
+                self.stats["rejected"] += 1
+                raise SamplingQueueFull(
+                    f"{len(self._flights)} sampling runs already in flight (limit {self.max_concurrent} running, {self.max_queued} queued)")
+            flight = self._flights[key] = _Flight()
+            flight.callers.append(caller)
+            flight.task = asyncio.create_task(self._run_flight(flight, sample))
+            flight.task.add_done_callback(lambda task: self._finish_flight(key, flight))
+            self.stats["started"] += 1
+        else:
+            flight.callers.append(caller)
+            self.stats["coalesced"] += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(flight.task), self.timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            raise
+        finally:
+            flight.callers.remove(caller)
+            if not flight.task.done():
+                if not flight.callers:
+                    # Nobody waits for this run anymore: stop paying for it
+                    flight.task.cancel()
+                    self.stats["cancelled"] += 1
+                elif caller is flight.sampler and flight.attempt is not None and not flight.attempt.done():
+                    # Others still wait: move the run to one of them
+                    flight.sampler_left = True
+                    flight.attempt.cancel()
+
+    async def _run_flight(self, flight: _Flight, sample: Callable[[Any], Awaitable[Any]]) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        async with self._slots:
+            tried: List[Any] = []
+            error: Optional[Exception] = None
+            failures = 0
+            while True:
+                flight.sampler = next((caller for caller in flight.callers
+                                       if not any(caller is other for other in tried)), None)
+                if flight.sampler is None:
+                    raise error or RuntimeError("Every caller that could sample has stopped waiting")
+                if tried:
+                    self.stats["failed_over"] += 1
+                tried.append(flight.sampler)
+                flight.attempt = asyncio.ensure_future(sample(flight.sampler))
+                try:
+                    return await flight.attempt
+                except asyncio.CancelledError:
+                    if not flight.sampler_left:
+                        raise
+                    flight.sampler_left = False
+                except Exception as e:
+                    error = error or e
+                    failures += 1
+                    if failures > MAX_FAILURE_RETRIES:
+                        raise error
+
+    def _finish_flight(self, key: str, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Runs nobody awaits anymore must not log "exception was never retrieved"
+        if not flight.task.cancelled():
+            flight.task.exception()
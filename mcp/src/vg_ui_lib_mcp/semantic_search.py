@@ -0,0 +1,202 @@
+"""
+Offline semantic ranking for VG UI Library components.
+
+Each component is turned into one document (tag, category, description, prop
+and event docs, slot docs, example names) and embedded as a hashed TF-IDF
+vector over word unigrams and character n-grams. No model download or
+network access is needed: the vectors are built with NumPy at registry load
+and a query is ranked with a single matrix-vector product against the
+L2-normalized document matrix (cosine similarity).
+
+Character n-grams make the ranking tolerant to inflections and partial words
+("drop" ~ "dropdown"); a small table of UI synonyms maps queries such as
+"modal", "select" or "textbox" to the vocabulary the registry actually uses.
+Every synonym substitution is ranked as its own query variant and each
+component keeps its best score, so "modal" scores a dialog component as
+"dialog" would, instead of a vector diluted by every alternative.
+
+Hashed n-grams give every pair of documents some small overlap, so scores
+below `DEFAULT_MIN_SCORE` (e.g. "modal" against vg-card, about 0.06) are
+noise and are not returned: a query without a real match ranks nothing.
+
+NumPy is an optional dependency (`pip install vg-ui-lib-mcp-server[semantic]`);
+`build_semantic_index` returns None when it is not installed.
+"""
+
+import math
+import re
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+# Number of hashed feature dimensions (per document: 2 bytes * FEATURE_DIM)
+FEATURE_DIM = 1 << 12
+
+CHAR_NGRAM_SIZES = (3, 4)
+
+# Cosine similarity below which a match is treated as hash and n-gram noise
+DEFAULT_MIN_SCORE = 0.1
+
+# Query expansion for common UI vocabulary that never appears in the registry verbatim
+UI_SYNONYMS: Dict[str, List[str]] = {
+    "modal": ["dialog", "overlay", "popup"],
+    "dialog": ["modal", "overlay"],
+    "popup": ["dialog", "modal", "popover"],
+    "pill": ["tag", "chip", "badge"],
+    "chip": ["tag", "pill", "badge"],
+    "badge": ["tag", "pill", "chip"],
+    "select": ["dropdown", "options", "picker"],
+    "picker": ["dropdown", "select"],
+    "combobox": ["dropdown", "select"],
+    "textbox": ["input", "text", "field"],
+    "textfield": ["input", "text", "field"],
+    "field": ["input", "form"],
+    "form": ["input", "field"],
+    "panel": ["card", "container"],
+    "tile": ["card"],
+    "container": ["card", "panel"],
+    "theme": ["provider", "mode"],
+    "dark": ["theme", "mode"],
+    "light": ["theme", "mode"],
+    "cta": ["button", "action"],
+    "link": ["button", "action"],
+    "click": ["button", "action"],
+}
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> List[str]:
+    """Split text into lower-case words, breaking camelCase and kebab-case."""
+    return _WORD.findall(_CAMEL_BOUNDARY.sub(" ", text).lower())
+
+
+@lru_cache(maxsize=65536)
+def _word_buckets(word: str) -> tuple:
+    """Hash a word and its padded character n-grams into feature buckets."""
+    grams = [f"w:{word}"]
+    padded = f" {word} "
+    for size in CHAR_NGRAM_SIZES:
+        grams.extend(padded[i:i + size] for i in range(len(padded) - size + 1))
+    return tuple(zlib.crc32(gram.encode('utf-8')) % FEATURE_DIM for gram in grams)
+
+
+def _features(words: List[str]) -> Dict[int, float]:
+    """Count hashed word and character n-gram features of a word list."""
+    counts: Dict[int, float] = {}
+    for word in words:
+        for bucket in _word_buckets(word):
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+    return counts
+
+
+def query_variants(words: List[str]) -> List[List[str]]:
+    """The query words, then the words with one of them replaced by each of its UI synonyms."""
+    variants = [words]
+    for position, word in enumerate(words):
+        for synonym in UI_SYNONYMS.get(word, ()):
+            variants.append(words[:position] + [synonym] + words[position + 1:])
+    return variants
+
+
+def component_document(component_tag: str, component: Dict[str, Any]) -> str:
+    """Concatenate the searchable text of a component into one document."""
+    parts = [component_tag, component_tag.replace('vg-', '', 1), component.get('category', ''),
+             component.get('descriptions', '') or '']
+    for prop_name, prop in (component.get('props') or {}).items():
+        parts.append(prop_name)
+        parts.append(prop.get('description', '') or '')
+    for event_name, event in (component.get('events') or {}).items():
+        parts.append(event_name)
+        parts.append(event.get('description', '') or '')
+    for slot_name, slot in (component.get('slots') or {}).items():
+        parts.append(slot_name)
+        parts.append((slot or {}).get('description', '') or '')
+    for example in component.get('examples') or []:
+        parts.append(example.get('name', ''))
+    return "\n".join(part for part in parts if part)
+
+
+class SemanticIndex:
+    """Hashed TF-IDF vectors for all components, stored feature-major.
+
+    `matrix` has shape (FEATURE_DIM, n_components) and holds float16 values of
+    the L2-normalized document vectors. A query only touches the rows of its
+    own non-zero features, so ranking is one (k x n) gather plus a
+    matrix-vector product regardless of FEATURE_DIM.
+    """
+
+    def __init__(self, tags: List[str], matrix, idf):
+        self.tags = tags
+        self.matrix = matrix
+        self.idf = idf
+
+    def __len__(self) -> int:
+        return len(self.tags)
+
+    def _query_vector(self, words: List[str]):
+        """Return the (buckets, weights) of the normalized sparse query vector."""
+        features = _features(words)
+        buckets = np.fromiter(features.keys(), dtype=np.intp, count=len(features))
+        weights = 1.0 + np.log(np.fromiter(features.values(), dtype=np.float32, count=len(features)))
+        weights *= self.idf[buckets]
+        norm = float(np.linalg.norm(weights))
+        return buckets, (weights / norm if norm else weights)
+
+    def rank(self, query: str, limit: int = 10, min_score: float = DEFAULT_MIN_SCORE) -> List[tuple]:
+        """Return `(tag, score)` pairs ordered by cosine similarity to the query.
+
+        Components scoring below `min_score` are left out, so the result is empty
+        when nothing in the registry matches the query.
+        """
+        words = _words(query)
+        if not self.tags or not words:
+            return []
+        scores = None
+        for variant in query_variants(words):
+            buckets, weights = self._query_vector(variant)
+            variant_scores = weights @ self.matrix[buckets].astype(np.float32)
+            scores = variant_scores if scores is None else np.maximum(scores, variant_scores)
+        limit = min(max(limit, 0), len(self.tags))
+        if limit == 0:
+            return []
+        if limit < len(self.tags):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(self.tags))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self.tags[i], float(scores[i])) for i in top if scores[i] >= min_score and scores[i] > 0]
+
+
+def build_semantic_index(components: Dict[str, Any]) -> Optional[SemanticIndex]:
+    """Build the hashed TF-IDF matrix for all registry components.
+
+    Args:
+        components: The `components` mapping from the component registry.
+
+    Returns:
+        A SemanticIndex, or None when NumPy is not installed.
+    """
+    if np is None:
+        return None
+
+    tags = list(components.keys())
+    matrix = np.zeros((len(tags), FEATURE_DIM), dtype=np.float32)
+    for row, tag in enumerate(tags):
+        for bucket, count in _features(_words(component_document(tag, components[tag]))).items():
+            matrix[row, bucket] = 1.0 + math.log(count)
+
+    document_frequency = np.count_nonzero(matrix, axis=0).astype(np.float32)
+    idf = (np.log((1.0 + len(tags)) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+    matrix *= idf
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return SemanticIndex(tags, np.ascontiguousarray(matrix.T, dtype=np.float16), idf)
@@ -0,0 +1,393 @@
+"""
+Registry snapshot shared by the VG UI Library MCP server processes of one user.
+
+A developer machine often runs several copies of the server (one per IDE
+window or agent). With the shared registry mode enabled, the first process
+that loads a registry version publishes the decoded registry, and every
+derived index it uses, as files under `<cache dir>/shared/<registry hash>/`.
+Every process, the publisher included, then serves them from read-only
+memory maps of those files, so the page cache holds one copy for all of them.
+
+A section file is flat: the header, an index, then the entries. Dicts are
+split into their items down to a given depth (the registry down to single
+components, schemas and categories, a derived index down to its top-level
+items); each remaining value is an entry, pickled separately and located by
+its offset and length. `load` returns a `SnapshotMapping` that decodes an
+entry only when it is accessed and keeps the last few decoded ones per
+section, so a process holds the index plus the entries it is working with.
+Sections that are a single object (e.g. the search indexes) are decoded
+whole, once per process. Example sources deduplicated into a ContentStore
+keep working: the store's line blocks are written once per section as
+offset-addressed UTF-8 text, and PackedTexts read the blocks they use from
+the memory map.
+
+Each file starts with a header holding the snapshot format version and the
+registry content hash, so a file from another version is never used.
+Attached processes register a `refs/<pid>` marker; when the last live
+process detaches, the snapshot directory is removed. Snapshots left behind by
+processes that died without detaching are swept on the next attach.
+
+Any failure (no writable cache directory, no `fcntl` on this platform, a
+corrupt or foreign file) simply makes the caller fall back to a private load.
+"""
+
+import io
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from vg_ui_lib_mcp.content_store import ContentStore
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+
+# Bump whenever the header layout, the index or the entry encoding change
+SNAPSHOT_FORMAT_VERSION = 2
+REGISTRY_SECTION = "registry"
+# Registry -> its sections (components, schemas, ...) -> one entry per component, schema, ...
+REGISTRY_DEPTH = 2
+# Decoded entries kept per section
+DECODED_ENTRIES_PER_SECTION = 128
+
+_MAGIC = b"VGSNAP"
+_HEADER = struct.Struct(">6sHH")
+_INDEX_LENGTH = struct.Struct(">Q")
+_BLOCK_OFFSETS = struct.Struct("<2Q")
+_LOCK_FILE = ".lock"
+_REFS_DIR = "refs"
+# Persistent id of the ContentStore that PackedTexts of a section point to
+_CONTENT_STORE_ID = "content_store"
+
+
+class SnapshotBlocks(Sequence):
+    """Line blocks of a ContentStore, read from a memory-mapped section on access."""
+
+    __slots__ = ("_mapped", "_table", "_text", "_count")
+
+    def __init__(self, mapped: mmap.mmap, table: int, count: int):
+        self._mapped = mapped
+        self._table = table
+        self._text = table + 8 * (count + 1)
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("block index out of range")
+        start, end = _BLOCK_OFFSETS.unpack_from(self._mapped, self._table + 8 * index)
+        return self._mapped[self._text + start:self._text + end].decode("utf-8", "surrogatepass")
+
+    def __reduce__(self):
+        # Pickles (e.g. with a PackedText of the shared registry) as a plain list
+        return list, (list(self),)
+
+
+class _EntryPickler(pickle.Pickler):
+    """Pickles an entry, referencing the ContentStore of its PackedTexts instead of copying it."""
+
+    def __init__(self, file: io.BytesIO):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.store: Optional[ContentStore] = None
+
+    def persistent_id(self, obj: Any) -> Optional[str]:
+        if not isinstance(obj, ContentStore):
+            return None
+        if self.store is not None and obj is not self.store:
+            raise pickle.PicklingError("a section can only reference one content store")
+        self.store = obj
+        return _CONTENT_STORE_ID
+
+
+class _EntryUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, store: Optional[ContentStore]):
+        super().__init__(file)
+        self.store = store
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid != _CONTENT_STORE_ID or self.store is None:
+            raise pickle.UnpicklingError(f"unknown persistent id {pid!r}")
+        return self.store
+
+
+class _Section:
+    """A memory-mapped section file: its index, its content store and the entries decoded lately."""
+
+    def __init__(self, mapped: mmap.mmap, data_start: int, index: Dict[str, Any]):
+        self.mapped = mapped
+        self.data_start = data_start
+        self.nodes: Dict[Tuple, Tuple] = index["nodes"]
+        self.leaves: Dict[Tuple, Tuple[int, int]] = index["leaves"]
+        blocks = index["blocks"]
+        self.store = ContentStore(SnapshotBlocks(mapped, data_start + blocks[0], blocks[1])) if blocks else None
+        self._decoded: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def value(self, path: Tuple) -> Any:
+        """The value at a path: a SnapshotMapping for a split dict, else the decoded entry."""
+        if path in self.nodes:
+            return SnapshotMapping(self, path)
+        return self.decode(path)
+
+    def decode(self, path: Tuple) -> Any:
+        with self._lock:
+            if path in self._decoded:
+                self._decoded.move_to_end(path)
+                return self._decoded[path]
+        offset, length = self.leaves[path]
+        start = self.data_start + offset
+        value = _EntryUnpickler(io.BytesIO(self.mapped[start:start + length]), self.store).load()
+        with self._lock:
+            self._decoded[path] = value
+            while len(self._decoded) > DECODED_ENTRIES_PER_SECTION:
+                self._decoded.popitem(last=False)
+        return value
+
+
+class SnapshotMapping(Mapping):
+    """A dict published to a shared snapshot, whose values are decoded from the memory map on access."""
+
+    __slots__ = ("_section", "_path")
+
+    def __init__(self, section: _Section, path: Tuple):
+        self._section = section
+        self._path = path
+
+    def __getitem__(self, key: Any) -> Any:
+        try:
+            return self._section.value(self._path + (key,))
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key: Any) -> bool:
+        path = self._path + (key,)
+        try:
+            return path in self._section.leaves or path in self._section.nodes
+        except TypeError:
+            return False
+
+    def __iter__(self) -> Iterator:
+        return iter(self._section.nodes[self._path])
+
+    def __len__(self) -> int:
+        return len(self._section.nodes[self._path])
+
+    def __reduce__(self):
+        # Pickles (e.g. into an index built from the shared registry) as a plain dict
+        return dict, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"SnapshotMapping({len(self)} keys)"
+
+
+def _flatten(value: Any, depth: int, path: Tuple, nodes: Dict[Tuple, Tuple], leaves: List[Tuple[Tuple, Any]]):
+    """Split dicts into their items down to `depth`, collecting the index nodes and the entries."""
+    if depth > 0 and type(value) is dict:
+        nodes[path] = tuple(value)
+        for key, item in value.items():
+            _flatten(item, depth - 1, path + (key,), nodes, leaves)
+    else:
+        leaves.append((path, value))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SharedSnapshot:
+    """One registry version's shared sections, attached by this process."""
+
+    def __init__(self, directory: Path, registry_hash: str):
+        """
+        Args:
+            directory: The shared snapshots directory (one sub-directory per registry hash).
+            registry_hash: Content hash of the registry this process loaded.
+        """
+        self.directory = directory
+        self.registry_hash = registry_hash
+        self.path = directory / registry_hash
+        self.attached = False
+        self._sections: Dict[str, _Section] = {}
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Serialize attach/detach/publish across processes."""
+        with open(self.directory / _LOCK_FILE, "a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _live_refs(self, snapshot_dir: Path) -> int:
+        """Count live processes attached to a snapshot, dropping markers of dead ones."""
+        live = 0
+        for ref in (snapshot_dir / _REFS_DIR).glob("*"):
+            if ref.name.isdigit() and _pid_alive(int(ref.name)):
+                live += 1
+            else:
+                ref.unlink(missing_ok=True)
+        return live
+
+    def attach(self) -> bool:
+        """Register this process as a user of the snapshot.
+
+        Returns:
+            True if the shared snapshot can be used, False to fall back to a private load.
+        """
+        if self.attached:
+            return True
+        if fcntl is None or self.directory is None:
+            return False
+        try:
+            with self._locked():
+                # Sweep snapshots whose processes all exited without detaching
+                for other in self.directory.iterdir():
+                    if other.is_dir() and other != self.path and self._live_refs(other) == 0:
+                        shutil.rmtree(other, ignore_errors=True)
+                refs = self.path / _REFS_DIR
+                refs.mkdir(parents=True, exist_ok=True)
+                (refs / str(os.getpid())).touch()
+            self.attached = True
+        except OSError:
+            return False
+        return True
+
+    def detach(self):
+        """Unregister this process and remove the snapshot if no other process uses it."""
+        if not self.attached:
+            return
+        self.attached = False
+        try:
+            with self._locked():
+                (self.path / _REFS_DIR / str(os.getpid())).unlink(missing_ok=True)
+                if self._live_refs(self.path) == 0:
+                    shutil.rmtree(self.path, ignore_errors=True)
+        except OSError:
+            pass
+
+    def load(self, name: str) -> Any:
+        """Map one section read-only, or return None if absent or invalid.
+
+        Returns:
+            A SnapshotMapping for a dict published with depth > 0, else the decoded value.
+        """
+        if not self.attached:
+            return None
+        section = self._sections.get(name)
+        if section is None:
+            try:
+                with open(self.path / f"{name}.snap", "rb") as snapshot_file:
+                    mapped = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+                magic, version, hash_length = _HEADER.unpack_from(mapped, 0)
+                offset = _HEADER.size + hash_length
+                if (magic != _MAGIC or version != SNAPSHOT_FORMAT_VERSION
+                        or mapped[_HEADER.size:offset].decode('ascii') != self.registry_hash):
+                    mapped.close()
+                    return None
+                (index_length,) = _INDEX_LENGTH.unpack_from(mapped, offset)
+                index_start = offset + _INDEX_LENGTH.size
+                index = pickle.loads(mapped[index_start:index_start + index_length])
+                section = self._sections.setdefault(name, _Section(mapped, index_start + index_length, index))
+            except Exception:
+                return None
+        try:
+            return section.value(())
+        except Exception:
+            return None
+
+    def content_store(self, name: str) -> Optional[ContentStore]:
+        """The content store of a loaded section's packed example sources, if it has any."""
+        section = self._sections.get(name)
+        return section.store if section else None
+
+    def publish(self, name: str, value: Any, depth: int = 1) -> bool:
+        """Write one section for every process (atomically; first writer wins).
+
+        Args:
+            name: Section name.
+            value: The value to share.
+            depth: Levels of dicts split into separately decoded entries (0 for a single entry).
+
+        Returns:
+            True if the section is available to load.
+        """
+        if not self.attached:
+            return False
+        target = self.path / f"{name}.snap"
+        if target.exists():
+            return True
+        try:
+            nodes: Dict[Tuple, Tuple] = {}
+            entries: List[Tuple[Tuple, Any]] = []
+            _flatten(value, depth, (), nodes, entries)
+            body = io.BytesIO()
+            leaves: Dict[Tuple, Tuple[int, int]] = {}
+            store = None
+            for path, entry in entries:
+                offset = body.tell()
+                pickler = _EntryPickler(body)
+                pickler.store = store
+                pickler.dump(entry)
+                store = pickler.store
+                leaves[path] = (offset, body.tell() - offset)
+            blocks = None
+            if store is not None:
+                encoded = [block.encode("utf-8", "surrogatepass") for block in store.blocks]
+                ends = [0]
+                for block in encoded:
+                    ends.append(ends[-1] + len(block))
+                blocks = (body.tell(), len(encoded))
+                body.write(struct.pack(f"<{len(ends)}Q", *ends))
+                body.write(b"".join(encoded))
+            index = pickle.dumps({"nodes": nodes, "leaves": leaves, "blocks": blocks}, protocol=pickle.HIGHEST_PROTOCOL)
+            hash_bytes = self.registry_hash.encode('ascii')
+            temporary = self.path / f".{name}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as snapshot_file:
+                snapshot_file.write(_HEADER.pack(_MAGIC, SNAPSHOT_FORMAT_VERSION, len(hash_bytes)))
+                snapshot_file.write(hash_bytes)
+                snapshot_file.write(_INDEX_LENGTH.pack(len(index)))
+                snapshot_file.write(index)
+                snapshot_file.write(body.getbuffer())
+            os.replace(temporary, target)
+        except Exception:
+            return False
+        return True
+
+
+def attach_shared_snapshot(directory: Optional[Path], registry_hash: str) -> Optional[SharedSnapshot]:
+    """Attach to the shared snapshot of a registry version.
+
+    Args:
+        directory: The shared snapshots directory, or None if no cache directory is available.
+        registry_hash: Content hash of the registry this process loaded.
+
+    Returns:
+        The attached SharedSnapshot, or None when shared mode is unavailable.
+    """
+    if directory is None:
+        return None
+    snapshot = SharedSnapshot(directory, registry_hash)
+    return snapshot if snapshot.attach() else None
@@ -0,0 +1,190 @@
+"""
+Thin stdio entry point that forwards MCP traffic to the local server daemon.
+
+IDEs launch `vg-ui-lib-mcp-shim` exactly like `vg-ui-lib-mcp-server`. Instead
+of importing FastMCP and loading the registry, the shim connects to the warm
+daemon (`vg-ui-lib-mcp-server --daemon`) over a Unix domain socket, starting
+it on demand, and copies newline-delimited JSON-RPC bytes in both directions.
+Only the standard library is imported, so a new session costs an interpreter
+start plus a socket connect.
+
+One daemon runs per server configuration, each on its own socket, so
+sessions with different settings never share state. The shim forwards every
+server option to the daemon it starts, and the socket is named after a hash
+of those options and of the `FASTMCP_*` environment variables.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from vg_ui_lib_mcp.local_storage import cache_dir
+
+
+# How long the shim waits for a daemon it started to accept connections
+DAEMON_START_TIMEOUT: float = float(os.environ.get('FASTMCP_DAEMON_START_TIMEOUT') or 30)
+_CHUNK_SIZE = 64 * 1024
+# Environment variables that locate or start the daemon rather than configure it, or that
+# canonical_server_args() already folds into the options
+_NON_CONFIG_ENV = {'FASTMCP_DAEMON_SOCKET', 'FASTMCP_DAEMON_START_TIMEOUT', 'FASTMCP_USE_FRAMEWORK', 'FASTMCP_SHARED_REGISTRY'}
+
+
+def _argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Stdio shim forwarding to the VG UI Library MCP server daemon. "
+                    "Other options are passed to the daemon (see vg-ui-lib-mcp-server --help).")
+    parser.add_argument("--use-framework", type=str, default=os.environ.get('FASTMCP_USE_FRAMEWORK') or None,
+                        choices=["html", "react", "react19", "vue", "angular", "lit"],
+                        help="Framework filter of the daemon to connect to")
+    parser.add_argument("--shared-registry", action="store_true",
+                        default=(os.environ.get('FASTMCP_SHARED_REGISTRY') or '').lower() in ('1', 'true', 'yes'),
+                        help="Connect to a daemon that shares its registry snapshot with other processes")
+    return parser
+
+
+def canonical_server_args(argv: Sequence[str]) -> List[str]:
+    """Server options of a command line, in canonical form.
+
+    The framework filter and shared registry mode (given as options or through
+    the environment) come first, then every other option verbatim.
+    """
+    args, other = _argument_parser().parse_known_args(list(argv))
+    canonical = []
+    if args.use_framework:
+        canonical.extend(["--use-framework", args.use_framework])
+    if args.shared_registry:
+        canonical.append("--shared-registry")
+    return canonical + other
+
+
+def config_hash(options: Sequence[str]) -> str:
+    """Hash of a daemon configuration: its server options and the `FASTMCP_*` environment."""
+    environment = {key: value for key, value in os.environ.items()
+                   if key.startswith('FASTMCP_') and key not in _NON_CONFIG_ENV}
+    config = json.dumps({"options": list(options), "environment": environment}, sort_keys=True)
+    return hashlib.sha256(config.encode('utf-8')).hexdigest()[:16]
+
+
+def default_socket_path(options: Sequence[str] = ()) -> Optional[Path]:
+    """Return the daemon socket path for a server configuration.
+
+    Args:
+        options: The server options in canonical form (see `canonical_server_args`).
+
+    `FASTMCP_DAEMON_SOCKET` overrides the path; otherwise it lives in the local
+    cache directory and is named after the hash of the configuration.
+    """
+    override = os.environ.get('FASTMCP_DAEMON_SOCKET')
+    if override:
+        return Path(override)
+    directory = cache_dir("daemon")
+    if directory is None:
+        return None
+    return directory / f"server-{config_hash(options)}.sock"
+
+
+def _connect(socket_path: Path) -> Optional[socket.socket]:
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError:
+        client.close()
+        return None
+    return client
+
+
+def connect_to_daemon(socket_path: Path, options: Sequence[str]) -> socket.socket:
+    """Connect to the daemon, starting it in the background with `options` if it isn't running.
+
+    Raises:
+        ConnectionError: If the daemon doesn't accept connections within DAEMON_START_TIMEOUT.
+    """
+    client = _connect(socket_path)
+    if client is not None:
+        return client
+
+    log_directory = cache_dir("daemon")
+    log_path = log_directory / "daemon.log" if log_directory else Path(os.devnull)
+    with open(log_path, "ab") as log_file:
+        subprocess.Popen(
+            [sys.executable, "-m", "vg_ui_lib_mcp.main", "--daemon", *options, "--socket", str(socket_path)],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            start_new_session=True,
+        )
+
+    deadline = time.monotonic() + DAEMON_START_TIMEOUT
+    delay = 0.01
+    while time.monotonic() < deadline:
+        client = _connect(socket_path)
+        if client is not None:
+            return client
+        time.sleep(delay)
+        delay = min(delay * 2, 0.2)
+    raise ConnectionError(f"VG UI Library MCP daemon did not start listening on {socket_path} within {DAEMON_START_TIMEOUT}s (see {log_path})")
+
+
+def _pump_stdin(client: socket.socket):
+    """Copy stdin to the daemon, half-closing the socket at EOF."""
+    stdin = sys.stdin.buffer
+    try:
+        while True:
+            chunk = stdin.read1(_CHUNK_SIZE)
+            if not chunk:
+                break
+            client.sendall(chunk)
+    except OSError:
+        pass
+    finally:
+        try:
+            client.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass
+
+
+def forward(client: socket.socket):
+    """Forward stdin to the daemon and the daemon's replies to stdout until either side closes."""
+    threading.Thread(target=_pump_stdin, args=(client,), daemon=True).start()
+    stdout = sys.stdout.buffer
+    try:
+        while True:
+            chunk = client.recv(_CHUNK_SIZE)
+            if not chunk:
+                break
+            stdout.write(chunk)
+            stdout.flush()
+    except (OSError, BrokenPipeError):
+        pass
+    finally:
+        client.close()
+
+
+def main():
+    """Entry point of `vg-ui-lib-mcp-shim`."""
+    options = canonical_server_args(sys.argv[1:])
+    socket_path = default_socket_path(options)
+    if socket_path is None or not hasattr(socket, "AF_UNIX"):
+        # No usable socket location: run the server in-process instead (it parses the same options)
+        from vg_ui_lib_mcp.main import run
+        run()
+        return
+
+    try:
+        client = connect_to_daemon(socket_path, options)
+    except ConnectionError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        sys.exit(1)
+    forward(client)
+
+
+if __name__ == "__main__":
+    main()
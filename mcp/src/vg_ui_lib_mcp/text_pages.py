@@ -0,0 +1,98 @@
+"""
+Paged delivery of large text results.
+
+MCP tool results are delivered in one message, so a multi-kilobyte answer
+(the all-frameworks `InitialProjectSetup` instructions, the raw CSS returned
+when categorization isn't possible) costs its full size even when the client
+only needs the beginning. `TextPager` splits such texts at line boundaries
+into pages of at most `page_chars` characters, returns the first page with a
+continuation cursor, and keeps the remaining pages in a byte-budgeted LRU so
+`get_text_page(cursor)` can serve them without recomputing the result.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+
+DEFAULT_PAGE_CHARS = 4000
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024
+
+
+def split_pages(text: str, page_chars: int) -> List[str]:
+    """Split a text at line boundaries into pages of at most `page_chars` characters (longer lines are cut)."""
+    pages: List[str] = []
+    current = ""
+    for line in text.splitlines(keepends=True):
+        if len(current) + len(line) <= page_chars:
+            current += line
+            continue
+        if current and len(line) <= page_chars:
+            pages.append(current)
+            current = line
+            continue
+        # A line longer than a page: cut it, filling the current page first
+        while len(current) + len(line) > page_chars:
+            cut = page_chars - len(current)
+            pages.append(current + line[:cut])
+            current, line = "", line[cut:]
+        current = line
+    if current or not pages:
+        pages.append(current)
+    return pages
+
+
+def parse_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    """Return `(text_id, page_index)` of a cursor, or None if it is malformed."""
+    text_id, _, page = cursor.partition(":")
+    if not text_id or not page.isdigit():
+        return None
+    return text_id, int(page)
+
+
+class TextPager:
+    """Pages of recently delivered large texts, kept in a byte-budgeted LRU."""
+
+    def __init__(self, page_chars: int = DEFAULT_PAGE_CHARS, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.page_chars = max(1, page_chars)
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._texts: "OrderedDict[str, Tuple[List[str], int]]" = OrderedDict()
+
+    def _page_with_footer(self, pages: List[str], text_id: str, index: int) -> str:
+        page = pages[index]
+        if index + 1 < len(pages):
+            return (f"{page}\n\n---\n[Part {index + 1} of {len(pages)}. Call `get_text_page` with "
+                    f"cursor \"{text_id}:{index + 1}\" for the next part.]")
+        return f"{page}\n\n---\n[Part {index + 1} of {len(pages)}, end of text.]" if index else page
+
+    def first_page(self, text: str) -> str:
+        """Return the text itself if it fits one page, otherwise its first page with a continuation cursor."""
+        if len(text) <= self.page_chars:
+            return text
+        text_id = hashlib.sha256(text.encode('utf-8')).hexdigest()[:16]
+        entry = self._texts.get(text_id)
+        if entry is None:
+            pages = split_pages(text, self.page_chars)
+            size = len(text.encode('utf-8'))
+            self._texts[text_id] = (pages, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._texts) > 1:
+                _, (_, evicted_size) = self._texts.popitem(last=False)
+                self.total_bytes -= evicted_size
+        else:
+            pages = entry[0]
+            self._texts.move_to_end(text_id)
+        return self._page_with_footer(pages, text_id, 0)
+
+    def page(self, cursor: str) -> Optional[str]:
+        """Return the page a cursor points to (with the next cursor), or None if it is unknown or expired."""
+        parsed = parse_cursor(cursor)
+        if parsed is None or parsed[0] not in self._texts:
+            return None
+        text_id, index = parsed
+        pages = self._texts[text_id][0]
+        if index >= len(pages):
+            return None
+        self._texts.move_to_end(text_id)
+        return self._page_with_footer(pages, text_id, index)
@@ -0,0 +1,181 @@
+"""
+Lightweight span tracing of tool calls, exported to a local JSONL file.
+
+Every tool call is a trace: a root span for the call, with child spans for
+the phases inside it (registry readiness wait, index lookup, schema
+resolution, framework filtering, serialization, sampling). Spans nest
+through a context variable, so they follow the request across awaits.
+
+Finished spans are written, one trace per line, in the OTLP/JSON format
+(`{"resourceSpans": [...]}`, as produced by the OpenTelemetry Collector file
+exporter), so the file can be imported by OpenTelemetry-compatible tools,
+e.g. the collector's `otlpjsonfile` receiver. Nothing is sent over the
+network. The file is rotated to `<name>.1` once it exceeds `max_bytes`.
+
+When tracing is disabled `Tracer.span` returns a shared no-op span, so
+instrumented code costs one attribute check and a no-op `with` block.
+"""
+
+import json
+import random
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+TRACE_FILE = "traces.jsonl"
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+SERVICE_NAME = "vg-ui-lib-mcp"
+# A trace's buffered spans are written when its root span ends; every trace is written once this many spans are pending
+MAX_PENDING_SPANS = 512
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_CODE_ERROR = 2
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("vg_current_span", default=None)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    """A timed operation, the child of the span active when it was entered."""
+
+    __slots__ = ("tracer", "name", "kind", "attributes", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "error", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: int, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach an attribute (str, bool, int or float) to the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        parent = _current_span.get()
+        self.parent_id = parent.span_id if parent else None
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self._token = _current_span.set(self)
+        self.start_ns = time.time_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        self.end_ns = time.time_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer._finish(self)
+        return False
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span in OTLP/JSON form."""
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [{"key": key, "value": _attribute_value(value)} for key, value in self.attributes.items()],
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        if self.error:
+            span["status"] = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+class Tracer:
+    """Creates spans and appends finished traces to a local OTLP/JSON lines file."""
+
+    def __init__(self, path: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.exported = 0
+        self.path: Optional[Path] = None
+        # Finished spans by trace id, so concurrent tool calls are exported as separate traces
+        self._pending: Dict[str, List[Span]] = {}
+        self._pending_count = 0
+        self.configure(path)
+
+    def configure(self, path: Optional[Path]):
+        """Export to `path` (None disables tracing)."""
+        self.flush()
+        self.path = path
+        self.enabled = path is not None
+
+    def span(self, name: str, server: bool = False, **attributes: Any):
+        """Context manager timing a span; a shared no-op span when tracing is disabled.
+
+        Args:
+            name: Span name, e.g. `index.lookup`.
+            server: Whether this span handles a request from a client (root spans of tool calls).
+            **attributes: Initial span attributes.
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, SPAN_KIND_SERVER if server else SPAN_KIND_INTERNAL, attributes)
+
+    def _finish(self, span: Span):
+        self._pending.setdefault(span.trace_id, []).append(span)
+        self._pending_count += 1
+        if span.parent_id is None:
+            spans = self._pending.pop(span.trace_id)
+            self._pending_count -= len(spans)
+            self._write(spans)
+        elif self._pending_count >= MAX_PENDING_SPANS:
+            self.flush()
+
+    def flush(self):
+        """Write the pending spans, one OTLP/JSON line per trace."""
+        pending, self._pending, self._pending_count = self._pending, {}, 0
+        for spans in pending.values():
+            self._write(spans)
+
+    def _write(self, spans: List[Span]):
+        if self.path is None:
+            return
+        line = json.dumps({"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+        }]}, separators=(',', ':'))
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.path.exists() and self.path.stat().st_size > self.max_bytes:
+                self.path.replace(self.path.with_name(self.path.name + ".1"))
+            with open(self.path, "a", encoding="utf-8") as trace_file:
+                trace_file.write(line + "\n")
+            self.exported += len(spans)
+        except OSError:
+            pass
@@ -0,0 +1,29 @@
+import json
+import os
+import tempfile
+from importlib import resources
+
+import pytest
+
+
+def pytest_configure(config):
+    # Keep what the server persists (registry history, usage statistics, ...) out of the user's cache
+    os.environ["FASTMCP_CACHE_DIR"] = tempfile.mkdtemp(prefix="vg-ui-lib-mcp-tests-")
+
+
+@pytest.fixture(scope="session")
+def registry_json():
+    """The registry shipped with the package, as raw JSON bytes."""
+    return resources.files("vg_ui_lib_mcp.data").joinpath("component-registry.json").read_bytes()
+
+
+@pytest.fixture
+def registry(registry_json):
+    """A freshly decoded copy of the shipped registry (tests may modify it)."""
+    return json.loads(registry_json)
+
+
+@pytest.fixture(scope="session")
+def shared_registry(registry_json):
+    """One decoded copy of the shipped registry shared by the session's tests (read-only)."""
+    return json.loads(registry_json)
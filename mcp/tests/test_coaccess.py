@@ -0,0 +1,74 @@
+from vg_ui_lib_mcp import coaccess
+from vg_ui_lib_mcp.coaccess import STATS_FILE, CoAccessStats, access_key
+
+
+def test_statistics_create_their_directory_on_the_first_save(tmp_path):
+    directory = tmp_path / "cache" / "usage"
+    stats = CoAccessStats(directory)
+    stats.save()
+    assert not directory.exists()
+    stats.record("session", "get_component_by_tag", {"component_tag": "vg-button"})
+    stats.save()
+    assert (directory / STATS_FILE).is_file()
+
+
+def test_calls_within_the_window_count_as_followups():
+    stats = CoAccessStats(None, window=2)
+    for tag in ("vg-button", "vg-card", "vg-input", "vg-dropdown", "vg-button"):
+        stats.record("session", "get_component_by_tag", {"component_tag": tag})
+    stats.record("other", "get_schema_definition", {"schema_name": "ButtonVariant"})
+
+    def key(tag):
+        return access_key("get_component_by_tag", {"component_tag": tag})
+
+    assert stats.accesses[key("vg-button")] == 2
+    assert set(stats.followups[key("vg-button")]) == {key("vg-card"), key("vg-input")}
+    assert set(stats.followups[key("vg-input")]) == {key("vg-dropdown"), key("vg-button")}
+    assert access_key("get_schema_definition", {"schema_name": "ButtonVariant"}) not in stats.followups[key("vg-dropdown")]
+
+
+def test_likely_followups_need_enough_observations_and_probability():
+    stats = CoAccessStats(None)
+    for session in range(10):
+        stats.record(str(session), "get_component_by_tag", {"component_tag": "vg-button"})
+        stats.record(str(session), "get_schema_definition", {"schema_name": "ButtonVariant"})
+        if session < 3:
+            stats.record(str(session), "get_schema_definition", {"schema_name": "ButtonSize"})
+        if session < 1:
+            stats.record(str(session), "get_schema_definition", {"schema_name": "ButtonNativeType"})
+
+    followups = stats.likely_followups("get_component_by_tag", {"component_tag": "vg-button"})
+    assert followups == [
+        ("get_schema_definition", {"schema_name": "ButtonVariant"}, 1.0),
+        ("get_schema_definition", {"schema_name": "ButtonSize"}, 0.3),
+    ]
+    assert stats.likely_followups("get_component_by_tag", {"component_tag": "vg-button"}, min_probability=0.5) == followups[:1]
+    assert stats.likely_followups("get_component_by_tag", {"component_tag": "vg-card"}) == []
+
+
+def test_followups_per_key_are_capped_dropping_the_rarest(monkeypatch):
+    monkeypatch.setattr(coaccess, "MAX_FOLLOWUPS_PER_KEY", 2)
+    stats = CoAccessStats(None)
+    for session, schemas in enumerate([["A", "B"], ["A", "B"], ["A", "C"]]):
+        stats.record(str(session), "get_component_by_tag", {"component_tag": "vg-button"})
+        for schema in schemas:
+            stats.record(str(session), "get_schema_definition", {"schema_name": schema})
+    follows = stats.followups[access_key("get_component_by_tag", {"component_tag": "vg-button"})]
+    assert follows == {access_key("get_schema_definition", {"schema_name": "A"}): 3,
+                       access_key("get_schema_definition", {"schema_name": "B"}): 2}
+
+
+def test_statistics_persist_across_instances(tmp_path):
+    stats = CoAccessStats(tmp_path)
+    for session in range(2):
+        stats.record(str(session), "get_component_by_tag", {"component_tag": "vg-button"})
+        stats.record(str(session), "get_schema_definition", {"schema_name": "ButtonVariant"})
+    stats.save()
+
+    restored = CoAccessStats(tmp_path)
+    assert restored.accesses == stats.accesses and restored.followups == stats.followups
+    assert restored.likely_followups("get_component_by_tag", {"component_tag": "vg-button"}) == [
+        ("get_schema_definition", {"schema_name": "ButtonVariant"}, 1.0)]
+
+    (tmp_path / STATS_FILE).write_text("not json", encoding="utf-8")
+    assert CoAccessStats(tmp_path).accesses == {}
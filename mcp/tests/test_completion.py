@@ -0,0 +1,56 @@
+import pytest
+
+from vg_ui_lib_mcp.completion import COMPLETION_KINDS, build_completion_index
+
+
+REGISTRY = {
+    "components": {
+        "vg-input": {"props": {"value": {}, "helperText": {}, "disabled": {}}, "events": {"vg-change": {}}},
+        "vg-dropdown": {"props": {"disabled": {}, "Value": {}}, "slots": {"trigger": {}}},
+        "vg-drawer": {},
+    },
+    "schemas": {"DropdownOption": {}},
+    "predefined_css_definitions": ":root{--vg-color-primary:#00f;--vg-color-text:#111;--vg-gap:4px}",
+}
+
+
+@pytest.fixture(scope="module")
+def index():
+    return build_completion_index(REGISTRY)
+
+
+def names(result):
+    return [completion["name"] for completion in result["completions"]]
+
+
+def test_prefixes_complete_case_insensitively_in_order(index):
+    assert names(index.complete("VG-DR", "tag")) == ["vg-drawer", "vg-dropdown"]
+    assert names(index.complete("--vg-color-", "css_variable")) == ["--vg-color-primary", "--vg-color-text"]
+    assert names(index.complete("drop", "schema")) == ["DropdownOption"]
+    assert names(index.complete("val", "prop")) == ["Value", "value"]
+
+
+def test_member_completions_list_their_components(index):
+    result = index.complete("dis", "prop")
+    assert result == {"total": 1, "completions": [{"name": "disabled", "components": ["vg-dropdown", "vg-input"]}]}
+
+
+def test_completions_can_be_scoped_to_a_component(index):
+    assert index.complete("", "prop", component_tag="vg-input") == {
+        "total": 3, "completions": [{"name": "disabled"}, {"name": "helperText"}, {"name": "value"}]}
+    assert index.complete("", "slot", component_tag="vg-drawer") == {"total": 0, "completions": []}
+    assert index.complete("", "slot", component_tag="vg-nope") is None
+    assert names(index.complete("vg-d", "tag", component_tag="vg-input")) == ["vg-drawer", "vg-dropdown"]
+
+
+def test_limit_keeps_the_total(index):
+    result = index.complete("", "tag", limit=1)
+    assert result["total"] == 3 and names(result) == ["vg-drawer"]
+    assert index.complete("zz", "event") == {"total": 0, "completions": []}
+
+
+def test_every_registry_name_completes_to_itself(shared_registry):
+    index = build_completion_index(shared_registry)
+    for kind in COMPLETION_KINDS:
+        for name in index.names[kind].names:
+            assert name in names(index.complete(name, kind, limit=1000)), (kind, name)
@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+from vg_ui_lib_mcp import component_css
+from vg_ui_lib_mcp.component_css import (
+    CSS_USAGE_FILE, build_component_css_index, css_variable_usage, load_component_css_usage,
+    scan_component_stylesheets,
+)
+
+BUTTON_MODULE = """
+import styles from './vg-button.scss?inline';
+@customElement('vg-button')
+export class VgButton extends LitElement {}
+"""
+BUTTON_STYLESHEET = """
+:host { --vg-button-radius: var(--vg-radius, 4px); color: var(--vg-button-color); }
+"""
+
+
+def test_usage_separates_consumed_and_declared_properties():
+    consumed, declared = css_variable_usage('a{--vg-a:var( --vg-b);b:var(--vg-c,1px)} <x style="--vg-d: 1">')
+    assert consumed == {"--vg-b", "--vg-c"}
+    assert declared == {"--vg-a", "--vg-d"}
+
+
+def test_stylesheets_are_attributed_to_the_elements_importing_them(tmp_path):
+    button = tmp_path / "Button"
+    button.mkdir()
+    (button / "vg-button.ts").write_text(BUTTON_MODULE, encoding="utf-8")
+    (button / "vg-button.scss").write_text(BUTTON_STYLESHEET, encoding="utf-8")
+    (button / "helpers.ts").write_text("export const unstyled = 1;", encoding="utf-8")
+    assert scan_component_stylesheets(tmp_path) == {
+        "vg-button": {"consumes": ["--vg-button-color", "--vg-radius"], "declares": ["--vg-button-radius"]},
+    }
+
+
+def test_packaged_usage_is_read_without_a_source_tree(tmp_path, monkeypatch):
+    monkeypatch.setattr(component_css, "COMPONENT_SOURCES_PATH", tmp_path / "missing")
+    usage = load_component_css_usage()
+    assert isinstance(usage, dict)
+    packaged = json.loads((Path(component_css.__file__).parent / "data" / CSS_USAGE_FILE).read_text())
+    assert usage == packaged
+
+
+def test_index_combines_predefined_css_stylesheets_and_examples(registry):
+    registry["predefined_css_definitions"] = (
+        ":root{--vg-radius:4px}"
+        ".vg-button{--vg-button-gap:var(--vg-space)}"
+        ".vg-button-group{--vg-group-gap:2px}"
+        ".vg-theme-dark,[data-vg-theme=dark]{--vg-surface:#000}"
+    )
+    example = registry["components"]["vg-button"]["examples"][0]
+    example["sources"]["html"] = '<vg-button style="--vg-button-color: var(--vg-accent)"></vg-button>'
+    usage = {"vg-button": {"consumes": ["--vg-radius"], "declares": ["--vg-button-gap"]}}
+
+    index = build_component_css_index(registry, usage)
+    assert set(index) == set(registry["components"])
+    button = index["vg-button"]
+    assert button["consumes"] == ["--vg-accent", "--vg-radius", "--vg-space"]
+    assert button["exposes"] == ["--vg-button-color", "--vg-button-gap"]
+    assert button["sources"]["--vg-button-gap"] == ["component stylesheet", "predefined CSS"]
+    assert button["sources"]["--vg-accent"] == ["examples"]
+    assert index["vg-theme-provider"]["exposes"] == ["--vg-surface"]
+    assert "--vg-group-gap" not in index["vg-button"]["exposes"]
@@ -0,0 +1,126 @@
+import pytest
+
+from vg_ui_lib_mcp.css_tokens import (
+    DEFAULT_THEME, build_css_token_table, iter_declarations, parse_css_custom_properties, scope_chain, selector_theme,
+)
+
+
+CSS = (
+    "@import url(x.css);/* tokens */"
+    ":root{--vg-blue:#00f;--vg-primary:var(--vg-blue);--vg-shadow:0 1px var(--vg-primary);"
+    "--vg-gap:var(--vg-missing);--vg-pad:var(--vg-missing, var(--vg-gap-base, 4px));"
+    "--vg-a:var(--vg-b);--vg-b:var(--vg-a);--vg-safe:var(--vg-a, red)}"
+    ":host{--vg-blue:#0000ff}"
+    ":host(.vg-button){--vg-primary:var(--vg-blue);color:var(--vg-primary)}"
+    ".vg-card{--vg-primary:green}"
+)
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_css_token_table(CSS)
+
+
+def test_parse_skips_comments_at_statements_and_plain_properties():
+    tokens = parse_css_custom_properties(CSS)
+    assert tokens[0] == {"name": "--vg-blue", "value": "#00f", "selector": ":root"}
+    assert all(token["name"].startswith("--") for token in tokens)
+    assert len(tokens) == 11
+
+
+def test_declarations_keep_parenthesized_semicolons():
+    assert list(iter_declarations("--a:url(a;b); --b : 1px ;")) == [("--a", "url(a;b)"), ("--b", "1px")]
+
+
+def test_scope_chain():
+    assert scope_chain(":root") == (":root",)
+    assert scope_chain(":host(.x)") == (":host(.x)", ":host", ":root")
+    assert scope_chain(".x") == (".x", ":root")
+
+
+def resolved(table, name, selector=":root"):
+    return [row["resolved"] for row in table.lookup(name) if row["selector"] == selector]
+
+
+def test_var_chains_are_resolved_in_their_scope(table):
+    assert resolved(table, "--vg-shadow") == ["0 1px #00f"]
+    assert resolved(table, "--vg-primary", ":host(.vg-button)") == ["#0000ff"]
+    assert resolved(table, "--vg-primary", ".vg-card") == ["green"]
+
+
+def test_undeclared_references_stay_and_fallbacks_apply(table):
+    assert resolved(table, "--vg-gap") == ["var(--vg-missing)"]
+    assert resolved(table, "--vg-pad") == ["4px"]
+
+
+def test_cycles_resolve_to_none_unless_there_is_a_fallback(table):
+    assert resolved(table, "--vg-a") == [None] and table.lookup("--vg-a")[0]["cycle"] is True
+    assert resolved(table, "--vg-safe") == ["red"]
+    assert set(table.cycles) <= {"--vg-a", "--vg-b"} and table.cycles
+
+
+def test_lookups_by_prefix_and_value(table):
+    assert [row["name"] for row in table.with_prefix("--vg-p")] == ["--vg-pad", "--vg-primary", "--vg-primary", "--vg-primary"]
+    assert {(row["name"], row["selector"]) for row in table.with_value(" #00F ")} == {("--vg-blue", ":root"), ("--vg-primary", ":root")}
+    assert table.lookup("--vg-nope") == [] and table.with_prefix("--zz") == []
+
+
+def test_registry_stylesheet_resolves_without_cycles(shared_registry):
+    table = build_css_token_table(shared_registry["predefined_css_definitions"])
+    assert table.rows and not table.cycles
+    assert all(row["resolved"] is not None for row in table.rows)
+
+
+THEMED_CSS = (
+    ":root{--vg-bg:white;--vg-fg:var(--vg-ink);--vg-ink:black}"
+    "[data-vg-theme],.vg-theme-provider{--vg-radius:4px}"
+    ".vg-theme-dark,[data-vg-theme=dark]{--vg-ink:silver}"
+    ":host(.vg-theme-dark){--vg-bg:black}"
+    ":host(.vg-theme-dark) ::slotted(*){--vg-bg:red}"
+    ".vg-theme-glass,[data-vg-theme=glass]{--vg-radius:12px}"
+)
+
+
+@pytest.fixture(scope="module")
+def themed():
+    return build_css_token_table(THEMED_CSS)
+
+
+@pytest.mark.parametrize("selector, theme", [
+    (".vg-theme-dark,[data-vg-theme=dark]", "dark"),
+    (":host(.vg-theme-dark)", "dark"),
+    ("[data-vg-theme='glass']", "glass"),
+    (":host(.vg-theme-dark) ::slotted(*)", None),
+    (".vg-theme-dark,[data-vg-theme=light]", None),
+    (":root", None),
+])
+def test_selector_theme(selector, theme):
+    assert selector_theme(selector) == theme
+
+
+def test_themes_layer_over_the_provider_and_root_scopes(themed):
+    assert themed.themes["dark"] == (".vg-theme-dark,[data-vg-theme=dark]", ":host(.vg-theme-dark)",
+                                     "[data-vg-theme],.vg-theme-provider", ":root")
+    assert themed.theme_tokens("dark") == {"--vg-bg": "black", "--vg-fg": "silver", "--vg-ink": "silver", "--vg-radius": "4px"}
+    assert themed.theme_tokens(DEFAULT_THEME) == {"--vg-bg": "white", "--vg-fg": "black", "--vg-ink": "black"}
+    assert themed.theme_tokens("neon") is None
+
+
+def test_theme_diffs_are_symmetric(themed):
+    diff = themed.theme_diff("glass", "dark")
+    assert diff == {
+        "--vg-bg": {"dark": "black", "glass": "white"},
+        "--vg-fg": {"dark": "silver", "glass": "black"},
+        "--vg-ink": {"dark": "silver", "glass": "black"},
+        "--vg-radius": {"dark": "4px", "glass": "12px"},
+    }
+    assert themed.theme_diff("dark", "glass") == diff
+    assert themed.theme_diff("dark", "dark") == {}
+    assert themed.theme_diff("dark", "neon") is None
+
+
+def test_registry_themes_resolve(shared_registry):
+    table = build_css_token_table(shared_registry["predefined_css_definitions"])
+    assert {DEFAULT_THEME, "dark", "light"} <= set(table.themes)
+    for theme in table.themes:
+        assert all(value is not None for value in table.theme_tokens(theme).values())
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import socket
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+from fastmcp import FastMCP
+
+from vg_ui_lib_mcp.daemon import _acquire_daemon_lock, serve_unix_socket
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="the daemon serves a Unix domain socket")
+
+IDLE_TIMEOUT = 0.3
+
+
+@pytest.fixture
+def socket_path():
+    # Short enough for the Unix socket path limit, unlike most tmp_path directories
+    with tempfile.TemporaryDirectory(prefix="vg-daemon-") as directory:
+        yield Path(directory) / "server.sock"
+
+
+def echo_server():
+    server = FastMCP("echo")
+
+    @server.tool
+    def echo(text: str) -> str:
+        return text
+
+    return server
+
+
+class Session:
+    """A raw newline-delimited JSON-RPC session on the daemon socket."""
+
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+        self.next_id = 0
+
+    @classmethod
+    async def open(cls, socket_path):
+        session = cls(*await asyncio.open_unix_connection(str(socket_path)))
+        await session.request("initialize", {
+            "protocolVersion": "2025-06-18", "capabilities": {}, "clientInfo": {"name": "test", "version": "1"},
+        })
+        await session.send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+        return session
+
+    async def send(self, message):
+        self.writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def request(self, method, params=None):
+        self.next_id += 1
+        await self.send({"jsonrpc": "2.0", "id": self.next_id, "method": method, "params": params or {}})
+        while True:
+            reply = json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+            if reply.get("id") == self.next_id:
+                return reply
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def wait_for_socket(socket_path):
+    while not socket_path.exists():
+        await asyncio.sleep(0.01)
+
+
+def test_sessions_share_one_server_and_the_daemon_stops_once_idle(socket_path):
+    async def scenario():
+        listening = []
+        daemon = asyncio.create_task(serve_unix_socket(
+            echo_server(), socket_path, on_listening=lambda: listening.append(True), idle_timeout=IDLE_TIMEOUT,
+        ))
+        await wait_for_socket(socket_path)
+        first, second = await Session.open(socket_path), await Session.open(socket_path)
+        tools = await first.request("tools/list")
+        echoed = await second.request("tools/call", {"name": "echo", "arguments": {"text": "hi"}})
+        await first.close()
+        await second.close()
+        started = time.monotonic()
+        await asyncio.wait_for(daemon, 5)
+        return listening, tools, echoed, time.monotonic() - started
+
+    listening, tools, echoed, stopped_after = asyncio.run(scenario())
+    assert listening == [True]
+    assert [tool["name"] for tool in tools["result"]["tools"]] == ["echo"]
+    assert echoed["result"]["content"][0]["text"] == "hi"
+    assert stopped_after >= IDLE_TIMEOUT * 0.9
+    assert not socket_path.exists()
+
+
+def test_a_connected_session_keeps_the_daemon_running(socket_path):
+    async def scenario():
+        daemon = asyncio.create_task(serve_unix_socket(echo_server(), socket_path, idle_timeout=IDLE_TIMEOUT))
+        await wait_for_socket(socket_path)
+        session = await Session.open(socket_path)
+        await asyncio.sleep(IDLE_TIMEOUT * 3)
+        running = not daemon.done()
+        echoed = await session.request("tools/call", {"name": "echo", "arguments": {"text": "still here"}})
+        await session.close()
+        await asyncio.wait_for(daemon, 5)
+        return running, echoed
+
+    running, echoed = asyncio.run(scenario())
+    assert running
+    assert echoed["result"]["content"][0]["text"] == "still here"
+
+
+def test_a_second_daemon_leaves_the_running_one_alone(socket_path):
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = _acquire_daemon_lock(socket_path)
+    try:
+        assert _acquire_daemon_lock(socket_path) is None
+        asyncio.run(asyncio.wait_for(serve_unix_socket(echo_server(), socket_path, idle_timeout=IDLE_TIMEOUT), 5))
+        assert not socket_path.exists()
+    finally:
+        lock_file.close()
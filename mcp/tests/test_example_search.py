@@ -0,0 +1,70 @@
+import pytest
+
+from vg_ui_lib_mcp.example_search import build_example_indexes, fold_case, search_example_indexes
+
+
+COMPONENTS = {
+    "vg-button": {"examples": [
+        {"id": "basic", "sources": {
+            "vue": "<template>\n  <vg-button @vg-click=\"save\">Save</vg-button>\n</template>",
+            "react": "<VgButton onVgClick={save}>Save</VgButton>",
+        }},
+    ]},
+    "vg-input": {"examples": [
+        {"id": "bound", "sources": {"vue": "<template>\n  <vg-input @vg-change=\"update\" />\n</template>"}},
+    ]},
+}
+
+
+@pytest.fixture(scope="module")
+def indexes():
+    return build_example_indexes(COMPONENTS)
+
+
+def test_fold_case_keeps_offsets():
+    assert fold_case("ABC") == "abc"
+    assert fold_case("İx Y") == "İx y"
+    assert len(fold_case("İstanbul")) == len("İstanbul")
+
+
+def test_identical_lines_are_stored_once(indexes):
+    vue = indexes["vue"]
+    assert vue.lines.count("<template>") == 1
+    assert vue.occurrences(vue.lines.index("</template>")) == [(0, 3), (1, 3)]
+
+
+def test_search_ranks_lines_with_more_terms_first(indexes):
+    hits = search_example_indexes(indexes, "vg-change update")
+    assert hits[0]["component_tag"] == "vg-input" and hits[0]["line"] == 2 and hits[0]["score"] == 1.0
+    assert hits[0]["highlighted"] == '<vg-input @**vg-change**="**update**" />'
+
+
+def test_search_is_case_insensitive_and_reports_spans(indexes):
+    hits = search_example_indexes(indexes, "VGBUTTON", framework="react")
+    assert [(hit["example_id"], hit["spans"]) for hit in hits] == [("basic", [[1, 9], [33, 41]])]
+
+
+@pytest.mark.parametrize("query", ["<", "vg", "te"])
+def test_short_terms_are_found_without_a_scan(indexes, query):
+    expected = sorted((tag, line_no)
+                      for tag, component in COMPONENTS.items()
+                      for example in component["examples"]
+                      for line_no, line in enumerate(example["sources"]["vue"].splitlines(), start=1)
+                      if query in line.lower())
+    hits = search_example_indexes(indexes, query, framework="vue", limit=100)
+    assert sorted((hit["component_tag"], hit["line"]) for hit in hits) == expected
+
+
+def test_filters_and_limit(indexes):
+    assert {hit["component_tag"] for hit in search_example_indexes(indexes, "template", component_tag="vg-input")} == {"vg-input"}
+    assert search_example_indexes(indexes, "save", framework="svelte") == []
+    assert len(search_example_indexes(indexes, "template", limit=1)) == 1
+    assert search_example_indexes(indexes, "   ") == []
+
+
+def test_every_matching_line_of_the_registry_is_a_candidate(shared_registry):
+    indexes = build_example_indexes(shared_registry["components"])
+    for index in indexes.values():
+        for term in ("vg-", "=", "import", "slot", "class", "@"):
+            expected = {line_id for line_id, line in enumerate(index.lines) if term in fold_case(line)}
+            assert expected <= index.candidates(term), (index.framework, term)
@@ -0,0 +1,81 @@
+import copy
+import json
+
+import pytest
+
+from vg_ui_lib_mcp.content_store import dedupe_registry
+from vg_ui_lib_mcp.framework_transformer import (
+    CANONICAL_FRAMEWORK, DERIVED_FRAMEWORKS_KEY, FRAMEWORKS, compact_registry, derive_source, example_frameworks,
+    example_sources, expand_example,
+)
+
+
+def _examples(registry):
+    return [(component_tag, position, example)
+            for component_tag, component in registry['components'].items()
+            for position, example in enumerate(component.get('examples') or [])]
+
+
+@pytest.fixture(scope="module")
+def compacted(shared_registry):
+    compact, report = compact_registry(shared_registry)
+    return compact, report
+
+
+def test_compact_registry_derives_sources(compacted):
+    compact, report = compacted
+    assert report["derived_sources"] > 0
+    assert any(example.get(DERIVED_FRAMEWORKS_KEY) for _, _, example in _examples(compact))
+
+
+def test_compact_registry_leaves_the_input_unchanged(registry):
+    original = copy.deepcopy(registry)
+    compact_registry(registry)
+    assert registry == original
+
+
+@pytest.mark.parametrize("deduplicated", [False, True], ids=["plain", "deduplicated"])
+def test_compact_examples_have_the_original_sources(shared_registry, compacted, deduplicated):
+    compact = dedupe_registry(compacted[0])[0] if deduplicated else compacted[0]
+    for component_tag, position, example in _examples(compact):
+        original_sources = shared_registry['components'][component_tag]['examples'][position]['sources']
+        sources = example_sources(example)
+        assert sources == original_sources, (component_tag, example.get('id'))
+        assert list(sources) == list(original_sources)
+        assert example_frameworks(example) == list(original_sources)
+
+
+def test_every_framework_derives_on_its_own(shared_registry, compacted):
+    for component_tag, position, example in _examples(compacted[0]):
+        original_sources = shared_registry['components'][component_tag]['examples'][position]['sources']
+        for framework in FRAMEWORKS:
+            expected = {framework: original_sources[framework]} if framework in original_sources else {}
+            assert example_sources(example, [framework]) == expected, (component_tag, example.get('id'), framework)
+
+
+def test_expand_example_restores_the_full_form(shared_registry, compacted):
+    for component_tag, position, example in _examples(compacted[0]):
+        original = shared_registry['components'][component_tag]['examples'][position]
+        expanded = expand_example(example)
+        assert expanded == original
+        assert list(expanded) == list(original)
+
+
+def test_compact_registry_round_trips_through_json(shared_registry, compacted):
+    compact = json.loads(json.dumps(compacted[0]))
+    for component_tag, position, example in _examples(compact):
+        assert example_sources(example) == shared_registry['components'][component_tag]['examples'][position]['sources']
+
+
+def test_derive_source_rejects_unknown_inputs():
+    assert derive_source("svelte", "<vg-button\n>\n  x\n</vg-button>", {}) is None
+    assert derive_source("react", "not a canonical source", {}) is None
+
+
+def test_examples_without_canonical_source_keep_their_sources():
+    example = {"id": "only-react", "sources": {"react": "const x = 1"}}
+    compact, report = compact_registry({"components": {"vg-x": {"examples": [example]}}})
+    compact_example = compact["components"]["vg-x"]["examples"][0]
+    assert DERIVED_FRAMEWORKS_KEY not in compact_example
+    assert example_sources(compact_example) == {"react": "const x = 1"}
+    assert report["stored_sources"] == 1 and CANONICAL_FRAMEWORK not in compact_example["sources"]
@@ -0,0 +1,52 @@
+import json
+from types import MappingProxyType
+
+import pytest
+from pydantic import BaseModel
+
+from vg_ui_lib_mcp import json_backend
+
+
+@pytest.fixture(params=json_backend.AVAILABLE_BACKENDS)
+def backend(request, monkeypatch):
+    monkeypatch.setattr(json_backend, "BACKEND", request.param)
+    return request.param
+
+
+class Item(BaseModel):
+    name: str
+
+
+def test_known_non_json_types_are_encoded(backend):
+    value = {"model": Item(name="x"), "mapping": MappingProxyType({"a": 1}), "tuple": (1, 2), "set": {3}}
+    assert json.loads(json_backend.dumps(value)) == {"model": {"name": "x"}, "mapping": {"a": 1}, "tuple": [1, 2], "set": [3]}
+
+
+def test_unknown_types_are_not_stringified(backend):
+    with pytest.raises((TypeError, ValueError), match="not JSON serializable"):
+        json_backend.dumps({"value": object()})
+
+
+def test_registry_decodes_alike_with_every_backend(backend, registry_json, shared_registry):
+    registry, validation_error = json_backend.decode_registry(registry_json)
+    assert validation_error is None
+    assert registry == shared_registry
+
+
+def test_invalid_registries_are_decoded_untyped(backend):
+    registry, validation_error = json_backend.decode_registry(b'{"version": 1, "components": {}}')
+    assert registry == {"version": 1, "components": {}}
+    assert validation_error
+
+
+@pytest.mark.skipif(json_backend.orjson is None, reason="orjson is not installed")
+def test_orjson_backend_parses_with_orjson(monkeypatch, registry_json):
+    monkeypatch.setattr(json_backend, "BACKEND", "orjson")
+    parsed = []
+    monkeypatch.setattr(json_backend.orjson, "loads", lambda raw, loads=json_backend.orjson.loads: parsed.append(raw) or loads(raw))
+    monkeypatch.setattr(json_backend, "_registry_adapter", type("Adapter", (), {
+        "validate_python": staticmethod(json_backend._registry_adapter.validate_python),
+        "validate_json": staticmethod(lambda raw: pytest.fail("validate_json parses the JSON again")),
+    }))
+    registry, validation_error = json_backend.decode_registry(registry_json)
+    assert parsed == [registry_json] and validation_error is None and registry["components"]
@@ -0,0 +1,95 @@
+import pytest
+
+from vg_ui_lib_mcp.framework_transformer import example_sources
+from vg_ui_lib_mcp.markup_validator import MARKUP_FRAMEWORKS, build_markup_validators, validate_markup
+
+
+REGISTRY = {"components": {
+    "vg-button": {
+        "props": {
+            "variant": {"type": "'primary' | 'secondary'", "enum": ["primary", "secondary"]},
+            "disabled": {"type": "boolean"},
+            "maxWidth": {"type": "number"},
+            "label": {"type": "string", "enum": ["string"]},
+        },
+        "events": {"vg-click": {}},
+    },
+    "vg-card": {"props": {"heading": {"type": "string", "required": True}}, "slots": {"footer": {}}},
+}}
+
+
+@pytest.fixture(scope="module")
+def validators():
+    return build_markup_validators(REGISTRY)
+
+
+def issues(code, framework, validators):
+    return [(issue["severity"], issue.get("attribute"), issue.get("suggestion"))
+            for issue in validate_markup(code, framework, validators)["issues"]]
+
+
+def test_valid_markup(validators):
+    result = validate_markup('<vg-card heading="Hi"><vg-button variant="primary" max-width="3" slot="footer"></vg-button></vg-card>',
+                             "html", validators)
+    assert result == {"valid": True, "elements": 2, "errors": 0, "warnings": 0, "issues": []}
+
+
+def test_unknown_components_props_and_events_are_reported_with_suggestions(validators):
+    result = validate_markup('<vg-buton></vg-buton>\n<vg-button varient="primary" @vg-clik="go"></vg-button>', "vue", validators)
+    assert [(issue["line"], issue["column"], issue["message"].split("`")[0], issue.get("suggestion"))
+            for issue in result["issues"]] == [
+        (1, 1, "Unknown component ", "vg-button"),
+        (2, 12, "", "variant"),
+        (2, 30, "", "vg-click"),
+    ]
+    assert result["valid"] is False and result["errors"] == 3
+
+
+def test_static_values_are_checked_against_the_prop_type(validators):
+    code = '<vg-button variant="primery" disabled="false" max-width="wide" label="free text"></vg-button>'
+    assert issues(code, "html", validators) == [
+        ("error", "variant", "primary"), ("warning", "disabled", None), ("error", "max-width", None)]
+
+
+def test_required_props_and_slots(validators):
+    assert issues('<vg-card><p slot="foter"></p></vg-card>', "html", validators) == [
+        ("error", None, None), ("error", "slot", "footer")]
+
+
+@pytest.mark.parametrize("framework, code", [
+    ("vue", '<vg-button :variant="\'tertiary\'" @vg-click="go" />'),
+    ("angular", '<vg-button [variant]="\'tertiary\'" (vg-click)="go()"></vg-button>'),
+    ("lit", 'html`<vg-button .variant=${"tertiary"} @vg-click=${this.go}></vg-button>`'),
+    ("react", '<VgButton variant={"tertiary"} onVgClick={go} />'),
+    ("react19", '<vg-button variant={"tertiary"} onvg-click={go} />'),
+])
+def test_bound_literals_are_checked_per_framework(validators, framework, code):
+    assert issues(code, framework, validators) == [("error", code.split(" ")[1].split("=")[0], None)]
+
+
+def test_dynamic_values_are_not_checked(validators):
+    assert issues('<vg-button :variant="kind" :disabled="off" />', "vue", validators) == []
+    assert issues('<vg-button variant="${kind}"></vg-button>', "lit", validators) == []
+    assert issues('<VgButton {...props} variant={kind} />', "react", validators) == []
+
+
+def test_event_binding_pitfalls_are_warnings(validators):
+    assert issues('<vg-button onvg-click="go()" onclick="go()"></vg-button>', "html", validators) == [
+        ("warning", "onvg-click", None)]
+    assert issues('<vg-button @click="go"></vg-button>', "vue", validators) == [("warning", "@click", "vg-click")]
+    assert issues('<vg-button ?variant=${x}></vg-button>', "lit", validators) == [("warning", "?variant", None)]
+
+
+def test_comments_and_global_attributes_are_ignored(validators):
+    assert validate_markup('<!-- <vg-nope> --><vg-button id="b" data-x="1" aria-label="b" class="c"></vg-button>',
+                           "html", validators)["issues"] == []
+
+
+def test_registry_examples_validate(shared_registry):
+    validators = build_markup_validators(shared_registry)
+    for component_tag, component in shared_registry["components"].items():
+        for example in component.get("examples") or []:
+            for framework, source in example_sources(example).items():
+                if framework in MARKUP_FRAMEWORKS:
+                    result = validate_markup(source, framework, validators)
+                    assert result["errors"] == 0, (component_tag, example.get("id"), framework, result["issues"])
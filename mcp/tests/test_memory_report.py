@@ -0,0 +1,77 @@
+import sys
+import tracemalloc
+from array import array
+from collections.abc import Mapping
+
+from vg_ui_lib_mcp.content_store import ContentStore, PackedExample, PackedText, dedupe_registry, stored_sources
+from vg_ui_lib_mcp.memory_report import (
+    deep_sizeof, section_sizes, snapshot_diff, start_tracemalloc, take_snapshot, top_allocators,
+)
+
+
+class ReadOnlyMapping(Mapping):
+    def __init__(self, items):
+        self._items = items
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+
+def test_shared_objects_are_counted_once():
+    text = "x" * 1000
+    assert deep_sizeof([text, text]) == sys.getsizeof([text, text]) + sys.getsizeof(text)
+    first, second = {"a": text}, {"b": text}
+    seen = set()
+    assert deep_sizeof(first, seen) == sys.getsizeof(first) + sys.getsizeof("a") + sys.getsizeof(text)
+    assert deep_sizeof(second, seen) == sys.getsizeof(second) + sys.getsizeof("b")
+    assert deep_sizeof({"function": deep_sizeof}) == deep_sizeof({"function": None}) - sys.getsizeof(None)
+
+
+def test_dict_subclass_slots_and_other_mappings_are_followed():
+    example = PackedExample(id="basic")
+    example.packed_sources = {"html": "y" * 5000}
+    assert deep_sizeof(example) > deep_sizeof(dict(example)) + 5000
+    assert deep_sizeof(ReadOnlyMapping({"key": "z" * 5000})) > 5000
+
+
+def test_packed_texts_count_their_blocks_not_the_whole_store():
+    store = ContentStore(["a" * 1000, "b" * 1000, "c" * 1000])
+    text = PackedText(store, array("I", [0, 0]))
+    assert deep_sizeof(text) == sys.getsizeof(text) + sys.getsizeof(text.block_ids) + sys.getsizeof(store.blocks[0])
+
+
+def test_deduplicated_registry_is_smaller_than_the_decoded_one(shared_registry):
+    deduped, _ = dedupe_registry(shared_registry)
+    assert any(isinstance(source, PackedText) for component in deduped["components"].values()
+               for example in component.get("examples", []) for source in stored_sources(example).values())
+    assert deep_sizeof(deduped["components"]) < deep_sizeof(shared_registry["components"])
+
+
+def test_section_sizes_are_listed_largest_first(shared_registry):
+    sizes = section_sizes(shared_registry)
+    assert set(sizes) == set(shared_registry)
+    assert list(sizes.values()) == sorted(sizes.values(), reverse=True)
+    assert sizes["components"] == deep_sizeof(shared_registry["components"])
+
+
+def test_allocation_sites_and_their_changes_are_reported():
+    already_tracing = start_tracemalloc()
+    try:
+        assert start_tracemalloc() is True
+        before = take_snapshot()
+        allocated = [bytearray(100_000) for _ in range(5)]
+        after = take_snapshot()
+        top = top_allocators(after, limit=3)
+        diff = snapshot_diff(before, after, limit=1)
+    finally:
+        if not already_tracing:
+            tracemalloc.stop()
+    assert len(top) <= 3 and top[0]["location"].startswith(__file__)
+    assert diff[0]["location"] == top[0]["location"] and diff[0]["size_diff_bytes"] >= 500_000
+    assert len(allocated) == 5
@@ -0,0 +1,73 @@
+from vg_ui_lib_mcp import profiling
+from vg_ui_lib_mcp.profiling import ALL_TOOLS, ToolProfiler, parse_tool_selection, profile_tool_name, summarize_profiles
+
+
+def busy(depth):
+    return sum(range(1000)) + (busy(depth - 1) if depth else 0)
+
+
+def write_profile(profiler, tool, arguments=None, depth=3):
+    profile = profiler.start(tool)
+    assert profile is not None
+    busy(depth)
+    return profiler.finish(profile, tool, arguments or {}, "0123456789abcdef")
+
+
+def test_profiles_directory_is_created_by_the_first_profile(tmp_path):
+    directory = tmp_path / "cache" / "profiles"
+    profiler = ToolProfiler(directory, tools={"list_components"})
+    assert profiler.profiles() == [] and not directory.exists()
+    profile = profiler.start("list_components")
+    path = profiler.finish(profile, "list_components", {}, "abc")
+    assert path is not None and path.parent == directory and profiler.profiles() == [path]
+
+
+def test_tool_selection_parses_comma_separated_names():
+    assert parse_tool_selection(" list_components, get_component_by_tag ,,") == {"list_components", "get_component_by_tag"}
+    assert parse_tool_selection("") == set() and parse_tool_selection(None) == set()
+
+
+def test_only_selected_and_sampled_calls_are_profiled(tmp_path, monkeypatch):
+    profiler = ToolProfiler(tmp_path, tools={"get_component_by_tag"})
+    assert profiler.start("list_components") is None
+    profile = profiler.start("get_component_by_tag")
+    assert profile is not None
+    assert profiler.start("get_component_by_tag") is None
+    profiler.finish(profile, "get_component_by_tag", {}, "")
+
+    profiler.configure({ALL_TOOLS}, 0.0)
+    assert not profiler.enabled and profiler.start("list_components") is None
+    profiler.configure({ALL_TOOLS}, 0.25)
+    monkeypatch.setattr(profiling.random, "random", lambda: 0.5)
+    assert profiler.start("list_components") is None
+    monkeypatch.setattr(profiling.random, "random", lambda: 0.1)
+    profile = profiler.start("list_components")
+    assert profile is not None
+    profiler.finish(profile, "list_components", {}, "")
+    assert ToolProfiler(None, tools={ALL_TOOLS}).start("list_components") is None
+
+
+def test_profile_names_identify_the_call_and_old_profiles_rotate_out(tmp_path):
+    profiler = ToolProfiler(tmp_path, tools={ALL_TOOLS}, max_profiles=2)
+    paths = [write_profile(profiler, "get_component_by_tag", {"component_tag": tag})
+             for tag in ("vg-button", "vg-card", "vg-input")]
+    assert profiler.profiles() == paths[1:] and profiler.written == 3
+    assert profile_tool_name(paths[0]) == "get_component_by_tag"
+    assert paths[0].name.endswith(f"_{profiling.arguments_hash('get_component_by_tag', {'component_tag': 'vg-button'})}"
+                                  "_0123456789ab.prof")
+
+
+def test_summary_merges_profiles_per_tool(tmp_path):
+    profiler = ToolProfiler(tmp_path, tools={ALL_TOOLS})
+    write_profile(profiler, "list_components")
+    write_profile(profiler, "get_component_by_tag")
+    (tmp_path / "0_broken_x_y.prof").write_bytes(b"not a profile")
+
+    summary = summarize_profiles(profiler.profiles(), sort="calls", limit=3)
+    assert summary["profiles"] == 2
+    assert summary["tools"] == {"list_components": 1, "get_component_by_tag": 1}
+    assert len(summary["functions"]) == 3
+    busy_row = next(row for row in summary["functions"] if row["function"].endswith("(busy)"))
+    assert busy_row["calls"] == 8
+    assert [row["calls"] for row in summary["functions"]] == sorted((row["calls"] for row in summary["functions"]), reverse=True)
+    assert summarize_profiles([]) == {"profiles": 0, "tools": {}, "functions": []}
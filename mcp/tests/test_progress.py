@@ -0,0 +1,39 @@
+import asyncio
+
+from vg_ui_lib_mcp.progress import report_progress_while
+
+
+class RecordingContext:
+    def __init__(self):
+        self.reports = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.reports.append((progress, total, message))
+
+
+def test_progress_is_reported_while_the_block_runs_and_once_it_is_done():
+    ctx = RecordingContext()
+
+    async def scenario():
+        async with report_progress_while(ctx, "Waiting", total=10, interval=0.02):
+            await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    first, *heartbeats, last = ctx.reports
+    assert first == (0, 10, "Waiting")
+    assert heartbeats and all(total == 10 and message.startswith("Waiting (") for _, total, message in heartbeats)
+    assert [progress for progress, _, _ in heartbeats] == sorted(progress for progress, _, _ in heartbeats)
+    assert last == (10, 10, "Waiting: done")
+
+
+def test_unbounded_progress_reports_elapsed_seconds():
+    ctx = RecordingContext()
+
+    async def scenario():
+        async with report_progress_while(ctx, "Waiting", interval=1):
+            pass
+
+    asyncio.run(scenario())
+    assert ctx.reports[0] == (0, None, "Waiting")
+    progress, total, message = ctx.reports[-1]
+    assert len(ctx.reports) == 2 and total is None and 0 <= progress < 1 and message == "Waiting: done"
@@ -0,0 +1,86 @@
+import pytest
+
+from vg_ui_lib_mcp.prop_query import QueryPredicate, build_prop_event_table, query_prop_event_table
+
+
+COMPONENTS = {
+    "vg-button": {
+        "props": {
+            "disabled": {"type": "boolean", "default": "false", "description": "Disables the button"},
+            "variant": {"type": "string", "default": {"summary": "'primary'"}, "enum": ["primary", "text"]},
+        },
+        "events": {"vg-click": {"name": "vg-click", "parameterType": "MouseEvent", "description": "Clicked"}},
+    },
+    "vg-input": {
+        "props": {
+            "disabled": {"type": "boolean"},
+            "value": {"type": "string", "required": True},
+        },
+        "events": {"vg-change": {"parameterType": "Event"}},
+    },
+}
+
+
+@pytest.fixture(scope="module")
+def table():
+    return build_prop_event_table(COMPONENTS)
+
+
+def where(*predicates):
+    return [QueryPredicate(field=field, op=op, value=value) for field, op, value in predicates]
+
+
+def test_table_has_one_row_per_prop_and_event(table):
+    assert len(table) == 6
+    assert table.row(1) == {"component": "vg-button", "kind": "prop", "name": "variant", "type": "string",
+                            "default": "'primary'", "required": False, "enum": ["primary", "text"], "description": ""}
+    assert table.row(5, ["name", "type"]) == {"name": "vg-change", "type": "Event"}
+
+
+def test_indexed_equality_is_case_insensitive(table):
+    result = query_prop_event_table(table, where(("name", "eq", "DISABLED"), ("type", "eq", "Boolean")))
+    assert result["total"] == 2 and result["components"] == ["vg-button", "vg-input"]
+
+
+@pytest.mark.parametrize("predicate, expected", [
+    (("name", "ne", "disabled"), 4),
+    (("description", "contains", "button"), 1),
+    (("name", "startswith", "vg-"), 2),
+    (("kind", "in", ["event"]), 2),
+    (("enum", "contains", "text"), 1),
+    (("enum", "in", ["primary", "other"]), 1),
+    (("required", "eq", True), 1),
+    (("required", "ne", "true"), 5),
+    (("default", "exists", True), 2),
+    (("description", "exists", False), 4),
+])
+def test_operators(table, predicate, expected):
+    assert query_prop_event_table(table, where(predicate))["total"] == expected
+
+
+def test_component_has_requires_every_group(table):
+    result = query_prop_event_table(
+        table, where(("kind", "eq", "prop")), select=["component", "name"],
+        component_has=[where(("name", "eq", "disabled")), where(("name", "eq", "vg-click"))])
+    assert result["components"] == ["vg-button"]
+    assert result["rows"] == [{"component": "vg-button", "name": "disabled"}, {"component": "vg-button", "name": "variant"}]
+
+
+def test_limit_only_truncates_rows(table):
+    result = query_prop_event_table(table, limit=2)
+    assert result["total"] == 6 and len(result["rows"]) == 2
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"where": where(("colour", "eq", "red"))},
+    {"where": where(("name", "like", "x"))},
+    {"where": where(("required", "contains", "x"))},
+    {"where": where(("enum", "startswith", "p"))},
+    {"where": where(("name", "in", "disabled"))},
+    {"where": where(("enum", "in", "primary"))},
+    {"where": where(("kind", "in", None))},
+    {"select": ["name", "colour"]},
+])
+def test_invalid_queries_raise_value_error(table, kwargs):
+    with pytest.raises(ValueError):
+        query_prop_event_table(table, **kwargs)
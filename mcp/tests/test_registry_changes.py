@@ -0,0 +1,76 @@
+import copy
+import os
+import time
+
+from vg_ui_lib_mcp.content_store import dedupe_registry
+from vg_ui_lib_mcp.framework_transformer import compact_registry
+from vg_ui_lib_mcp.registry_changes import (
+    RegistryHistory, build_entity_hashes, diff_entity_hashes, example_key, split_example_key,
+)
+
+
+def test_compact_and_deduplicated_registries_hash_alike(shared_registry):
+    hashes = build_entity_hashes(shared_registry)
+    compact = compact_registry(shared_registry)[0]
+    assert build_entity_hashes(compact) == hashes
+    assert build_entity_hashes(dedupe_registry(compact)[0]) == hashes
+    assert build_entity_hashes(dedupe_registry(shared_registry)[0]) == hashes
+
+
+def test_diff_reports_added_removed_and_modified_entities(registry):
+    before = build_entity_hashes(registry)
+    components = registry["components"]
+    first, second = list(components)[:2]
+    example = components[first]["examples"][0]
+    example["sources"] = {framework: source + "\n" for framework, source in example["sources"].items()}
+    components[second]["description"] = "changed"
+    components["vg-new"] = copy.deepcopy(components.pop(second))
+    registry["schemas"]["NewSchema"] = {"type": "object"}
+
+    changes = diff_entity_hashes(before, build_entity_hashes(registry))
+    assert changes["components"] == {"added": ["vg-new"], "removed": [second], "modified": []}
+    assert changes["examples"]["modified"] == [example_key(first, example["id"])]
+    assert all(key.startswith("vg-new::") for key in changes["examples"]["added"])
+    assert changes["schemas"] == {"added": ["NewSchema"], "removed": [], "modified": []}
+    assert changes["categories"] == {"added": [], "removed": [], "modified": []}
+
+
+def test_component_hashes_ignore_examples(registry):
+    before = build_entity_hashes(registry)
+    tag = next(iter(registry["components"]))
+    registry["components"][tag]["examples"].pop()
+    after = build_entity_hashes(registry)
+    assert after["components"] == before["components"]
+    assert len(after["examples"]) == len(before["examples"]) - 1
+
+
+def test_history_survives_a_restart_and_keeps_recent_snapshots(tmp_path):
+    history = RegistryHistory(tmp_path, max_snapshots=2)
+    for age, registry_hash in ((20, "aa"), (10, "bb")):
+        history.record(registry_hash, {"components": {"vg-x": registry_hash}})
+        os.utime(tmp_path / f"{registry_hash}.json", (time.time() - age, time.time() - age))
+    history.record("cc", {"components": {"vg-x": "cc"}})
+
+    restarted = RegistryHistory(tmp_path, max_snapshots=2)
+    assert restarted.get("cc") == {"components": {"vg-x": "cc"}}
+    assert restarted.get("aa") is None
+    assert restarted.get("../secrets") is None and restarted.get("") is None
+
+
+def test_history_without_a_directory_stays_in_memory():
+    history = RegistryHistory(None)
+    history.record("aa", {})
+    assert history.get("aa") == {} and history.get("bb") is None
+
+
+def test_example_keys_split_back_into_tag_and_id():
+    assert split_example_key(example_key("vg-button", "with::colons")) == ("vg-button", "with::colons")
+    assert split_example_key(example_key("vg-button", "")) == ("vg-button", "")
+
+
+def test_history_creates_its_directory_on_the_first_write(tmp_path):
+    directory = tmp_path / "cache" / "registry-history"
+    history = RegistryHistory(directory)
+    assert history.get("aa") is None and not directory.exists()
+    history.record("aa", {})
+    assert (directory / "aa.json").is_file()
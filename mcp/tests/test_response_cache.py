@@ -0,0 +1,53 @@
+import json
+
+from vg_ui_lib_mcp.response_cache import ResponseCache
+
+
+def test_repeat_lookups_hit_the_cache():
+    cache = ResponseCache()
+    assert cache.get("snap", ("list_components", ())) is None
+    value = {"components": ["vg-button"]}
+    stored = cache.put("snap", ("list_components", ()), value)
+    assert json.loads(stored.payload) == value and stored.size == len(stored.payload.encode("utf-8"))
+    hit = cache.get("snap", ("list_components", ()))
+    assert hit is stored and hit.value is value
+    assert cache.stats() == {"entries": 1, "bytes": stored.size, "max_bytes": cache.max_bytes, "hits": 1, "misses": 1}
+
+
+def test_a_new_snapshot_drops_every_entry():
+    cache = ResponseCache()
+    cache.put("old", "key", [1, 2, 3])
+    assert cache.get("new", "key") is None
+    assert len(cache) == 0 and cache.total_bytes == 0 and cache.snapshot == "new"
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResponseCache(max_bytes=30, serializer=lambda value: value)
+    cache.put("snap", "a", "x" * 10)
+    cache.put("snap", "b", "y" * 10)
+    cache.get("snap", "a")
+    cache.put("snap", "c", "z" * 15)
+    assert cache.get("snap", "b") is None
+    assert cache.get("snap", "a") is not None and cache.get("snap", "c") is not None
+    assert cache.total_bytes == 25
+
+
+def test_replacing_an_entry_keeps_the_byte_count_exact():
+    cache = ResponseCache(serializer=lambda value: value)
+    cache.put("snap", "a", "x" * 10)
+    cache.put("snap", "a", "x" * 4)
+    assert len(cache) == 1 and cache.total_bytes == 4
+
+
+def test_responses_over_the_budget_are_returned_but_not_cached():
+    cache = ResponseCache(max_bytes=5, serializer=lambda value: value)
+    response = cache.put("snap", "big", "é" * 3)
+    assert response.payload == "ééé" and response.size == 6
+    assert len(cache) == 0 and cache.total_bytes == 0
+
+
+def test_clear_forgets_the_snapshot():
+    cache = ResponseCache()
+    cache.put("snap", "a", 1)
+    cache.clear()
+    assert len(cache) == 0 and cache.snapshot is None
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+
+from vg_ui_lib_mcp.sampling_control import MAX_FAILURE_RETRIES, SamplingCoalescer, SamplingQueueFull
+
+
+class Caller:
+    """Stands in for a caller's Context: samples after a delay, or fails like a closed session."""
+
+    def __init__(self, name, delay=0.05, fails=False):
+        self.name = name
+        self.delay = delay
+        self.fails = fails
+        self.sampled = 0
+
+    async def sample(self):
+        self.sampled += 1
+        await asyncio.sleep(self.delay)
+        if self.fails:
+            raise ConnectionError(f"{self.name} disconnected")
+        return f"sampled by {self.name}"
+
+
+async def sample_through(caller):
+    return await caller.sample()
+
+
+def test_identical_requests_share_one_run():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        first, second = Caller("first"), Caller("second")
+        results = await asyncio.gather(coalescer.run("key", sample_through, first),
+                                       coalescer.run("key", sample_through, second))
+        return coalescer, results, first, second
+
+    coalescer, results, first, second = asyncio.run(scenario())
+    assert results == ["sampled by first", "sampled by first"]
+    assert (first.sampled, second.sampled) == (1, 0)
+    assert coalescer.stats["started"] == 1 and coalescer.stats["coalesced"] == 1
+    assert coalescer.in_flight == 0
+
+
+def test_distinct_requests_beyond_the_queue_are_rejected():
+    async def scenario():
+        coalescer = SamplingCoalescer(max_concurrent=1, max_queued=1)
+        running = [asyncio.create_task(coalescer.run(key, sample_through, Caller(key))) for key in ("a", "b")]
+        await asyncio.sleep(0)
+        with pytest.raises(SamplingQueueFull):
+            await coalescer.run("c", sample_through, Caller("c"))
+        await asyncio.gather(*running)
+        return coalescer
+
+    assert asyncio.run(scenario()).stats["rejected"] == 1
+
+
+def test_identical_requests_are_bounded_too():
+    async def scenario():
+        coalescer = SamplingCoalescer(max_waiting=2)
+        waiting = [asyncio.create_task(coalescer.run("key", sample_through, Caller(str(n)))) for n in range(2)]
+        await asyncio.sleep(0)
+        with pytest.raises(SamplingQueueFull):
+            await coalescer.run("key", sample_through, Caller("third"))
+        await asyncio.gather(*waiting)
+        return coalescer
+
+    coalescer = asyncio.run(scenario())
+    assert coalescer.stats["rejected"] == 1 and coalescer.waiting == 0
+
+
+def test_run_moves_to_a_waiting_caller_when_the_sampling_caller_cancels():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        first, second = Caller("first", delay=1), Caller("second")
+        first_call = asyncio.create_task(coalescer.run("key", sample_through, first))
+        second_call = asyncio.create_task(coalescer.run("key", sample_through, second))
+        await asyncio.sleep(0.01)
+        first_call.cancel()
+        return coalescer, await second_call, first_call
+
+    coalescer, result, first_call = asyncio.run(scenario())
+    assert result == "sampled by second"
+    assert first_call.cancelled()
+    assert coalescer.stats["failed_over"] == 1 and coalescer.stats["cancelled"] == 0
+
+
+def test_run_moves_to_a_waiting_caller_when_sampling_fails():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        gone, waiting = Caller("gone", fails=True), Caller("waiting")
+        results = await asyncio.gather(coalescer.run("key", sample_through, gone),
+                                       coalescer.run("key", sample_through, waiting))
+        return coalescer, results
+
+    coalescer, results = asyncio.run(scenario())
+    assert results == ["sampled by waiting", "sampled by waiting"]
+    assert coalescer.stats["failed_over"] == 1
+
+
+def test_failure_is_raised_once_every_caller_was_tried():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        return await asyncio.gather(coalescer.run("key", sample_through, Caller("a", fails=True)),
+                                    coalescer.run("key", sample_through, Caller("b", fails=True)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_failing_sampling_is_retried_once_for_all_waiting_callers():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        callers = [Caller(str(n), fails=True) for n in range(5)]
+        results = await asyncio.gather(*(coalescer.run("key", sample_through, caller) for caller in callers),
+                                       return_exceptions=True)
+        return coalescer, callers, results
+
+    coalescer, callers, results = asyncio.run(scenario())
+    assert sum(caller.sampled for caller in callers) == 1 + MAX_FAILURE_RETRIES
+    assert [str(result) for result in results] == ["0 disconnected"] * len(callers)
+    assert coalescer.stats["failed_over"] == MAX_FAILURE_RETRIES
+
+
+def test_callers_that_leave_do_not_use_up_the_retry():
+    async def scenario():
+        coalescer = SamplingCoalescer()
+        leaving, failing, last = Caller("leaving", delay=1), Caller("failing", fails=True), Caller("last")
+        leaving_call = asyncio.create_task(coalescer.run("key", sample_through, leaving))
+        others = asyncio.gather(coalescer.run("key", sample_through, failing),
+                                coalescer.run("key", sample_through, last))
+        await asyncio.sleep(0.01)
+        leaving_call.cancel()
+        return coalescer, await others
+
+    coalescer, results = asyncio.run(scenario())
+    assert results == ["sampled by last", "sampled by last"]
+    assert coalescer.stats["failed_over"] == 2
+
+
+def test_run_is_cancelled_when_nobody_waits():
+    async def scenario():
+        coalescer = SamplingCoalescer(timeout=0.01)
+        caller = Caller("slow", delay=1)
+        with pytest.raises(asyncio.TimeoutError):
+            await coalescer.run("key", sample_through, caller)
+        await asyncio.sleep(0)
+        return coalescer
+
+    coalescer = asyncio.run(scenario())
+    assert coalescer.stats["timed_out"] == 1 and coalescer.stats["cancelled"] == 1
+    assert coalescer.in_flight == 0
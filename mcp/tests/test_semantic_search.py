@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from vg_ui_lib_mcp.semantic_search import DEFAULT_MIN_SCORE, build_semantic_index, query_variants
+
+
+DIALOG = {
+    "category": "Overlay",
+    "descriptions": "Displays content in a layer above the page and traps focus until it is closed.",
+    "props": {"open": {"description": "Whether the dialog is shown."}, "heading": {"description": "Title of the dialog."}},
+    "events": {"vg-close": {"description": "Fired when the dialog closes."}},
+    "examples": [{"name": "Default"}],
+}
+
+
+@pytest.fixture(scope="module")
+def index(shared_registry):
+    return build_semantic_index(shared_registry["components"])
+
+
+@pytest.fixture(scope="module")
+def index_with_dialog(shared_registry):
+    return build_semantic_index({**shared_registry["components"], "vg-dialog": DIALOG})
+
+
+def tags(ranking):
+    return [tag for tag, _ in ranking]
+
+
+def test_query_variants_substitute_one_synonym_at_a_time():
+    assert query_variants(["zebra"]) == [["zebra"]]
+    assert query_variants(["modal", "footer"]) == [
+        ["modal", "footer"], ["dialog", "footer"], ["overlay", "footer"], ["popup", "footer"]]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("button", "vg-button"),
+    ("textbox", "vg-input"),
+    ("select an option", "vg-dropdown"),
+    ("date picker", "vg-dropdown"),
+    ("dark mode", "vg-theme-provider"),
+])
+def test_synonyms_rank_the_registry_vocabulary_first(index, query, expected):
+    assert tags(index.rank(query))[0] == expected
+
+
+@pytest.mark.parametrize("query", ["modal", "popup window"])
+def test_modal_queries_find_a_dialog_component(index_with_dialog, query):
+    ranking = index_with_dialog.rank(query)
+    assert tags(ranking)[0] == "vg-dialog" and ranking[0][1] >= DEFAULT_MIN_SCORE
+
+
+@pytest.mark.parametrize("query", ["modal", "zebra", "kitchen sink", ""])
+def test_noise_is_dropped(index, query):
+    assert index.rank(query) == []
+
+
+def test_min_score_and_limit(index):
+    everything = index.rank("zebra", limit=100, min_score=0.0)
+    assert len(everything) <= len(index) and everything == sorted(everything, key=lambda item: -item[1])
+    assert len(index.rank("button", limit=1, min_score=0.0)) == 1
+    assert index.rank("button", limit=0) == []
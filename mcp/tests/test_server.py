@@ -0,0 +1,312 @@
+import asyncio
+import json
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+import mcp.types as mcp_types
+import pytest
+from fastmcp import Client
+
+from vg_ui_lib_mcp import main
+from vg_ui_lib_mcp.coaccess import CoAccessStats
+from vg_ui_lib_mcp.framework_transformer import expand_example
+from vg_ui_lib_mcp.profiling import ToolProfiler, profile_tool_name
+from vg_ui_lib_mcp.text_pages import TextPager
+from vg_ui_lib_mcp.tracing import TRACE_FILE, Tracer
+
+
+@pytest.fixture
+def server(monkeypatch, registry_json):
+    """The server with fresh registry state, reading `server.registry_json` instead of the registry file."""
+    source = SimpleNamespace(registry_json=registry_json)
+    monkeypatch.setattr(main, "_read_registry_file", lambda: (source.registry_json, "embedded data"))
+    monkeypatch.setattr(main, "registry_load_task", None)
+    monkeypatch.setattr(main, "registry_hash", "")
+    monkeypatch.setattr(main, "announced_versions", type(main.announced_versions)())
+    main.registry_ready.clear()
+    main.response_cache.clear()
+    yield source
+    main.registry_ready.clear()
+
+
+class Notifications:
+    """Message handler collecting the server notifications a client receives."""
+
+    def __init__(self):
+        self.received = []
+
+    async def __call__(self, message):
+        if isinstance(message, mcp_types.ServerNotification):
+            self.received.append(message.root)
+
+    def of(self, kind):
+        return [notification for notification in self.received if isinstance(notification, kind)]
+
+    async def wait_for(self, kind, timeout=5.0):
+        async def poll():
+            while not self.of(kind):
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(poll(), timeout)
+        return self.of(kind)
+
+
+def modified_registry(registry_json):
+    registry = json.loads(registry_json)
+    registry["schemas"]["AddedSchema"] = {"type": "object"}
+    return json.dumps(registry).encode("utf-8")
+
+
+async def reload_registry():
+    main.registry_load_task = asyncio.create_task(main.load_component_registry(True))
+    return await main.registry_load_task
+
+
+def test_reloading_a_modified_registry_notifies_resource_subscribers(server):
+    async def scenario():
+        notifications = Notifications()
+        async with Client(main.mcp, message_handler=notifications) as client:
+            await client.call_tool("list_schemas", {})
+            first_version = main.registry_hash
+            assert await reload_registry() and main.registry_hash == first_version
+            await client.ping()
+            assert notifications.of(mcp_types.ResourceListChangedNotification) == []
+
+            server.registry_json = modified_registry(server.registry_json)
+            await reload_registry()
+            assert main.registry_hash != first_version
+            changed = await notifications.wait_for(mcp_types.ResourceListChangedNotification)
+            changes = await client.call_tool("get_registry_changes", {"since_version": first_version})
+        return changed, json.loads(changes.content[0].text)
+
+    changed, changes = asyncio.run(scenario())
+    assert len(changed) == 1
+    assert changes["changes"]["schemas"]["added"] == ["AddedSchema"]
+
+
+def test_clear_cache_reloads_in_place_and_announces_a_new_version(server):
+    async def scenario():
+        notifications = Notifications()
+        async with Client(main.mcp, message_handler=notifications) as client, \
+                Client(main.mcp, message_handler=Notifications()) as other:
+            await client.call_tool("list_schemas", {})
+            await client.call_tool("ClearCache", {})
+            assert notifications.of(mcp_types.ResourceListChangedNotification) == []
+
+            server.registry_json = modified_registry(server.registry_json)
+            other_call = asyncio.create_task(other.call_tool("list_schemas", {}))
+            cleared = await client.call_tool("ClearCache", {})
+            await other_call
+            changed = await notifications.wait_for(mcp_types.ResourceListChangedNotification)
+            schemas = await other.call_tool("list_schemas", {})
+        return cleared, changed, schemas
+
+    cleared, changed, schemas = asyncio.run(scenario())
+    assert "reloaded" in cleared.content[0].text
+    assert len(changed) == 1
+    assert "AddedSchema" in json.loads(schemas.content[0].text)
+
+
+def test_registry_changes_materialize_only_the_changed_entities(server, monkeypatch):
+    registry = json.loads(server.registry_json)
+    component_tag, component = next(iter(registry["components"].items()))
+    example = component["examples"][0]
+    expanded = []
+    monkeypatch.setattr(main, "expand_example", lambda value: expanded.append(value) or expand_example(value))
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            await client.call_tool("list_schemas", {})
+            first_version = main.registry_hash
+            example["name"] = "Changed"
+            component["events"] = {}
+            server.registry_json = json.dumps(registry).encode("utf-8")
+            await reload_registry()
+            changes = await client.call_tool("get_registry_changes", {"since_version": first_version, "include_data": True})
+        return json.loads(changes.content[0].text)
+
+    result = asyncio.run(scenario())
+    key = f"{component_tag}::{example['id']}"
+    assert result["changes"]["examples"]["modified"] == [key]
+    assert result["data"]["examples"] == {key: example}
+    assert result["data"]["components"] == {component_tag: {k: v for k, v in component.items() if k != "examples"}}
+    assert result["data"]["schemas"] == {} and result["data"]["categories"] == {}
+    assert len(expanded) == 1
+
+
+def test_memory_report_reloads_through_the_shared_reload_path(server, monkeypatch):
+    loads = []
+    load_component_registry = main.load_component_registry
+
+    async def counted_load(no_ctx=False):
+        loads.append(no_ctx)
+        return await load_component_registry(no_ctx)
+
+    monkeypatch.setattr(main, "load_component_registry", counted_load)
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            await client.call_tool("list_schemas", {})
+            assert len(main.response_cache) == 1
+            loads.clear()
+            cleared, report = await asyncio.gather(
+                client.call_tool("ClearCache", {}),
+                client.call_tool("get_memory_report", {"diff_reload": True, "tracemalloc_limit": 3}))
+        return json.loads(report.content[0].text)
+
+    try:
+        report = asyncio.run(scenario())
+    finally:
+        tracemalloc.stop()
+    assert len(loads) == 1
+    assert len(main.response_cache) == 0
+    assert report["registry_version"] == main.registry_hash
+    assert "reload_diff" in report["tracemalloc"] and len(report["tracemalloc"]["top_allocators"]) <= 3
+
+
+def test_prefetch_attaches_the_calls_that_usually_follow(server, monkeypatch):
+    monkeypatch.setattr(main, "coaccess_stats", CoAccessStats(None))
+
+    async def scenario():
+        for _ in range(2):
+            async with Client(main.mcp) as client:
+                await client.call_tool("get_component_by_tag", {"component_tag": "vg-button"})
+                await client.call_tool("get_schema_definition", {"schema_name": "ButtonVariant"})
+        async with Client(main.mcp) as client:
+            plain = await client.call_tool("get_component_by_tag", {"component_tag": "vg-button"})
+            prefetched = await client.call_tool("get_component_by_tag", {"component_tag": "vg-button", "prefetch": True})
+            schema = await client.call_tool("get_schema_definition", {"schema_name": "ButtonVariant"})
+        return [json.loads(result.content[0].text) for result in (plain, prefetched, schema)]
+
+    plain, prefetched, schema = asyncio.run(scenario())
+    assert prefetched["result"] == plain
+    assert prefetched["prefetched"] == [{
+        "tool": "get_schema_definition", "arguments": {"schema_name": "ButtonVariant"},
+        "probability": round(2 / 3, 3), "result": schema,
+    }]
+
+
+def test_long_setup_instructions_are_delivered_page_by_page(server, monkeypatch):
+    monkeypatch.setattr(main, "text_pager", TextPager(page_chars=500))
+    expected = main.get_project_setup_instructions(main._use_framework)
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            setup = await client.call_tool("InitialProjectSetup", {})
+            pages = [json.loads(setup.content[0].text)["content"]["text"]]
+            while "get_text_page` with cursor" in pages[-1]:
+                cursor = pages[-1].rsplit('cursor "', 1)[1].split('"', 1)[0]
+                pages.append((await client.call_tool("get_text_page", {"cursor": cursor})).content[0].text)
+            expired = await client.call_tool("get_text_page", {"cursor": "0000000000000000:1"})
+        return pages, expired.content[0].text
+
+    pages, expired = asyncio.run(scenario())
+    assert len(pages) > 1
+    assert "".join(page.split("\n\n---\n[Part ")[0] for page in pages) == expected
+    assert "unknown or expired" in expired
+
+
+def test_waiting_for_the_registry_reports_progress(server, monkeypatch):
+    progress = []
+
+    def slow_read():
+        time.sleep(0.2)
+        return server.registry_json, "embedded data"
+
+    monkeypatch.setattr(main, "_read_registry_file", slow_read)
+
+    async def on_progress(value, total, message):
+        progress.append((value, total, message))
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            await client.call_tool("list_schemas", {}, progress_handler=on_progress)
+
+    asyncio.run(scenario())
+    assert progress[0] == (0, main.REGISTRY_READY_TIMEOUT, "Loading the component registry")
+    assert progress[-1] == (main.REGISTRY_READY_TIMEOUT, main.REGISTRY_READY_TIMEOUT, "Loading the component registry: done")
+
+
+def test_component_css_lists_the_properties_of_one_component_with_theme_values(server):
+    registry = json.loads(server.registry_json)
+    registry["predefined_css_definitions"] = (
+        ":root{--vg-radius:4px;--vg-space:8px}"
+        ".vg-theme-dark,[data-vg-theme=dark]{--vg-space:6px}"
+        ".vg-button{--vg-button-gap:var(--vg-space)}"
+    )
+    server.registry_json = json.dumps(registry).encode("utf-8")
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            default = await client.call_tool("get_css_for_component", {"component_tag": "vg-button"})
+            dark = await client.call_tool("get_css_for_component", {"component_tag": "vg-button", "theme": "dark"})
+            missing = await client.call_tool("get_css_for_component", {"component_tag": "vg-missing"})
+        return json.loads(default.content[0].text), json.loads(dark.content[0].text), missing.content[0].text
+
+    default, dark, missing = asyncio.run(scenario())
+    assert "--vg-space" in default["consumes"] and "--vg-button-gap" in default["exposes"]
+    assert "--vg-space: 8px;" in default["css"] and "--vg-space: 6px;" in dark["css"]
+    assert missing == "Component 'vg-missing' not found."
+
+
+def test_configured_tools_are_profiled_and_summarized(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "tool_profiler", ToolProfiler(tmp_path / "profiles"))
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            configured = await client.call_tool("configure_profiling", {"tools": "list_schemas"})
+            await client.call_tool("list_schemas", {})
+            await client.call_tool("list_components", {})
+            summary = await client.call_tool("get_profile_summary", {"tool": "list_schemas", "limit": 5})
+            await client.call_tool("configure_profiling", {"tools": ""})
+            await client.call_tool("list_schemas", {})
+        return json.loads(configured.content[0].text), json.loads(summary.content[0].text)
+
+    configured, summary = asyncio.run(scenario())
+    assert configured["tools"] == ["list_schemas"] and configured["sample_rate"] == 1.0
+    assert summary["profiles"] == 1 and summary["tools"] == {"list_schemas": 1}
+    assert len(summary["functions"]) == 5
+    assert [profile_tool_name(path) for path in main.tool_profiler.profiles()] == ["list_schemas"]
+
+
+def test_tool_calls_are_traced_with_their_phases(server, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, "tracer", Tracer(tmp_path / TRACE_FILE))
+
+    async def scenario():
+        async with Client(main.mcp) as client:
+            await client.call_tool("list_schemas", {})
+            await client.call_tool("get_component_by_tag", {"component_tag": "vg-button"})
+
+    asyncio.run(scenario())
+    traces = []
+    for line in (tmp_path / TRACE_FILE).read_text(encoding="utf-8").splitlines():
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        if spans[-1]["name"].startswith("tools/call "):
+            traces.append({span["name"]: span for span in spans})
+    assert [next(reversed(trace)) for trace in traces] == ["tools/call list_schemas", "tools/call get_component_by_tag"]
+    root = traces[0]["tools/call list_schemas"]
+    attributes = {attribute["key"]: attribute["value"]["stringValue"] for attribute in root["attributes"]}
+    assert attributes["mcp.tool.name"] == "list_schemas" and attributes["vg.registry_version"] == main.registry_hash
+    assert traces[0]["registry.wait"]["parentSpanId"] == root["spanId"]
+    assert all(span["traceId"] == root["traceId"] for span in traces[0].values())
+    assert "registry.wait" not in traces[1]
+
+
+def test_memory_report_sizes_the_loaded_registry_per_section_and_component(server):
+    async def scenario():
+        async with Client(main.mcp) as client:
+            await client.call_tool("get_component_by_tag", {"component_tag": "vg-button"})
+            report = await client.call_tool("get_memory_report", {"include_components": True})
+        return json.loads(report.content[0].text)
+
+    report = asyncio.run(scenario())
+    registry = json.loads(server.registry_json)
+    assert report["registry_version"] == main.registry_hash
+    assert set(report["registry"]["sections"]) <= set(registry)
+    assert "components" in report["registry"]["sections"]
+    assert report["registry"]["total_bytes"] >= max(report["registry"]["sections"].values())
+    assert set(report["components"]) == set(registry["components"])
+    sizes = [entry["total_bytes"] for entry in report["components"].values()]
+    assert sizes == sorted(sizes, reverse=True)
+    assert report["caches"]["response_cache"]["deep_bytes"] > 0
+    assert "tracemalloc" not in report
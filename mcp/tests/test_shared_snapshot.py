@@ -0,0 +1,131 @@
+import os
+import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from vg_ui_lib_mcp import shared_snapshot
+from vg_ui_lib_mcp.content_store import dedupe_registry
+from vg_ui_lib_mcp.framework_transformer import example_sources
+from vg_ui_lib_mcp.shared_snapshot import (
+    REGISTRY_DEPTH, REGISTRY_SECTION, SharedSnapshot, SnapshotBlocks, SnapshotMapping, attach_shared_snapshot,
+)
+
+pytestmark = pytest.mark.skipif(shared_snapshot.fcntl is None, reason="shared snapshots need fcntl")
+
+# Above any pid_max, so never a live process
+DEAD_PID = 999999999
+
+
+def attached(directory, registry_hash="abc"):
+    directory.mkdir(parents=True, exist_ok=True)
+    snapshot = attach_shared_snapshot(directory, registry_hash)
+    assert snapshot is not None
+    return snapshot
+
+
+def test_published_registry_is_read_back_with_its_packed_sources(tmp_path, shared_registry):
+    registry, _ = dedupe_registry(shared_registry)
+    snapshot = attached(tmp_path)
+    assert snapshot.publish(REGISTRY_SECTION, registry, REGISTRY_DEPTH)
+
+    loaded = snapshot.load(REGISTRY_SECTION)
+    assert isinstance(loaded, SnapshotMapping) and isinstance(loaded["components"], SnapshotMapping)
+    assert list(loaded["components"]) == list(registry["components"])
+    assert isinstance(snapshot.content_store(REGISTRY_SECTION).blocks, SnapshotBlocks)
+    for tag, component in shared_registry["components"].items():
+        shared_component = loaded["components"][tag]
+        assert shared_component == registry["components"][tag]
+        for original, example in zip(component.get("examples", []), shared_component.get("examples", [])):
+            assert example_sources(example) == original["sources"]
+    assert "vg-missing" not in loaded["components"]
+    with pytest.raises(KeyError):
+        loaded["components"]["vg-missing"]
+
+
+def test_snapshot_values_pickle_as_plain_containers(tmp_path, shared_registry):
+    registry, _ = dedupe_registry(shared_registry)
+    snapshot = attached(tmp_path)
+    snapshot.publish(REGISTRY_SECTION, registry, REGISTRY_DEPTH)
+    schemas = snapshot.load(REGISTRY_SECTION)["schemas"]
+    copied = pickle.loads(pickle.dumps(schemas))
+    assert type(copied) is dict and copied == registry["schemas"]
+    blocks = snapshot.content_store(REGISTRY_SECTION).blocks
+    assert pickle.loads(pickle.dumps(blocks)) == list(blocks)
+
+
+def test_decoded_entries_are_kept_up_to_the_per_section_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_snapshot, "DECODED_ENTRIES_PER_SECTION", 2)
+    snapshot = attached(tmp_path)
+    snapshot.publish("index", {"a": ["first"], "b": ["second"], "c": ["third"]})
+    index = snapshot.load("index")
+    first = index["a"]
+    assert index["a"] is first
+    index["b"], index["c"]
+    assert index["a"] == first and index["a"] is not first
+
+
+def test_entries_decode_consistently_across_threads(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_snapshot, "DECODED_ENTRIES_PER_SECTION", 4)
+    values = {f"key{number}": [number] * number for number in range(32)}
+    snapshot = attached(tmp_path)
+    snapshot.publish("index", values)
+    index = snapshot.load("index")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        decoded = list(pool.map(lambda key: index[key], list(values) * 8))
+    assert decoded == list(values.values()) * 8
+    assert len(snapshot._sections["index"]._decoded) == 4
+
+
+def test_first_published_section_wins(tmp_path):
+    snapshot = attached(tmp_path)
+    assert snapshot.publish("index", {"value": 1})
+    assert snapshot.publish("index", {"value": 2})
+    other = attached(tmp_path)
+    assert dict(other.load("index")) == {"value": 1}
+
+
+def test_sections_of_another_registry_version_or_corrupt_ones_are_ignored(tmp_path):
+    snapshot = attached(tmp_path, "abc")
+    snapshot.publish("index", {"value": 1})
+    other = attached(tmp_path, "def")
+    shutil.copy(snapshot.path / "index.snap", other.path / "index.snap")
+    assert other.load("index") is None
+    (snapshot.path / "broken.snap").write_bytes(b"not a snapshot")
+    assert snapshot.load("broken") is None
+    assert snapshot.load("absent") is None
+
+
+def test_detached_snapshot_is_neither_loaded_nor_published(tmp_path):
+    snapshot = SharedSnapshot(tmp_path, "abc")
+    assert snapshot.publish("index", {"value": 1}) is False
+    assert snapshot.load("index") is None
+    assert attach_shared_snapshot(None, "abc") is None
+
+
+def test_last_live_process_to_detach_removes_the_snapshot(tmp_path):
+    snapshot = attached(tmp_path)
+    refs = snapshot.path / "refs"
+    assert (refs / str(os.getpid())).exists()
+
+    (refs / str(os.getppid())).touch()
+    snapshot.detach()
+    assert snapshot.path.exists() and not (refs / str(os.getpid())).exists()
+
+    snapshot = attached(tmp_path)
+    (refs / str(os.getppid())).rename(refs / str(DEAD_PID))
+    snapshot.detach()
+    assert not snapshot.path.exists()
+
+
+def test_attach_sweeps_snapshots_left_by_dead_processes(tmp_path):
+    stale = tmp_path / "stale" / "refs"
+    stale.mkdir(parents=True)
+    (stale / str(DEAD_PID)).touch()
+    live = tmp_path / "live" / "refs"
+    live.mkdir(parents=True)
+    (live / str(os.getppid())).touch()
+
+    snapshot = attached(tmp_path, "abc")
+    assert not stale.parent.exists() and live.parent.exists() and snapshot.path.exists()
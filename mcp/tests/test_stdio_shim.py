@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from vg_ui_lib_mcp.stdio_shim import canonical_server_args, config_hash, default_socket_path
+
+
+def test_framework_and_shared_mode_come_first_whether_given_as_options_or_environment(monkeypatch):
+    monkeypatch.delenv("FASTMCP_USE_FRAMEWORK", raising=False)
+    monkeypatch.delenv("FASTMCP_SHARED_REGISTRY", raising=False)
+    options = canonical_server_args(["--shared-registry", "--profile-tools", "all", "--use-framework", "vue"])
+    assert options == ["--use-framework", "vue", "--shared-registry", "--profile-tools", "all"]
+
+    monkeypatch.setenv("FASTMCP_USE_FRAMEWORK", "vue")
+    monkeypatch.setenv("FASTMCP_SHARED_REGISTRY", "true")
+    assert canonical_server_args(["--profile-tools", "all"]) == options
+
+
+def test_config_hash_depends_on_options_and_configuring_environment_only(monkeypatch):
+    monkeypatch.delenv("FASTMCP_JSON_BACKEND", raising=False)
+    options = ["--use-framework", "react"]
+    baseline = config_hash(options)
+    assert config_hash(list(options)) == baseline
+    assert config_hash(["--use-framework", "vue"]) != baseline
+
+    monkeypatch.setenv("FASTMCP_DAEMON_SOCKET", "/elsewhere.sock")
+    monkeypatch.setenv("FASTMCP_DAEMON_START_TIMEOUT", "5")
+    monkeypatch.setenv("UNRELATED_SETTING", "1")
+    assert config_hash(options) == baseline
+
+    monkeypatch.setenv("FASTMCP_JSON_BACKEND", "stdlib")
+    assert config_hash(options) != baseline
+
+
+def test_socket_path_is_named_after_the_configuration(monkeypatch, tmp_path):
+    monkeypatch.delenv("FASTMCP_DAEMON_SOCKET", raising=False)
+    react, vue = default_socket_path(["--use-framework", "react"]), default_socket_path(["--use-framework", "vue"])
+    assert react.name == f"server-{config_hash(['--use-framework', 'react'])}.sock"
+    assert react.parent == vue.parent and react != vue
+
+    monkeypatch.setenv("FASTMCP_DAEMON_SOCKET", str(tmp_path / "custom.sock"))
+    assert default_socket_path(["--use-framework", "react"]) == Path(tmp_path / "custom.sock")
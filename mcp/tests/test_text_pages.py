@@ -0,0 +1,67 @@
+import re
+
+from vg_ui_lib_mcp.text_pages import TextPager, parse_cursor, split_pages
+
+CURSOR = re.compile(r'cursor "([^"]+)"')
+
+
+def body(page):
+    """A page without its footer."""
+    return page.split("\n\n---\n[Part ")[0]
+
+
+def read_all(pager, text):
+    pages = [pager.first_page(text)]
+    while CURSOR.search(pages[-1]):
+        pages.append(pager.page(CURSOR.search(pages[-1]).group(1)))
+    return pages
+
+
+def test_pages_split_at_line_boundaries_and_cut_only_overlong_lines():
+    text = "".join(f"line {number}\n" for number in range(20)) + "x" * 25 + "\ntail"
+    pages = split_pages(text, 20)
+    assert "".join(pages) == text
+    assert all(len(page) <= 20 for page in pages)
+    assert all(page.endswith("\n") for page in pages[:5])
+    assert split_pages("", 20) == [""]
+
+
+def test_short_texts_are_returned_as_they_are():
+    pager = TextPager(page_chars=100)
+    assert pager.first_page("short") == "short"
+    assert pager.total_bytes == 0
+
+
+def test_cursors_walk_through_every_page_to_the_end():
+    text = "".join(f"line {number}\n" for number in range(100))
+    pager = TextPager(page_chars=200)
+    pages = read_all(pager, text)
+    assert len(pages) == len(split_pages(text, 200)) > 2
+    assert "".join(body(page) for page in pages) == text
+    assert pages[0].endswith(f"[Part 1 of {len(pages)}. Call `get_text_page` with cursor "
+                             f"\"{CURSOR.search(pages[0]).group(1)}\" for the next part.]")
+    assert pages[-1].endswith(f"[Part {len(pages)} of {len(pages)}, end of text.]")
+    assert pager.first_page(text) == pages[0] and pager.total_bytes == len(text)
+
+
+def test_malformed_unknown_and_out_of_range_cursors_return_none():
+    pager = TextPager(page_chars=10)
+    first = pager.first_page("0123456789\n" * 3)
+    text_id, _ = parse_cursor(CURSOR.search(first).group(1))
+    assert parse_cursor("no-page") is None and parse_cursor(":1") is None
+    assert pager.page("no-page") is None
+    assert pager.page("0000000000000000:1") is None
+    assert pager.page(f"{text_id}:9") is None
+    assert pager.page(f"{text_id}:2") is not None
+
+
+def test_least_recently_used_texts_expire_beyond_the_byte_budget():
+    pager = TextPager(page_chars=10, max_bytes=100)
+    first, second, third = ("a" * 40 + "\n", "b" * 40 + "\n", "c" * 40 + "\n")
+    first_cursor = CURSOR.search(pager.first_page(first)).group(1)
+    second_cursor = CURSOR.search(pager.first_page(second)).group(1)
+    assert pager.page(first_cursor) is not None
+    pager.first_page(third)
+    assert pager.page(second_cursor) is None
+    assert pager.page(first_cursor) is not None
+    assert pager.total_bytes == len(first) + len(third)
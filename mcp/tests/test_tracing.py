@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+from vg_ui_lib_mcp.tracing import TRACE_FILE, Tracer
+
+
+def exported_traces(path):
+    traces = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        traces.append(spans)
+    return traces
+
+
+def test_concurrent_tool_calls_are_exported_as_separate_traces(tmp_path):
+    tracer = Tracer(tmp_path / TRACE_FILE)
+
+    async def call(name, lookup_delay, delay):
+        with tracer.span(f"tools/call {name}", server=True):
+            with tracer.span("index.lookup", index=name):
+                await asyncio.sleep(lookup_delay)
+            await asyncio.sleep(delay)
+
+    async def scenario():
+        # The slow call's lookup ends while the fast call is still running
+        await asyncio.gather(call("slow", 0.01, 0.05), call("fast", 0.02, 0))
+
+    asyncio.run(scenario())
+    traces = exported_traces(tmp_path / TRACE_FILE)
+    assert [[span["name"] for span in spans] for spans in traces] == [
+        ["index.lookup", "tools/call fast"], ["index.lookup", "tools/call slow"]]
+    for spans in traces:
+        child, root = spans
+        assert child["traceId"] == root["traceId"] and child["parentSpanId"] == root["spanId"]
+        assert "parentSpanId" not in root
+    assert traces[0][0]["attributes"] == [{"key": "index", "value": {"stringValue": "fast"}}]
+    assert tracer.exported == 4
+
+
+def test_errors_are_recorded_and_pending_spans_flushed(tmp_path):
+    tracer = Tracer(tmp_path / TRACE_FILE)
+    try:
+        with tracer.span("tools/call broken", server=True):
+            raise KeyError("missing")
+    except KeyError:
+        pass
+    root = tracer.span("tools/call open", server=True)
+    root.__enter__()
+    with tracer.span("index.lookup"):
+        pass
+    assert len(exported_traces(tmp_path / TRACE_FILE)) == 1
+    tracer.flush()
+    root.__exit__(None, None, None)
+    traces = exported_traces(tmp_path / TRACE_FILE)
+    assert traces[0][0]["status"] == {"code": 2, "message": "KeyError: 'missing'"}
+    assert [[span["name"] for span in spans] for spans in traces[1:]] == [["index.lookup"], ["tools/call open"]]
+
+
+def test_disabled_tracer_exports_nothing(tmp_path):
+    tracer = Tracer(None)
+    with tracer.span("tools/call x", server=True) as span:
+        span.set_attribute("ignored", True)
+    tracer.flush()
+    assert tracer.exported == 0 and list(tmp_path.iterdir()) == []
+
+
+def test_trace_file_is_rotated(tmp_path):
+    path = tmp_path / TRACE_FILE
+    tracer = Tracer(path, max_bytes=10)
+    for name in ("first", "second"):
+        with tracer.span(name, server=True):
+            pass
+    assert (tmp_path / (TRACE_FILE + ".1")).is_file()
+    assert [spans[0]["name"] for spans in exported_traces(path)] == ["second"]